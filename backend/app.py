@@ -1,44 +1,198 @@
 """
 PGYS - Proje Görev Yönetim Sistemi
 Flask Backend API
-SQL Server Veritabanı Bağlantısı
+SQL Server Veritabanı Bağlantısı (yerel çalışma için SQLite desteği)
 KULLANICI BAZLI VERİ FİLTRELEME İLE GÜNCELLENMİŞ
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, has_request_context, request, jsonify
 from flask_cors import CORS
-import pyodbc
-from datetime import datetime
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import wraps
+import base64
+import hmac
+import json
+import os
+import time
+
+from config import DB_CONFIG, POOL_CONFIG
+from db_pool import ConnectionPool
+from deletion import JOB_SELECT, DeletionJobs
+from detail_cache import GOREV, KULLANICI, PROFIL, PROJE, TANIMLAR, cache_from_env, tag
+from events import EventHub, HubFull
+from lookups import LookupCache
+from metrics import CONNECT, Metrics
+from passwords import PasswordHasherBusy, hasher_from_env
+from profiling import SORT_KEYS, QueryProfiler
+import changelog
+import counters
+import deletion
+import queries
+from sessions import store_from_env
+from search import SearchIndex
+from serializers import RowSerializer, float_or_none, install_json_provider, iso_date, or_empty
+from storage import create_backend
+from streaming import stream_format, stream_query
+from versioning import TableVersions
+from visibility import VisibilityIndex
 
 app = Flask(__name__)
-CORS(app)  # Allow cross-origin requests
+CORS(app, expose_headers=['ETag', 'WWW-Authenticate'])  # Allow cross-origin requests
+# PGYS_JSON=orjson (yüklüyse varsayılan) veya std
+json_provider = install_json_provider(app)
+# Route bazında süre / aşama metrikleri (GET /api/metrics); PGYS_METRICS=0 kapatır.
+# JSON sağlayıcısından sonra kurulur (serileştirme süresi sağlayıcı sarılarak ölçülür)
+request_metrics = Metrics(enabled=os.environ.get('PGYS_METRICS', '1') != '0')
+request_metrics.install(app)
 
 # ========================================
 # Database Configuration
 # ========================================
 
-DB_CONFIG = {
-    'server': 'localhost\\SQLEXPRESS',  #kendı server bılgınızı gıreceksınız
-    'database': 'PYTS',
-    'driver': '{ODBC Driver 17 for SQL Server}'
-}
-
-
-def get_db_connection():
-    """Veritabanı bağlantısı oluşturur"""
+# Sunucu bilgileri ve havuz ayarları config.py'de (komut satırı araçları da okur)
+
+
+# "Tamamlandı" durumunun ID'si (ilerleme ve gecikme hesapları için)
+TAMAMLANDI_DURUM_ID = 4
+
+# Toplu görev işlemlerinde tek istekteki en fazla kayıt
+BULK_MAX_ITEMS = 1000
+
+# Kullanıcının görünür proje kümesi en fazla bu kadar ID'yse sorguya sabit liste
+# olarak yazılır; daha büyük kümelerde görünürlük alt sorgusu kullanılır
+SCOPE_INLINE_MAX = int(os.environ.get('PGYS_SCOPE_INLINE_MAX', 500))
+
+# Sayfalı listelerde varsayılan / en büyük sayfa boyutu
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Şifre hash'leme (PGYS_PASSWORD_SCHEME, PGYS_SCRYPT_N, PGYS_HASH_WORKERS ...);
+# süreç havuzu veritabanı bağlantıları ve arka plan thread'leri açılmadan başlatılır
+password_hasher = hasher_from_env().start()
+
+# Veritabanı motoru: PGYS_DB_BACKEND=mssql (varsayılan) veya sqlite
+db_backend = create_backend(DB_CONFIG)
+db_backend.initialize()
+
+# connection() ile ödünç verilen bağlantılar da (tanım / görünürlük yüklemeleri, arama
+# indeksi, sayaçlar, silme işleri) istek metriklerine ve sorgu profiline bağlanır
+db_pool = ConnectionPool(db_backend.connect, validate_query=db_backend.validate_query,
+                         wrap=request_metrics.wrap, **POOL_CONFIG)
+try:
+    # PGYS_POOL_MIN kadar bağlantı ilk istekler gelmeden açılır (asgi.py de bu modülü yükler)
+    db_pool.warm_up()
+except Exception as e:
+    # Veritabanı henüz hazır değilse bağlantılar ilk isteklerde açılır
+    print(f"⚠️ Bağlantı havuzu ısıtılamadı: {str(e)}")
+
+# Sorgu profili ve yavaş sorgu günlüğü (GET /api/sorgular); PGYS_QUERY_PROFILE=0 kapatır.
+# İfadeler endpoint adı + SQL özetiyle gruplanır; planlar havuzdan ayrı bağlantıyla alınır
+query_profiler = QueryProfiler(context_fn=lambda: request.endpoint if has_request_context() else None,
+                               slow_ms=float(os.environ.get('PGYS_SLOW_QUERY_MS', 200)),
+                               window=float(os.environ.get('PGYS_QUERY_WINDOW', 3600)),
+                               plan_sample=float(os.environ.get('PGYS_SLOW_QUERY_PLAN_SAMPLE', 0)),
+                               connection_fn=lambda: db_pool.connection(wrap=False),
+                               explain_fn=db_backend.explain,
+                               max_statements=int(os.environ.get('PGYS_QUERY_MAX_STATEMENTS', 2000)))
+if os.environ.get('PGYS_QUERY_PROFILE', '1') != '0':
+    request_metrics.profiler = query_profiler
+
+# Koşullu GET (ETag) için tablo sürümleri; yazma endpoint'leri commit sonrası artırır
+# Etiket oturumdaki kullanıcıya göre de ayrılır (aynı yol, farklı kullanıcı => farklı içerik)
+table_versions = TableVersions(scope_fn=lambda: request_user_id() or '')
+
+# Tekil kayıt yanıtları (proje, görev, kullanıcı, profil) için read-through önbellek
+# (PGYS_DETAIL_CACHE_TTL, PGYS_DETAIL_CACHE_MAX, PGYS_DETAIL_CACHE_REDIS_URL ...);
+# yazma endpoint'leri commit'ten sonra ilgili kayıtları geçersizler
+detail_cache = cache_from_env()
+
+
+def tanimlar_degisti():
+    table_versions.bump('DURUMLAR', 'ONCELIKLER', 'ROLLER')
+    # Görev yanıtlarında DurumAdi / OncelikAdi var
+    detail_cache.invalidate_tags(TANIMLAR)
+
+
+# DURUMLAR / ONCELIKLER / ROLLER önbelleği (PGYS_LOOKUP_TTL saniyede bir yenilenir)
+lookup_cache = LookupCache(db_pool.connection,
+                           ttl=float(os.environ.get('PGYS_LOOKUP_TTL', 600)),
+                           on_change=tanimlar_degisti)
+try:
+    lookup_cache.load()
+except Exception as e:
+    # Veritabanı henüz hazır değilse ilk kullanımda yüklenir
+    print(f"⚠️ Tanım tabloları yüklenemedi: {str(e)}")
+
+# Kullanıcı başına görünür ProjeID kümeleri; proje / üyelik yazmalarında artımlı güncellenir
+visibility_index = VisibilityIndex(db_pool.connection,
+                                   max_users=int(os.environ.get('PGYS_VISIBILITY_MAX_USERS', 50000)))
+
+# Oturum deposu (PGYS_SECRET_KEY, PGYS_SESSION_TTL, PGYS_SESSION_MAX)
+session_store = store_from_env()
+
+# Görev / yorum metinleri için arama indeksi; açılışta kurulur, yazmalarda artımlı güncellenir
+search_index = SearchIndex(db_pool.connection)
+try:
+    search_index.rebuild()
+except Exception as e:
+    # Veritabanı henüz hazır değilse ilk aramada kurulur
+    print(f"⚠️ Arama indeksi kurulamadı: {str(e)}")
+
+# Canlı olaylar (SSE); olaylar abonenin görebildiği projelere göre süzülür
+event_hub = EventHub(visibility_index.peek, load_fn=visibility_index.projects,
+                     max_subscribers=int(os.environ.get('PGYS_EVENTS_MAX_SUBSCRIBERS', 10000)),
+                     max_pending=int(os.environ.get('PGYS_EVENTS_MAX_PENDING', 256)),
+                     heartbeat=float(os.environ.get('PGYS_EVENTS_HEARTBEAT', 15)))
+
+
+def silme_parcasi(tablo, ids, deltas):
+    """Arka plan silme işinin commit edilen her parçasından sonra (bkz. deletion.py)"""
+    if tablo == 'GOREVLER':
+        table_versions.bump('GOREVLER', 'GOREV_ATAMALARI', 'YORUMLAR')
+        search_index.tasks_removed(ids)
+        detail_cache.invalidate(GOREV, *ids)
+        # Atamaları silinen kullanıcıların profil sayaçları
+        detail_cache.invalidate(PROFIL, *deltas)
+    else:
+        table_versions.bump(tablo)
+
+
+# Proje / kullanıcı silme: kayıt hemen gizlenir (Silindi = 1), bağlı satırlar arka planda
+# PGYS_DELETE_BATCH'lik kısa işlemlerle silinir (PGYS_DELETE_PAUSE_MS parçalar arası bekleme)
+deletion_jobs = DeletionJobs(db_backend, db_pool.connection,
+                             batch_size=int(os.environ.get('PGYS_DELETE_BATCH', 500)),
+                             pause=float(os.environ.get('PGYS_DELETE_PAUSE_MS', 50)) / 1000,
+                             on_batch=silme_parcasi)
+try:
+    deletion_jobs.start()
+except Exception as e:
+    # Veritabanı henüz hazır değilse yarım kalan işler bir sonraki açılışta sürer
+    print(f"⚠️ Silme işleri başlatılamadı: {str(e)}")
+
+
+@contextmanager
+def db_connection():
+    """
+    Havuzdan bağlantı ödünç verir ve blok bitince geri iade eder.
+    Bağlantı kurulamazsa None döner (çağıran 500 hatası üretir).
+    """
+    started = time.perf_counter()
     try:
-        conn_str = (
-            f"DRIVER={DB_CONFIG['driver']};"
-            f"SERVER={DB_CONFIG['server']};"
-            f"DATABASE={DB_CONFIG['database']};"
-            f"Trusted_Connection=yes;"
-        )
-        conn = pyodbc.connect(conn_str, timeout=10)
-        return conn
+        pooled = db_pool.acquire()
     except Exception as e:
+        request_metrics.add(CONNECT, time.perf_counter() - started)
         print(f"❌ Veritabanı bağlantı hatası: {str(e)}")
-        return None
+        yield None
+        return
+    request_metrics.add(CONNECT, time.perf_counter() - started)
+
+    try:
+        # İstek ölçülüyorsa execute / fetch süreleri için sarılır (bkz. metrics.py)
+        yield request_metrics.wrap(pooled.raw)
+    finally:
+        db_pool.release(pooled)
 
 
 # ========================================
@@ -46,15 +200,290 @@ def get_db_connection():
 # ========================================
 
 def hash_password(password):
-    """Şifreyi hash'ler"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Şifreyi hash'ler (bkz. passwords.py)"""
+    return password_hasher.hash(password)
+
+
+def busy_response():
+    """Şifre hash kuyruğu dolu olduğunda dönen yanıt"""
+    response = jsonify({'error': 'Sunucu yoğun, lütfen tekrar deneyin'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+def log_changes(cursor, table, changes):
+    """Değişiklikleri commit'ten önce aynı işlemde günlüğe yazar (bkz. changelog.py)"""
+    changelog.record(db_backend, cursor, table, changes)
+
+
+def publish_change(name, kayit_id, islem, proje_id):
+    """Commit'ten sonra değişikliği projeyi görebilen abonelere duyurur (bkz. events.py)"""
+    event_hub.publish(name, {'KayitID': kayit_id, 'Islem': islem, 'ProjeID': proje_id},
+                      proje_id=proje_id)
+
+
+def publish_visibility(*kullanici_ids):
+    """Görünür proje kümesi değişen kullanıcılara haber verir; istemci listeleri yeniden yükler"""
+    for kullanici_id in kullanici_ids:
+        if kullanici_id is not None:
+            event_hub.publish('gorunurluk', {'KullaniciID': kullanici_id}, kullanici_id=kullanici_id)
 
 
 def format_date(date):
     """Tarihi formatlar"""
-    if isinstance(date, datetime):
-        return date.strftime('%Y-%m-%d')
-    return date
+    return iso_date(date)
+
+
+def parse_date_arg(name):
+    """YYYY-MM-DD biçimindeki query parametresini doğrular"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"'{name}' YYYY-MM-DD biçiminde olmalı")
+    return value
+
+
+def encode_cursor(*values):
+    """Keyset sayfalama değerlerini istemciye verilecek opak bir metne çevirir"""
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, size):
+    """encode_cursor ile üretilmiş imleci çözer"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except Exception:
+        raise ValueError('Geçersiz cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Geçersiz cursor')
+    return values
+
+
+def parse_cursor_datetime(value):
+    """
+    İmleçteki tarih-saat değeri: SQL Server'da datetime nesnesine çevrilir (isoformat
+    metni DATETIME'a çevrilemeyebilir), SQLite'ta metin olarak saklandığı gibi kalır
+    """
+    if isinstance(value, str) and 'T' in value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError('Geçersiz cursor')
+    return value
+
+
+def parse_page_args(size):
+    """
+    limit ve cursor parametrelerini okur.
+    Sayfalama istenmediyse (None, None) döner.
+    """
+    limit = request.args.get('limit', type=int)
+    token = request.args.get('cursor')
+    if limit is None and not token:
+        return None, None
+
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f'limit 1 ile {MAX_PAGE_SIZE} arasında olmalı')
+    return limit, decode_cursor(token, size) if token else None
+
+
+# ========================================
+# Oturum (Authorization: Bearer <token>)
+# ========================================
+
+# Token'sız çağrılabilen endpoint'ler; eski bir token bunları engellememeli
+PUBLIC_ENDPOINTS = {'login', 'logout', 'register', 'health_check'}
+
+# EventSource başlık gönderemez; bu endpoint'lerde token ?token= ile de verilebilir
+QUERY_TOKEN_ENDPOINTS = {'get_olaylar'}
+
+# Token'sız eski istemciler (kullanici_id query parametresi) sadece açıkça izin verilirse
+# kabul edilir; parametre doğrulanmadığı için herkes başka bir kullanıcı gibi davranabilir
+LEGACY_AUTH = os.environ.get('PGYS_LEGACY_AUTH', '0') == '1'
+
+# Yönetim endpoint'leri (SQL metni / planlar, önbellek ve indeks yenileme, sayaç düzeltme):
+# PGYS_ADMIN_USERS'taki kullanıcıların oturumu veya PGYS_ADMIN_TOKEN (Prometheus gibi
+# giriş yapamayan araçlar için) gerekir. İkisi de boşsa yönetim endpoint'leri kapalıdır
+ADMIN_USERS = frozenset(int(k) for k in os.environ.get('PGYS_ADMIN_USERS', '').replace(',', ' ').split())
+ADMIN_TOKEN = os.environ.get('PGYS_ADMIN_TOKEN') or None
+ADMIN_ENDPOINTS = set()
+
+
+def bearer_token():
+    """Authorization başlığındaki token'ı döndürür (yoksa None)"""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token.strip():
+        if request.endpoint in QUERY_TOKEN_ENDPOINTS:
+            return request.args.get('token') or None
+        return None
+    return token.strip()
+
+
+@app.before_request
+def load_session():
+    """
+    Token'ı oturuma çözer. Açık endpoint'ler dışında token zorunludur (PGYS_LEGACY_AUTH
+    hariç); eksik, geçersiz veya süresi dolmuş token 401 döner
+    """
+    g.session = None
+    # Eşleşmeyen yollar 404'e, CORS ön kontrolleri flask_cors'a bırakılır
+    if request.endpoint in PUBLIC_ENDPOINTS or request.endpoint is None or request.method == 'OPTIONS':
+        return None
+    token = bearer_token()
+    if token is None:
+        if LEGACY_AUTH:
+            return None
+        response = jsonify({'error': 'Oturum gerekli'})
+        response.headers['WWW-Authenticate'] = 'Bearer'
+        return response, 401
+    if (ADMIN_TOKEN and request.endpoint in ADMIN_ENDPOINTS
+            and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())):
+        g.admin = True
+        return None
+    g.session = session_store.resolve(token)
+    if g.session is None:
+        # İstemci bunu hatalı şifre gibi diğer 401'lerden başlıkla ayırır (RFC 6750)
+        response = jsonify({'error': 'Oturum geçersiz veya süresi doldu'})
+        response.headers['WWW-Authenticate'] = 'Bearer error="invalid_token"'
+        return response, 401
+    return None
+
+
+def request_user_id():
+    """
+    İsteği yapan kullanıcı: oturumdaki kullanıcı. PGYS_LEGACY_AUTH=1 ile token'sız
+    eski istemciler için kullanici_id query parametresi
+    """
+    session = g.get('session')
+    if session is not None:
+        return session.kullanici_id
+    if LEGACY_AUTH:
+        return request.args.get('kullanici_id', type=int)
+    return None
+
+
+def forbidden_for(kullanici_id):
+    """Oturum başka bir kullanıcıya aitse 403 yanıtı, aksi halde None"""
+    session = g.get('session')
+    if session is not None and session.kullanici_id != kullanici_id:
+        return jsonify({'error': 'Bu işlem için yetkiniz yok'}), 403
+    return None
+
+
+def admin_required(fn):
+    """Yönetim endpoint'i: yönetici oturumu veya PGYS_ADMIN_TOKEN yoksa 403"""
+    ADMIN_ENDPOINTS.add(fn.__name__)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        session = g.get('session')
+        if not g.get('admin') and (session is None or session.kullanici_id not in ADMIN_USERS):
+            return jsonify({'error': 'Bu işlem için yönetici yetkisi gerekli'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def proje_kapsami(kullanici_id):
+    """
+    kullanici_id'nin görebildiği projeler için IN (...) içeriği: (sql, params).
+    Görünürlük indeksindeki ID listesi kullanılır; liste SCOPE_INLINE_MAX'tan büyükse
+    görünürlük alt sorgusuna dönülür.
+    """
+    ids = visibility_index.projects(kullanici_id)
+    if len(ids) <= SCOPE_INLINE_MAX:
+        return queries.id_list(ids)
+    return queries.GORUNUR_PROJELER, list(queries.gorunur_projeler_params(kullanici_id))
+
+
+# ========================================
+# Satır Dönüştürücüler
+# ========================================
+# Liste, detay ve akışlı yanıtlar aynı satırı aynı biçimde döndürsün diye
+# her sorgu biçiminin serileştiricisi tek yerde tutulur (bkz. serializers.py).
+
+# KullaniciID, Ad, Soyad, Eposta, RolID
+kullanici_row = RowSerializer(
+    'KullaniciID', 'Ad', 'Soyad', 'Eposta',
+    ('Rol', lookup_cache.rol_adi, 'RolID')
+)
+
+# Görev atamaları: KullaniciID, Ad, Soyad, Eposta
+atanan_row = RowSerializer('KullaniciID', 'Ad', 'Soyad', 'Eposta')
+
+# queries.PROJELER_SELECT
+proje_row = RowSerializer(
+    'ProjeID', 'ProjeAdi',
+    ('BaslangicTarihi', iso_date),
+    ('BitisTarihi', iso_date),
+    ('Butce', float_or_none),
+    'YoneticiID',
+    ('YoneticiAd', or_empty),
+    ('YoneticiSoyad', or_empty)
+)
+
+# queries.GOREVLER_SELECT
+gorev_row = RowSerializer(
+    'GorevID', 'GorevAdi', 'Aciklama',
+    ('TeslimTarihi', iso_date),
+    'ProjeID',
+    ('ProjeAdi', or_empty),
+    'DurumID',
+    ('DurumAdi', lookup_cache.durum_adi, 'DurumID'),
+    'OncelikID',
+    ('OncelikAdi', lookup_cache.oncelik_adi, 'OncelikID')
+)
+
+# YorumID, YorumMetni, Tarih, Ad, Soyad
+yorum_row = RowSerializer(
+    'YorumID', 'YorumMetni',
+    ('Tarih', str),
+    ('KullaniciAd', None, 'Ad'),
+    ('KullaniciSoyad', None, 'Soyad')
+)
+
+# Delta senkronizasyonu: yorum hangi göreve ait olduğunu da taşır
+sync_yorum_row = RowSerializer(
+    'YorumID', 'GorevID', 'YorumMetni',
+    ('Tarih', str),
+    ('KullaniciAd', None, 'Ad'),
+    ('KullaniciSoyad', None, 'Soyad')
+)
+
+# Profil: kullanıcıya atanmış görevler
+kullanici_gorev_row = RowSerializer(
+    'GorevID', 'GorevAdi',
+    ('TeslimTarihi', iso_date),
+    'ProjeAdi',
+    ('DurumAdi', lookup_cache.durum_adi, 'DurumID'),
+    ('OncelikAdi', lookup_cache.oncelik_adi, 'OncelikID')
+)
+
+# Profil: kullanıcının üyesi olduğu projeler
+kullanici_proje_row = RowSerializer(
+    'ProjeID', 'ProjeAdi',
+    ('BaslangicTarihi', iso_date),
+    ('BitisTarihi', iso_date),
+    ('RolAdi', lookup_cache.rol_adi, 'RolID')
+)
+
+
+def str_or_none(value):
+    return None if value is None else str(value)
+
+
+# deletion.JOB_SELECT
+silme_isi_row = RowSerializer(
+    'IsID', 'Tur', 'HedefID', 'Durum', 'Asama', 'Toplam', 'Silinen', 'Hata',
+    ('Olusturma', str_or_none),
+    ('Guncelleme', str_or_none),
+    ('Bitis', str_or_none)
+)
 
 
 # ========================================
@@ -62,64 +491,65 @@ def format_date(date):
 # ========================================
 
 @app.route('/api/kullanicilar', methods=['GET'])
+@table_versions.conditional('KULLANICILAR', 'PROJE_UYE_ILISKISI', 'ROLLER', vary=stream_format)
 def get_kullanicilar():
-    """Tüm kullanıcıları listeler"""
+    """Tüm kullanıcıları listeler (?stream=1 ile akışlı)"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT k.KullaniciID, k.Ad, k.Soyad, k.Eposta, r.RolAdi
+        sql = """
+            SELECT k.KullaniciID, k.Ad, k.Soyad, k.Eposta, pui.RolID
             FROM KULLANICILAR k
             LEFT JOIN PROJE_UYE_ILISKISI pui ON k.KullaniciID = pui.KullaniciID
-            LEFT JOIN ROLLER r ON pui.RolID = r.RolID
-        """)
+            WHERE k.Silindi = 0
+        """
 
-        kullanicilar = []
-        for row in cursor.fetchall():
-            kullanicilar.append({
-                'KullaniciID': row.KullaniciID,
-                'Ad': row.Ad,
-                'Soyad': row.Soyad,
-                'Eposta': row.Eposta,
-                'Rol': row.RolAdi if row.RolAdi else 'Ekip Üyesi'
-            })
+        fmt = stream_format()
+        if fmt:
+            return stream_query(db_pool, sql, (), kullanici_row, fmt)
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        conn.close()
-        return jsonify(kullanicilar)
+            cursor = conn.cursor()
+            cursor.execute(sql)
+
+            return jsonify(kullanici_row.all(cursor, cursor.fetchall()))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/kullanicilar/<int:id>', methods=['GET'])
+@table_versions.conditional('KULLANICILAR')
 def get_kullanici(id):
     """Belirli bir kullanıcıyı getirir"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+        kullanici = detail_cache.get(KULLANICI, id)
+        if kullanici is not None:
+            return jsonify(kullanici)
 
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT KullaniciID, Ad, Soyad, Eposta
-            FROM KULLANICILAR
-            WHERE KullaniciID = ?
-        """, (id,))
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        row = cursor.fetchone()
-        if not row:
-            return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT KullaniciID, Ad, Soyad, Eposta
+                FROM KULLANICILAR
+                WHERE KullaniciID = ? AND Silindi = 0
+            """, (id,))
 
-        kullanici = {
-            'KullaniciID': row.KullaniciID,
-            'Ad': row.Ad,
-            'Soyad': row.Soyad,
-            'Eposta': row.Eposta
-        }
+            row = cursor.fetchone()
+            if not row:
+                return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
 
-        conn.close()
+            kullanici = {
+                'KullaniciID': row.KullaniciID,
+                'Ad': row.Ad,
+                'Soyad': row.Soyad,
+                'Eposta': row.Eposta
+            }
+
+        detail_cache.put(KULLANICI, id, kullanici)
         return jsonify(kullanici)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -130,33 +560,35 @@ def create_kullanici():
     """Yeni kullanıcı oluşturur"""
     try:
         data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        cursor = conn.cursor()
+        # Şifre, havuzdan bağlantı almadan önce hash'lenir
+        sifre_hash = hash_password(data['SifreHash'])
 
-        # E-posta kontrolü
-        cursor.execute("SELECT KullaniciID FROM KULLANICILAR WHERE Eposta = ?", (data['Eposta'],))
-        if cursor.fetchone():
-            return jsonify({'error': 'Bu e-posta zaten kullanılıyor'}), 400
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        # Şifreyi hash'le
-        sifre_hash = hash_password(data['SifreHash'])
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT INTO KULLANICILAR (Ad, Soyad, Eposta, SifreHash)
-            VALUES (?, ?, ?, ?)
-        """, (data['Ad'], data['Soyad'], data['Eposta'], sifre_hash))
+            # E-posta kontrolü
+            cursor.execute("SELECT KullaniciID FROM KULLANICILAR WHERE Eposta = ?", (data['Eposta'],))
+            if cursor.fetchone():
+                return jsonify({'error': 'Bu e-posta zaten kullanılıyor'}), 400
 
-        conn.commit()
+            cursor.execute("""
+                INSERT INTO KULLANICILAR (Ad, Soyad, Eposta, SifreHash)
+                VALUES (?, ?, ?, ?)
+            """, (data['Ad'], data['Soyad'], data['Eposta'], sifre_hash))
 
-        # Yeni oluşturulan kullanıcının ID'sini al
-        cursor.execute("SELECT @@IDENTITY")
-        new_id = cursor.fetchone()[0]
+            conn.commit()
+            table_versions.bump('KULLANICILAR')
 
-        conn.close()
-        return jsonify({'message': 'Kullanıcı oluşturuldu', 'KullaniciID': new_id}), 201
+            # Yeni oluşturulan kullanıcının ID'sini al
+            new_id = db_backend.last_insert_id(cursor)
+
+            return jsonify({'message': 'Kullanıcı oluşturuldu', 'KullaniciID': new_id}), 201
+    except PasswordHasherBusy:
+        return busy_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -166,37 +598,57 @@ def update_kullanici(id):
     """Kullanıcı bilgilerini günceller"""
     try:
         data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE KULLANICILAR
-            SET Ad = ?, Soyad = ?, Eposta = ?
-            WHERE KullaniciID = ?
-        """, (data['Ad'], data['Soyad'], data['Eposta'], id))
-
-        conn.commit()
-        conn.close()
-        return jsonify({'message': 'Kullanıcı güncellendi'})
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE KULLANICILAR
+                SET Ad = ?, Soyad = ?, Eposta = ?
+                WHERE KullaniciID = ? AND Silindi = 0
+            """, (data['Ad'], data['Soyad'], data['Eposta'], id))
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+
+            conn.commit()
+            table_versions.bump('KULLANICILAR')
+            # Kullanıcı, profili ve yönettiği projeler (yönetici adı)
+            detail_cache.invalidate(KULLANICI, id)
+            session_store.update_user(id, Ad=data['Ad'], Soyad=data['Soyad'], Eposta=data['Eposta'])
+            return jsonify({'message': 'Kullanıcı güncellendi'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/kullanicilar/<int:id>', methods=['DELETE'])
 def delete_kullanici(id):
-    """Kullanıcı siler"""
+    """
+    Kullanıcı siler: kayıt hemen gizlenir, yorumları / atamaları arka planda silinir.
+    202 + iş kaydı döner (ilerleme: /api/silme-isleri/<IsID>)
+    """
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM KULLANICILAR WHERE KullaniciID = ?", (id,))
-        conn.commit()
-        conn.close()
-        return jsonify({'message': 'Kullanıcı silindi'})
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("UPDATE KULLANICILAR SET Silindi = 1 WHERE KullaniciID = ? AND Silindi = 0", (id,))
+            if not cursor.rowcount:
+                return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+            # Üyelikler az sayıdadır; görünürlük aynı işlemde kalkar
+            cursor.execute("DELETE FROM PROJE_UYE_ILISKISI WHERE KullaniciID = ?", (id,))
+            counters.adjust(db_backend, cursor, counters.PROJE, {id: -cursor.rowcount})
+            is_id = deletion.create_job(db_backend, cursor, deletion.KULLANICI, id)
+            conn.commit()
+            table_versions.bump('KULLANICILAR', 'PROJELER', 'PROJE_UYE_ILISKISI')
+            visibility_index.user_deleted(id)
+            search_index.user_deleted(id)
+            detail_cache.invalidate(KULLANICI, id)
+            session_store.revoke_user(id)
+            deletion_jobs.submit(is_id)
+            return jsonify({'message': 'Kullanıcı silindi', 'IsID': is_id,
+                            'durum': f'/api/silme-isleri/{is_id}'}), 202
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -205,92 +657,83 @@ def delete_kullanici(id):
 # PROJELER Endpoints - KULLANICI BAZLI
 # ========================================
 
+def aktif_proje(cursor, proje_id):
+    """Proje var ve silinmekte değilse True; silme işi sürerken projeye yazılmaz (bkz. deletion.py)"""
+    cursor.execute("SELECT 1 FROM PROJELER WHERE ProjeID = ? AND Silindi = 0", (proje_id,))
+    return cursor.fetchone() is not None
+
+
+def aktif_gorev_projesi(cursor, gorev_id):
+    """Görevin ProjeID'si; görev yoksa veya projesi silinmekteyse None"""
+    cursor.execute("""
+        SELECT g.ProjeID FROM GOREVLER g
+        JOIN PROJELER p ON p.ProjeID = g.ProjeID AND p.Silindi = 0
+        WHERE g.GorevID = ?
+    """, (gorev_id,))
+    row = cursor.fetchone()
+    return row.ProjeID if row else None
+
+
+def projeler_sorgusu(kapsam):
+    """Proje listesi sorgusu: (sql, params). kapsam: proje_kapsami() sonucu, None ise tümü"""
+    if kapsam:
+        # Kullanıcının dahil olduğu projeler + yönettiği projeler
+        kapsam_sql, params = kapsam
+        return queries.projeler_kullanici(kapsam_sql), params
+    # Tüm projeler (admin görünümü)
+    return queries.PROJELER_SELECT + " WHERE p.Silindi = 0 ORDER BY p.BaslangicTarihi DESC", ()
+
+
 @app.route('/api/projeler', methods=['GET'])
+@table_versions.conditional('PROJELER', 'KULLANICILAR', 'PROJE_UYE_ILISKISI', vary=stream_format)
 def get_projeler():
     """Tüm projeleri listeler (YÖNETİCİ) veya kullanıcının projelerini (NORMAL KULLANICI)"""
     try:
-        # Kullanıcı ID'sini query parametresinden al
-        kullanici_id = request.args.get('kullanici_id', type=int)
+        # Kullanıcı oturumdan (veya kullanici_id query parametresinden) gelir
+        kullanici_id = request_user_id()
+        sql, params = projeler_sorgusu(proje_kapsami(kullanici_id) if kullanici_id else None)
 
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+        fmt = stream_format()
+        if fmt:
+            return stream_query(db_pool, sql, params, proje_row, fmt)
 
-        cursor = conn.cursor()
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        if kullanici_id:
-            # Kullanıcının dahil olduğu projeler + yönettiği projeler
-            cursor.execute("""
-                SELECT DISTINCT p.ProjeID, p.ProjeAdi, p.BaslangicTarihi, p.BitisTarihi, 
-                       p.Butce, p.YoneticiID, k.Ad as YoneticiAd, k.Soyad as YoneticiSoyad
-                FROM PROJELER p
-                LEFT JOIN KULLANICILAR k ON p.YoneticiID = k.KullaniciID
-                LEFT JOIN PROJE_UYE_ILISKISI pui ON p.ProjeID = pui.ProjeID
-                WHERE p.YoneticiID = ? OR pui.KullaniciID = ?
-                ORDER BY p.BaslangicTarihi DESC
-            """, (kullanici_id, kullanici_id))
-        else:
-            # Tüm projeler (admin görünümü)
-            cursor.execute("""
-                SELECT p.ProjeID, p.ProjeAdi, p.BaslangicTarihi, p.BitisTarihi, 
-                       p.Butce, p.YoneticiID, k.Ad as YoneticiAd, k.Soyad as YoneticiSoyad
-                FROM PROJELER p
-                LEFT JOIN KULLANICILAR k ON p.YoneticiID = k.KullaniciID
-                ORDER BY p.BaslangicTarihi DESC
-            """)
-
-        projeler = []
-        for row in cursor.fetchall():
-            projeler.append({
-                'ProjeID': row.ProjeID,
-                'ProjeAdi': row.ProjeAdi,
-                'BaslangicTarihi': format_date(row.BaslangicTarihi),
-                'BitisTarihi': format_date(row.BitisTarihi) if row.BitisTarihi else None,
-                'Butce': float(row.Butce) if row.Butce else None,
-                'YoneticiID': row.YoneticiID,
-                'YoneticiAd': row.YoneticiAd if row.YoneticiAd else '',
-                'YoneticiSoyad': row.YoneticiSoyad if row.YoneticiSoyad else ''
-            })
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
 
-        conn.close()
-        return jsonify(projeler)
+            return jsonify(proje_row.all(cursor, cursor.fetchall()))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/projeler/<int:id>', methods=['GET'])
+@table_versions.conditional('PROJELER', 'KULLANICILAR')
 def get_proje(id):
     """Belirli bir projeyi getirir"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT p.ProjeID, p.ProjeAdi, p.BaslangicTarihi, p.BitisTarihi, 
-                   p.Butce, p.YoneticiID, k.Ad as YoneticiAd, k.Soyad as YoneticiSoyad
-            FROM PROJELER p
-            LEFT JOIN KULLANICILAR k ON p.YoneticiID = k.KullaniciID
-            WHERE p.ProjeID = ?
-        """, (id,))
-
-        row = cursor.fetchone()
-        if not row:
-            return jsonify({'error': 'Proje bulunamadı'}), 404
-
-        proje = {
-            'ProjeID': row.ProjeID,
-            'ProjeAdi': row.ProjeAdi,
-            'BaslangicTarihi': format_date(row.BaslangicTarihi),
-            'BitisTarihi': format_date(row.BitisTarihi) if row.BitisTarihi else None,
-            'Butce': float(row.Butce) if row.Butce else None,
-            'YoneticiID': row.YoneticiID,
-            'YoneticiAd': row.YoneticiAd if row.YoneticiAd else '',
-            'YoneticiSoyad': row.YoneticiSoyad if row.YoneticiSoyad else ''
-        }
+        proje = detail_cache.get(PROJE, id)
+        if proje is not None:
+            return jsonify(proje)
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        conn.close()
+            cursor = conn.cursor()
+            cursor.execute(queries.PROJELER_SELECT + " WHERE p.ProjeID = ? AND p.Silindi = 0", (id,))
+
+            row = cursor.fetchone()
+            if not row:
+                return jsonify({'error': 'Proje bulunamadı'}), 404
+
+            proje = proje_row.one(cursor, row)
+
+        # Yanıtta yöneticinin adı var
+        detail_cache.put(PROJE, id, proje,
+                         tags=[tag(KULLANICI, proje['YoneticiID'])] if proje['YoneticiID'] else ())
         return jsonify(proje)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -301,29 +744,30 @@ def create_proje():
     """Yeni proje oluşturur"""
     try:
         data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO PROJELER (ProjeAdi, BaslangicTarihi, BitisTarihi, Butce, YoneticiID)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            data['ProjeAdi'],
-            data['BaslangicTarihi'],
-            data.get('BitisTarihi'),
-            data.get('Butce'),
-            data.get('YoneticiID')
-        ))
-
-        conn.commit()
-
-        cursor.execute("SELECT @@IDENTITY")
-        new_id = cursor.fetchone()[0]
-
-        conn.close()
-        return jsonify({'message': 'Proje oluşturuldu', 'ProjeID': new_id}), 201
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO PROJELER (ProjeAdi, BaslangicTarihi, BitisTarihi, Butce, YoneticiID)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                data['ProjeAdi'],
+                data['BaslangicTarihi'],
+                data.get('BitisTarihi'),
+                data.get('Butce'),
+                data.get('YoneticiID')
+            ))
+            new_id = db_backend.last_insert_id(cursor)
+            log_changes(cursor, 'PROJELER', [(new_id, changelog.UPSERT)])
+
+            conn.commit()
+            table_versions.bump('PROJELER')
+            visibility_index.project_created(new_id, data.get('YoneticiID'))
+            publish_change('proje', new_id, changelog.UPSERT, new_id)
+
+            return jsonify({'message': 'Proje oluşturuldu', 'ProjeID': new_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -333,44 +777,176 @@ def update_proje(id):
     """Proje bilgilerini günceller"""
     try:
         data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE PROJELER
-            SET ProjeAdi = ?, BaslangicTarihi = ?, BitisTarihi = ?, Butce = ?, YoneticiID = ?
-            WHERE ProjeID = ?
-        """, (
-            data['ProjeAdi'],
-            data['BaslangicTarihi'],
-            data.get('BitisTarihi'),
-            data.get('Butce'),
-            data.get('YoneticiID'),
-            id
-        ))
-
-        conn.commit()
-        conn.close()
-        return jsonify({'message': 'Proje güncellendi'})
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("SELECT YoneticiID FROM PROJELER WHERE ProjeID = ? AND Silindi = 0", (id,))
+            row = cursor.fetchone()
+            if not row:
+                return jsonify({'error': 'Proje bulunamadı'}), 404
+            eski_yonetici = row.YoneticiID
+
+            cursor.execute("""
+                UPDATE PROJELER
+                SET ProjeAdi = ?, BaslangicTarihi = ?, BitisTarihi = ?, Butce = ?, YoneticiID = ?
+                WHERE ProjeID = ? AND Silindi = 0
+            """, (
+                data['ProjeAdi'],
+                data['BaslangicTarihi'],
+                data.get('BitisTarihi'),
+                data.get('Butce'),
+                data.get('YoneticiID'),
+                id
+            ))
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'Proje bulunamadı'}), 404
+
+            log_changes(cursor, 'PROJELER', [(id, changelog.UPSERT)])
+            if eski_yonetici != data.get('YoneticiID'):
+                # Eski ve yeni yöneticinin görebildiği projeler (ve görevler) değişti
+                log_changes(cursor, changelog.GORUNURLUK,
+                            [(k, changelog.VISIBILITY)
+                             for k in (eski_yonetici, data.get('YoneticiID')) if k is not None])
+
+            conn.commit()
+            table_versions.bump('PROJELER')
+            # Proje ve projenin görevleri (proje adı)
+            detail_cache.invalidate(PROJE, id)
+            visibility_index.manager_changed(id, data.get('YoneticiID'))
+            publish_change('proje', id, changelog.UPSERT, id)
+            if eski_yonetici != data.get('YoneticiID'):
+                publish_visibility(eski_yonetici, data.get('YoneticiID'))
+            return jsonify({'message': 'Proje güncellendi'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/projeler/<int:id>', methods=['DELETE'])
 def delete_proje(id):
-    """Proje siler"""
+    """
+    Proje siler: proje ve görevleri hemen gizlenir, görev / yorum / atamalar arka planda
+    silinir. 202 + iş kaydı döner (ilerleme: /api/silme-isleri/<IsID>)
+    """
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("UPDATE PROJELER SET Silindi = 1 WHERE ProjeID = ? AND Silindi = 0", (id,))
+            if not cursor.rowcount:
+                return jsonify({'error': 'Proje bulunamadı'}), 404
+            # Üyelikler az sayıdadır; görünürlük aynı işlemde kalkar. Görevlerin
+            # atama sayaçları ve GOREVLER tombstone'ları parçalarla yazılır
+            uyeler = counters.project_members(cursor, id)
+            cursor.execute("DELETE FROM PROJE_UYE_ILISKISI WHERE ProjeID = ?", (id,))
+            counters.adjust(db_backend, cursor, counters.PROJE, counters.negated(uyeler))
+            log_changes(cursor, 'PROJELER', [(id, changelog.DELETE)])
+            is_id = deletion.create_job(db_backend, cursor, deletion.PROJE, id)
+            conn.commit()
+            table_versions.bump('PROJELER', 'GOREVLER', 'PROJE_UYE_ILISKISI')
+            detail_cache.invalidate(PROJE, id)
+            detail_cache.invalidate(PROFIL, *uyeler)
+            # Kümeler güncellenmeden önce: projeyi görenler silindiğini öğrenmeli
+            publish_change('proje', id, changelog.DELETE, id)
+            visibility_index.project_deleted(id)
+            deletion_jobs.submit(is_id)
+            return jsonify({'message': 'Proje silindi', 'IsID': is_id,
+                            'durum': f'/api/silme-isleri/{is_id}'}), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/projeler/<int:id>/uyeler', methods=['GET'])
+@table_versions.conditional('PROJE_UYE_ILISKISI', 'KULLANICILAR', 'ROLLER')
+def get_proje_uyeleri(id):
+    """Projenin üyelerini rolleriyle listeler"""
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT k.KullaniciID, k.Ad, k.Soyad, k.Eposta, pui.RolID
+                FROM PROJE_UYE_ILISKISI pui
+                JOIN KULLANICILAR k ON k.KullaniciID = pui.KullaniciID
+                WHERE pui.ProjeID = ?
+                ORDER BY k.Ad, k.Soyad
+            """, (id,))
 
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM PROJELER WHERE ProjeID = ?", (id,))
-        conn.commit()
-        conn.close()
-        return jsonify({'message': 'Proje silindi'})
+            return jsonify(kullanici_row.all(cursor, cursor.fetchall()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/projeler/<int:id>/uyeler', methods=['POST'])
+def add_proje_uyesi(id):
+    """Projeye üye ekler"""
+    try:
+        data = request.json or {}
+        kullanici_id = data.get('KullaniciID')
+        if not isinstance(kullanici_id, int):
+            return jsonify({'error': 'KullaniciID gerekli'}), 400
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            if not aktif_proje(cursor, id):
+                return jsonify({'error': 'Proje bulunamadı'}), 404
+            cursor.execute("SELECT 1 FROM KULLANICILAR WHERE KullaniciID = ? AND Silindi = 0", (kullanici_id,))
+            if not cursor.fetchone():
+                return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+            cursor.execute("""
+                SELECT 1 FROM PROJE_UYE_ILISKISI WHERE ProjeID = ? AND KullaniciID = ?
+            """, (id, kullanici_id))
+            if cursor.fetchone():
+                return jsonify({'error': 'Kullanıcı zaten bu projenin üyesi'}), 400
+
+            cursor.execute("""
+                INSERT INTO PROJE_UYE_ILISKISI (ProjeID, KullaniciID, RolID)
+                VALUES (?, ?, ?)
+            """, (id, kullanici_id, data.get('RolID')))
+            counters.adjust(db_backend, cursor, counters.PROJE, {kullanici_id: 1})
+            log_changes(cursor, changelog.GORUNURLUK, [(kullanici_id, changelog.VISIBILITY)])
+
+            conn.commit()
+            table_versions.bump('PROJE_UYE_ILISKISI')
+            detail_cache.invalidate(PROFIL, kullanici_id)
+            visibility_index.member_added(id, kullanici_id)
+            publish_visibility(kullanici_id)
+            return jsonify({'message': 'Üye eklendi'}), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/projeler/<int:id>/uyeler/<int:kullanici_id>', methods=['DELETE'])
+def remove_proje_uyesi(id, kullanici_id):
+    """Projeden üye çıkarır"""
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM PROJE_UYE_ILISKISI WHERE ProjeID = ? AND KullaniciID = ?
+            """, (id, kullanici_id))
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'Üyelik bulunamadı'}), 404
+            counters.adjust(db_backend, cursor, counters.PROJE, {kullanici_id: -1})
+            log_changes(cursor, changelog.GORUNURLUK, [(kullanici_id, changelog.VISIBILITY)])
+
+            conn.commit()
+            table_versions.bump('PROJE_UYE_ILISKISI')
+            detail_cache.invalidate(PROFIL, kullanici_id)
+            visibility_index.member_removed(id, kullanici_id)
+            publish_visibility(kullanici_id)
+            return jsonify({'message': 'Üye çıkarıldı'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -379,109 +955,142 @@ def delete_proje(id):
 # GOREVLER Endpoints - KULLANICI BAZLI
 # ========================================
 
+def gorevler_sorgusu(kullanici_id, kapsam, filters=(), params=(), cursor_values=None, limit=None):
+    """
+    Görev listesi sorgusu: (sql, params).
+    kapsam: proje_kapsami() sonucu (None ise tüm görevler); filters / params ek koşullar
+    """
+    filters = list(filters)
+    params = list(params)
+    if kapsam:
+        # Kullanıcıya atanmış görevler + kullanıcının projelerindeki görevler
+        kapsam_sql, kapsam_params = kapsam
+        filters.insert(0, f"g.GorevID IN ({queries.gorunur_gorevler(kapsam_sql)})")
+        params[0:0] = [kullanici_id, *kapsam_params]
+
+    # Keyset: son görülen (TeslimTarihi, GorevID) sonrasından devam et
+    if cursor_values:
+        filters.append("(g.TeslimTarihi > ? OR (g.TeslimTarihi = ? AND g.GorevID > ?))")
+        params.extend([cursor_values[0], cursor_values[0], cursor_values[1]])
+
+    sql = queries.GOREVLER_SELECT
+    if filters:
+        sql += " WHERE " + " AND ".join(filters)
+    sql += " ORDER BY g.TeslimTarihi ASC, g.GorevID ASC"
+    if limit:
+        # Sonraki sayfa olup olmadığını anlamak için bir fazla satır çek
+        sql += " " + db_backend.limit_clause
+        params.append(limit + 1)
+    return sql, params
+
+
+def gorev_sayfasi(cursor, sql, params, limit):
+    """gorevler_sorgusu(limit=...) sonucunu {items, next_cursor, has_more} sayfasına çevirir"""
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+
+    has_more = len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.TeslimTarihi, last.GorevID)
+
+    return {
+        'items': gorev_row.all(cursor, rows),
+        'next_cursor': next_cursor,
+        'has_more': has_more
+    }
+
+
 @app.route('/api/gorevler', methods=['GET'])
+@table_versions.conditional('GOREVLER', 'PROJELER', 'DURUMLAR', 'ONCELIKLER',
+                            'GOREV_ATAMALARI', 'PROJE_UYE_ILISKISI', vary=stream_format)
 def get_gorevler():
-    """Kullanıcının görevlerini listeler"""
+    """
+    Kullanıcının görevlerini listeler.
+    Filtreler: durum_id, oncelik_id, proje_id, teslim_baslangic, teslim_bitis (YYYY-MM-DD)
+    Sayfalama: limit ve cursor verilirse {items, next_cursor, has_more} döner
+    (TeslimTarihi, GorevID üzerinden keyset sayfalama)
+    Akış: sayfalama yokken ?stream=1 ile sonuç parça parça yazılır
+    """
     try:
-        # Kullanıcı ID'sini query parametresinden al
-        kullanici_id = request.args.get('kullanici_id', type=int)
-
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-
-        if kullanici_id:
-            # Kullanıcıya atanmış görevler + kullanıcının projelerindeki görevler
-            cursor.execute("""
-                SELECT DISTINCT g.GorevID, g.GorevAdi, g.Aciklama, g.TeslimTarihi,
-                       g.ProjeID, p.ProjeAdi,
-                       g.DurumID, d.DurumAdi,
-                       g.OncelikID, o.OncelikAdi
-                FROM GOREVLER g
-                LEFT JOIN PROJELER p ON g.ProjeID = p.ProjeID
-                LEFT JOIN DURUMLAR d ON g.DurumID = d.DurumID
-                LEFT JOIN ONCELIKLER o ON g.OncelikID = o.OncelikID
-                LEFT JOIN GOREV_ATAMALARI ga ON g.GorevID = ga.GorevID
-                LEFT JOIN PROJE_UYE_ILISKISI pui ON g.ProjeID = pui.ProjeID
-                WHERE ga.KullaniciID = ? OR pui.KullaniciID = ? OR p.YoneticiID = ?
-                ORDER BY g.TeslimTarihi ASC
-            """, (kullanici_id, kullanici_id, kullanici_id))
-        else:
-            # Tüm görevler (admin görünümü)
-            cursor.execute("""
-                SELECT g.GorevID, g.GorevAdi, g.Aciklama, g.TeslimTarihi,
-                       g.ProjeID, p.ProjeAdi,
-                       g.DurumID, d.DurumAdi,
-                       g.OncelikID, o.OncelikAdi
-                FROM GOREVLER g
-                LEFT JOIN PROJELER p ON g.ProjeID = p.ProjeID
-                LEFT JOIN DURUMLAR d ON g.DurumID = d.DurumID
-                LEFT JOIN ONCELIKLER o ON g.OncelikID = o.OncelikID
-                ORDER BY g.TeslimTarihi ASC
-            """)
-
-        gorevler = []
-        for row in cursor.fetchall():
-            gorevler.append({
-                'GorevID': row.GorevID,
-                'GorevAdi': row.GorevAdi,
-                'Aciklama': row.Aciklama,
-                'TeslimTarihi': format_date(row.TeslimTarihi),
-                'ProjeID': row.ProjeID,
-                'ProjeAdi': row.ProjeAdi if row.ProjeAdi else '',
-                'DurumID': row.DurumID,
-                'DurumAdi': row.DurumAdi if row.DurumAdi else '',
-                'OncelikID': row.OncelikID,
-                'OncelikAdi': row.OncelikAdi if row.OncelikAdi else ''
-            })
-
-        conn.close()
-        return jsonify(gorevler)
+        # Kullanıcı oturumdan (veya kullanici_id query parametresinden) gelir
+        kullanici_id = request_user_id()
+
+        try:
+            limit, cursor_values = parse_page_args(size=2)
+            teslim_baslangic = parse_date_arg('teslim_baslangic')
+            teslim_bitis = parse_date_arg('teslim_bitis')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        filters = []
+        params = []
+
+        # Sunucu tarafı filtreler
+        for arg, column in (('durum_id', 'g.DurumID'),
+                            ('oncelik_id', 'g.OncelikID'),
+                            ('proje_id', 'g.ProjeID')):
+            value = request.args.get(arg, type=int)
+            if value is not None:
+                filters.append(f"{column} = ?")
+                params.append(value)
+        if teslim_baslangic:
+            filters.append("g.TeslimTarihi >= ?")
+            params.append(teslim_baslangic)
+        if teslim_bitis:
+            filters.append("g.TeslimTarihi <= ?")
+            params.append(teslim_bitis)
+
+        sql, params = gorevler_sorgusu(kullanici_id, proje_kapsami(kullanici_id) if kullanici_id else None,
+                                       filters, params, cursor_values, limit)
+        if not limit:
+            # Sayfa zaten sınırlı; akış sadece tüm listeyi isteyen çağrılar için
+            fmt = stream_format()
+            if fmt:
+                return stream_query(db_pool, sql, params, gorev_row, fmt)
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            if limit:
+                return jsonify(gorev_sayfasi(cursor, sql, params, limit))
+
+            cursor.execute(sql, params)
+            return jsonify(gorev_row.all(cursor, cursor.fetchall()))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/gorevler/<int:id>', methods=['GET'])
+@table_versions.conditional('GOREVLER', 'PROJELER', 'DURUMLAR', 'ONCELIKLER')
 def get_gorev(id):
     """Belirli bir görevi getirir"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT g.GorevID, g.GorevAdi, g.Aciklama, g.TeslimTarihi,
-                   g.ProjeID, p.ProjeAdi,
-                   g.DurumID, d.DurumAdi,
-                   g.OncelikID, o.OncelikAdi
-            FROM GOREVLER g
-            LEFT JOIN PROJELER p ON g.ProjeID = p.ProjeID
-            LEFT JOIN DURUMLAR d ON g.DurumID = d.DurumID
-            LEFT JOIN ONCELIKLER o ON g.OncelikID = o.OncelikID
-            WHERE g.GorevID = ?
-        """, (id,))
-
-        row = cursor.fetchone()
-        if not row:
-            return jsonify({'error': 'Görev bulunamadı'}), 404
-
-        gorev = {
-            'GorevID': row.GorevID,
-            'GorevAdi': row.GorevAdi,
-            'Aciklama': row.Aciklama,
-            'TeslimTarihi': format_date(row.TeslimTarihi),
-            'ProjeID': row.ProjeID,
-            'ProjeAdi': row.ProjeAdi if row.ProjeAdi else '',
-            'DurumID': row.DurumID,
-            'DurumAdi': row.DurumAdi if row.DurumAdi else '',
-            'OncelikID': row.OncelikID,
-            'OncelikAdi': row.OncelikAdi if row.OncelikAdi else ''
-        }
+        gorev = detail_cache.get(GOREV, id)
+        if gorev is not None:
+            return jsonify(gorev)
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute(queries.GOREVLER_SELECT + " WHERE g.GorevID = ?", (id,))
 
-        conn.close()
+            row = cursor.fetchone()
+            if not row:
+                return jsonify({'error': 'Görev bulunamadı'}), 404
+
+            gorev = gorev_row.one(cursor, row)
+
+        # Yanıtta proje adı ve durum / öncelik adları var
+        detail_cache.put(GOREV, id, gorev, tags=[tag(PROJE, gorev['ProjeID']), TANIMLAR])
         return jsonify(gorev)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -492,30 +1101,33 @@ def create_gorev():
     """Yeni görev oluşturur"""
     try:
         data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO GOREVLER (GorevAdi, Aciklama, TeslimTarihi, ProjeID, DurumID, OncelikID)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            data['GorevAdi'],
-            data.get('Aciklama'),
-            data['TeslimTarihi'],
-            data['ProjeID'],
-            data.get('DurumID', 1),
-            data.get('OncelikID', 3)
-        ))
-
-        conn.commit()
-
-        cursor.execute("SELECT @@IDENTITY")
-        new_id = cursor.fetchone()[0]
-
-        conn.close()
-        return jsonify({'message': 'Görev oluşturuldu', 'GorevID': new_id}), 201
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            if not aktif_proje(cursor, data['ProjeID']):
+                return jsonify({'error': 'Proje bulunamadı'}), 404
+            cursor.execute("""
+                INSERT INTO GOREVLER (GorevAdi, Aciklama, TeslimTarihi, ProjeID, DurumID, OncelikID)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                data['GorevAdi'],
+                data.get('Aciklama'),
+                data['TeslimTarihi'],
+                data['ProjeID'],
+                data.get('DurumID', 1),
+                data.get('OncelikID', 3)
+            ))
+            new_id = db_backend.last_insert_id(cursor)
+            log_changes(cursor, 'GOREVLER', [(new_id, changelog.UPSERT)])
+
+            conn.commit()
+            table_versions.bump('GOREVLER')
+            search_index.task_changed(new_id, data['ProjeID'], data['GorevAdi'], data.get('Aciklama'))
+            publish_change('gorev', new_id, changelog.UPSERT, data['ProjeID'])
+
+            return jsonify({'message': 'Görev oluşturuldu', 'GorevID': new_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -525,29 +1137,45 @@ def update_gorev(id):
     """Görev bilgilerini günceller"""
     try:
         data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE GOREVLER
-            SET GorevAdi = ?, Aciklama = ?, TeslimTarihi = ?, 
-                ProjeID = ?, DurumID = ?, OncelikID = ?
-            WHERE GorevID = ?
-        """, (
-            data['GorevAdi'],
-            data.get('Aciklama'),
-            data['TeslimTarihi'],
-            data['ProjeID'],
-            data['DurumID'],
-            data['OncelikID'],
-            id
-        ))
-
-        conn.commit()
-        conn.close()
-        return jsonify({'message': 'Görev güncellendi'})
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            # Görev başka projeye taşınırsa eski projeyi görenlere de duyurulur
+            eski_proje = aktif_gorev_projesi(cursor, id)
+            if eski_proje is None:
+                return jsonify({'error': 'Görev bulunamadı'}), 404
+            if data['ProjeID'] != eski_proje and not aktif_proje(cursor, data['ProjeID']):
+                return jsonify({'error': 'Proje bulunamadı'}), 404
+
+            cursor.execute("""
+                UPDATE GOREVLER
+                SET GorevAdi = ?, Aciklama = ?, TeslimTarihi = ?, 
+                    ProjeID = ?, DurumID = ?, OncelikID = ?
+                WHERE GorevID = ?
+            """, (
+                data['GorevAdi'],
+                data.get('Aciklama'),
+                data['TeslimTarihi'],
+                data['ProjeID'],
+                data['DurumID'],
+                data['OncelikID'],
+                id
+            ))
+            if cursor.rowcount == 0:
+                # Kontrolden sonra silinmiş; arama indeksine / olaylara hayalet kayıt yazılmaz
+                return jsonify({'error': 'Görev bulunamadı'}), 404
+            log_changes(cursor, 'GOREVLER', [(id, changelog.UPSERT)])
+
+            conn.commit()
+            table_versions.bump('GOREVLER')
+            detail_cache.invalidate(GOREV, id)
+            search_index.task_changed(id, data['ProjeID'], data['GorevAdi'], data.get('Aciklama'))
+            publish_change('gorev', id, changelog.UPSERT, data['ProjeID'])
+            if eski_proje != data['ProjeID']:
+                publish_change('gorev', id, changelog.UPSERT, eski_proje)
+            return jsonify({'message': 'Görev güncellendi'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -556,15 +1184,450 @@ def update_gorev(id):
 def delete_gorev(id):
     """Görev siler"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            proje_id = aktif_gorev_projesi(cursor, id)
+            if proje_id is None:
+                return jsonify({'error': 'Görev bulunamadı'}), 404
+            atamalar = counters.task_assignments(cursor, gorev_ids=[id])
+            cursor.execute("DELETE FROM GOREVLER WHERE GorevID = ?", (id,))
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'Görev bulunamadı'}), 404
+            counters.adjust(db_backend, cursor, counters.GOREV, counters.negated(atamalar))
+            log_changes(cursor, 'GOREVLER', [(id, changelog.DELETE)])
+            conn.commit()
+            table_versions.bump('GOREVLER', 'GOREV_ATAMALARI', 'YORUMLAR')
+            detail_cache.invalidate(GOREV, id)
+            detail_cache.invalidate(PROFIL, *atamalar)
+            search_index.tasks_removed([id])
+            publish_change('gorev', id, changelog.DELETE, proje_id)
+            return jsonify({'message': 'Görev silindi'})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/gorevler/<int:id>/atamalar', methods=['GET'])
+@table_versions.conditional('GOREV_ATAMALARI', 'KULLANICILAR')
+def get_gorev_atamalari(id):
+    """Göreve atanmış kullanıcıları listeler"""
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT k.KullaniciID, k.Ad, k.Soyad, k.Eposta
+                FROM GOREV_ATAMALARI ga
+                JOIN KULLANICILAR k ON k.KullaniciID = ga.KullaniciID AND k.Silindi = 0
+                WHERE ga.GorevID = ?
+                ORDER BY k.Ad, k.Soyad
+            """, (id,))
+
+            return jsonify(atanan_row.all(cursor, cursor.fetchall()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def publish_assignment(gorev_id, proje_id, kullanici_id):
+    """Atama değişikliğini projeyi görenlere ve projeyi görmüyorsa atanan kullanıcıya duyurur"""
+    publish_change('gorev', gorev_id, changelog.UPSERT, proje_id)
+    if proje_id not in (visibility_index.peek(kullanici_id) or ()):
+        event_hub.publish('gorev', {'KayitID': gorev_id, 'Islem': changelog.UPSERT, 'ProjeID': proje_id},
+                          kullanici_id=kullanici_id)
+
+
+@app.route('/api/gorevler/<int:id>/atamalar', methods=['POST'])
+def add_gorev_atamasi(id):
+    """Görevi kullanıcıya atar"""
+    try:
+        data = request.json or {}
+        kullanici_id = data.get('KullaniciID')
+        if not isinstance(kullanici_id, int):
+            return jsonify({'error': 'KullaniciID gerekli'}), 400
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            proje_id = aktif_gorev_projesi(cursor, id)
+            if proje_id is None:
+                return jsonify({'error': 'Görev bulunamadı'}), 404
+            cursor.execute("SELECT 1 FROM KULLANICILAR WHERE KullaniciID = ? AND Silindi = 0", (kullanici_id,))
+            if not cursor.fetchone():
+                return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+            cursor.execute("""
+                SELECT 1 FROM GOREV_ATAMALARI WHERE GorevID = ? AND KullaniciID = ?
+            """, (id, kullanici_id))
+            if cursor.fetchone():
+                return jsonify({'error': 'Görev zaten bu kullanıcıya atanmış'}), 400
 
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM GOREVLER WHERE GorevID = ?", (id,))
-        conn.commit()
-        conn.close()
-        return jsonify({'message': 'Görev silindi'})
+            cursor.execute("""
+                INSERT INTO GOREV_ATAMALARI (GorevID, KullaniciID) VALUES (?, ?)
+            """, (id, kullanici_id))
+            counters.adjust(db_backend, cursor, counters.GOREV, {kullanici_id: 1})
+            # Atanan kullanıcının görebildiği görevler değişti; /api/sync görevi yeniden gönderir
+            log_changes(cursor, 'GOREVLER', [(id, changelog.UPSERT)])
+
+            conn.commit()
+            table_versions.bump('GOREV_ATAMALARI')
+            detail_cache.invalidate(PROFIL, kullanici_id)
+            publish_assignment(id, proje_id, kullanici_id)
+            return jsonify({'message': 'Görev atandı'}), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/gorevler/<int:id>/atamalar/<int:kullanici_id>', methods=['DELETE'])
+def remove_gorev_atamasi(id, kullanici_id):
+    """Görev atamasını kaldırır"""
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("SELECT ProjeID FROM GOREVLER WHERE GorevID = ?", (id,))
+            gorev = cursor.fetchone()
+            cursor.execute("""
+                DELETE FROM GOREV_ATAMALARI WHERE GorevID = ? AND KullaniciID = ?
+            """, (id, kullanici_id))
+            if cursor.rowcount == 0:
+                return jsonify({'error': 'Atama bulunamadı'}), 404
+            counters.adjust(db_backend, cursor, counters.GOREV, {kullanici_id: -1})
+            # Görev artık görünmüyorsa /api/sync onu silinenler arasında döndürür
+            log_changes(cursor, 'GOREVLER', [(id, changelog.UPSERT)])
+
+            conn.commit()
+            table_versions.bump('GOREV_ATAMALARI')
+            detail_cache.invalidate(PROFIL, kullanici_id)
+            publish_assignment(id, gorev.ProjeID, kullanici_id)
+            return jsonify({'message': 'Atama kaldırıldı'})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ========================================
+# GOREVLER Toplu İşlemler
+# ========================================
+#
+# Tüm toplu endpoint'ler aynı sözleşmeyi izler:
+# - Her kayıt önce doğrulanır; sonuç listesinde her kaydın index'i ve durumu döner
+# - atomic=true (varsayılan): tek bir kayıt bile hatalıysa hiçbir şey yazılmaz (400)
+# - atomic=false: geçerli kayıtlar yazılır, hatalılar raporlanır (207)
+# - Yazma sırasında veritabanı hatası olursa tüm işlem geri alınır (500)
+
+GOREV_ALANLARI = ('GorevAdi', 'Aciklama', 'TeslimTarihi', 'ProjeID', 'DurumID', 'OncelikID')
+
+
+def _bulk_payload(key):
+    """Toplu istek gövdesini okur: {key: [...], 'atomic': bool}"""
+    data = request.json
+    if not isinstance(data, dict) or not isinstance(data.get(key), list):
+        raise ValueError(f"'{key}' listesi gerekli")
+    items = data[key]
+    if not items:
+        raise ValueError(f"'{key}' listesi boş")
+    if len(items) > BULK_MAX_ITEMS:
+        raise ValueError(f'Tek istekte en fazla {BULK_MAX_ITEMS} kayıt gönderilebilir')
+    return items, bool(data.get('atomic', True))
+
+
+def _validate_gorev(item, for_update):
+    """Toplu işlemdeki bir görev kaydını doğrular; (değerler, hata) döndürür"""
+    if not isinstance(item, dict):
+        return None, 'Kayıt bir nesne olmalı'
+
+    required = ['GorevAdi', 'TeslimTarihi', 'ProjeID']
+    if for_update:
+        required += ['GorevID', 'DurumID', 'OncelikID']
+    missing = [k for k in required if item.get(k) in (None, '')]
+    if missing:
+        return None, f"Eksik alan: {', '.join(missing)}"
+
+    try:
+        datetime.strptime(str(item['TeslimTarihi']), '%Y-%m-%d')
+    except ValueError:
+        return None, 'TeslimTarihi YYYY-MM-DD biçiminde olmalı'
+
+    values = {
+        'GorevAdi': item['GorevAdi'],
+        'Aciklama': item.get('Aciklama'),
+        'TeslimTarihi': item['TeslimTarihi'],
+        'ProjeID': item['ProjeID'],
+        'DurumID': item.get('DurumID', 1),
+        'OncelikID': item.get('OncelikID', 3)
+    }
+    for key in ('ProjeID', 'DurumID', 'OncelikID') + (('GorevID',) if for_update else ()):
+        value = item[key] if key == 'GorevID' else values[key]
+        if not isinstance(value, int) or isinstance(value, bool):
+            return None, f'{key} tam sayı olmalı'
+    if not lookup_cache.durum_adi(values['DurumID']):
+        return None, 'Geçersiz DurumID'
+    if not lookup_cache.oncelik_adi(values['OncelikID']):
+        return None, 'Geçersiz OncelikID'
+
+    if for_update:
+        values['GorevID'] = item['GorevID']
+    return values, None
+
+
+def _existing_ids(cursor, table, id_column, ids, chunk_size=500, where=''):
+    """
+    Verilen ID'lerden tabloda bulunanları döndürür (IN listesi parçalara bölünür).
+    where: ek koşul, örn. " AND Silindi = 0"
+    """
+    ids = list(set(ids))
+    found = set()
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        cursor.execute(
+            f"SELECT {id_column} FROM {table} WHERE {id_column} IN ({', '.join('?' * len(chunk))}){where}",
+            chunk
+        )
+        found.update(row[0] for row in cursor.fetchall())
+    return found
+
+
+def _gorev_projeleri(cursor, ids, chunk_size=500):
+    """
+    Var olan görevlerin GorevID -> ProjeID eşlemesi (olay yayını için). Projesi silinmekte
+    olan görevler dahil edilmez; toplu yazmalar da bunları bulunamadı sayar (bkz. aktif_gorev_projesi)
+    """
+    ids = list(set(ids))
+    found = {}
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        cursor.execute(f"""
+            SELECT g.GorevID, g.ProjeID FROM GOREVLER g
+            JOIN PROJELER p ON p.ProjeID = g.ProjeID AND p.Silindi = 0
+            WHERE g.GorevID IN ({', '.join('?' * len(chunk))})
+        """, chunk)
+        found.update((row[0], row[1]) for row in cursor.fetchall())
+    return found
+
+
+def _publish_bulk(islem, proje_ids):
+    """Toplu işlemde her kayıt yerine etkilenen proje başına tek olay yayınlanır"""
+    for proje_id in set(proje_ids):
+        publish_change('gorev', None, islem, proje_id)
+
+
+def _bulk_response(results, atomic, success_status):
+    """Toplu işlem sonucunu sözleşmeye uygun HTTP yanıtına çevirir"""
+    failed = [r for r in results if r['status'] in ('error', 'not_found')]
+    summary = {
+        'results': results,
+        'succeeded': len(results) - len(failed) if not (atomic and failed) else 0,
+        'failed': len(failed)
+    }
+    if failed and atomic:
+        summary['error'] = 'Hatalı kayıtlar var; hiçbir değişiklik yapılmadı'
+        return jsonify(summary), 400
+    return jsonify(summary), 207 if failed else success_status
+
+
+@app.route('/api/gorevler/bulk', methods=['POST'])
+def create_gorevler_bulk():
+    """Birden fazla görevi tek işlemde oluşturur"""
+    try:
+        try:
+            items, atomic = _bulk_payload('gorevler')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        results = []
+        valid = []
+        for index, item in enumerate(items):
+            values, error = _validate_gorev(item, for_update=False)
+            if error:
+                results.append({'index': index, 'status': 'error', 'error': error})
+            else:
+                results.append({'index': index, 'status': 'pending'})
+                valid.append((index, values))
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+
+            # Var olmayan projelere ait kayıtlar FK hatasıyla tüm işlemi düşürmesin
+            projeler = _existing_ids(cursor, 'PROJELER', 'ProjeID', [v['ProjeID'] for _, v in valid],
+                                     where=" AND Silindi = 0")
+            for index, values in list(valid):
+                if values['ProjeID'] not in projeler:
+                    results[index] = {'index': index, 'status': 'error', 'error': 'Proje bulunamadı'}
+                    valid.remove((index, values))
+
+            if atomic and len(valid) != len(items):
+                for r in results:
+                    if r['status'] == 'pending':
+                        r['status'] = 'skipped'
+                return _bulk_response(results, atomic, 201)
+
+            try:
+                new_ids = db_backend.bulk_insert(
+                    cursor, 'GOREVLER', GOREV_ALANLARI,
+                    [tuple(values[k] for k in GOREV_ALANLARI) for _, values in valid],
+                    'GorevID'
+                )
+                log_changes(cursor, 'GOREVLER', [(int(g), changelog.UPSERT) for g in new_ids])
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                return jsonify({'error': f'Toplu ekleme geri alındı: {str(e)}'}), 500
+            if valid:
+                table_versions.bump('GOREVLER')
+                for (_, values), new_id in zip(valid, new_ids):
+                    search_index.task_changed(int(new_id), values['ProjeID'],
+                                              values['GorevAdi'], values['Aciklama'])
+                _publish_bulk(changelog.UPSERT, [values['ProjeID'] for _, values in valid])
+
+        for (index, _), new_id in zip(valid, new_ids):
+            results[index] = {'index': index, 'status': 'created', 'GorevID': int(new_id)}
+        return _bulk_response(results, atomic, 201)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/gorevler/bulk', methods=['PUT'])
+def update_gorevler_bulk():
+    """Birden fazla görevi tek işlemde günceller"""
+    try:
+        try:
+            items, atomic = _bulk_payload('gorevler')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        results = []
+        valid = []
+        for index, item in enumerate(items):
+            values, error = _validate_gorev(item, for_update=True)
+            if error:
+                results.append({'index': index, 'status': 'error', 'error': error})
+            else:
+                results.append({'index': index, 'status': 'pending', 'GorevID': values['GorevID']})
+                valid.append((index, values))
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+
+            gorevler = _gorev_projeleri(cursor, [v['GorevID'] for _, v in valid])
+            projeler = _existing_ids(cursor, 'PROJELER', 'ProjeID', [v['ProjeID'] for _, v in valid],
+                                     where=" AND Silindi = 0")
+            for index, values in list(valid):
+                if values['GorevID'] not in gorevler:
+                    results[index] = {'index': index, 'status': 'not_found',
+                                      'GorevID': values['GorevID'], 'error': 'Görev bulunamadı'}
+                    valid.remove((index, values))
+                elif values['ProjeID'] not in projeler:
+                    results[index] = {'index': index, 'status': 'error',
+                                      'GorevID': values['GorevID'], 'error': 'Proje bulunamadı'}
+                    valid.remove((index, values))
+
+            if atomic and len(valid) != len(items):
+                for r in results:
+                    if r['status'] == 'pending':
+                        r['status'] = 'skipped'
+                return _bulk_response(results, atomic, 200)
+
+            try:
+                db_backend.executemany(cursor, """
+                    UPDATE GOREVLER
+                    SET GorevAdi = ?, Aciklama = ?, TeslimTarihi = ?,
+                        ProjeID = ?, DurumID = ?, OncelikID = ?
+                    WHERE GorevID = ?
+                """, [tuple(values[k] for k in GOREV_ALANLARI) + (values['GorevID'],)
+                      for _, values in valid])
+                log_changes(cursor, 'GOREVLER',
+                            [(values['GorevID'], changelog.UPSERT) for _, values in valid])
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                return jsonify({'error': f'Toplu güncelleme geri alındı: {str(e)}'}), 500
+            if valid:
+                table_versions.bump('GOREVLER')
+                detail_cache.invalidate(GOREV, *[values['GorevID'] for _, values in valid])
+                for _, values in valid:
+                    search_index.task_changed(values['GorevID'], values['ProjeID'],
+                                              values['GorevAdi'], values['Aciklama'])
+                # Başka projeye taşınan görevler eski projeyi görenlere de duyurulur
+                _publish_bulk(changelog.UPSERT,
+                              [values['ProjeID'] for _, values in valid] +
+                              [gorevler[values['GorevID']] for _, values in valid])
+
+        for index, _ in valid:
+            results[index]['status'] = 'updated'
+        return _bulk_response(results, atomic, 200)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/gorevler/bulk', methods=['DELETE'])
+def delete_gorevler_bulk():
+    """Birden fazla görevi tek işlemde siler"""
+    try:
+        try:
+            ids, atomic = _bulk_payload('GorevIDs')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        results = []
+        valid = []
+        for index, gorev_id in enumerate(ids):
+            if not isinstance(gorev_id, int) or isinstance(gorev_id, bool):
+                results.append({'index': index, 'status': 'error', 'error': 'GorevID tam sayı olmalı'})
+            else:
+                results.append({'index': index, 'status': 'pending', 'GorevID': gorev_id})
+                valid.append((index, gorev_id))
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+
+            gorevler = _gorev_projeleri(cursor, [g for _, g in valid])
+            for index, gorev_id in list(valid):
+                if gorev_id not in gorevler:
+                    results[index] = {'index': index, 'status': 'not_found',
+                                      'GorevID': gorev_id, 'error': 'Görev bulunamadı'}
+                    valid.remove((index, gorev_id))
+
+            if atomic and len(valid) != len(ids):
+                for r in results:
+                    if r['status'] == 'pending':
+                        r['status'] = 'skipped'
+                return _bulk_response(results, atomic, 200)
+
+            try:
+                atamalar = counters.task_assignments(cursor, gorev_ids=[g for _, g in valid])
+                db_backend.executemany(cursor, "DELETE FROM GOREVLER WHERE GorevID = ?",
+                                       [(gorev_id,) for _, gorev_id in valid])
+                counters.adjust(db_backend, cursor, counters.GOREV, counters.negated(atamalar))
+                log_changes(cursor, 'GOREVLER', [(gorev_id, changelog.DELETE) for _, gorev_id in valid])
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                return jsonify({'error': f'Toplu silme geri alındı: {str(e)}'}), 500
+            if valid:
+                table_versions.bump('GOREVLER', 'GOREV_ATAMALARI', 'YORUMLAR')
+                detail_cache.invalidate(GOREV, *[g for _, g in valid])
+                detail_cache.invalidate(PROFIL, *atamalar)
+                search_index.tasks_removed([g for _, g in valid])
+                _publish_bulk(changelog.DELETE, [gorevler[g] for _, g in valid])
+
+        for index, _ in valid:
+            results[index]['status'] = 'deleted'
+        return _bulk_response(results, atomic, 200)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -573,56 +1636,44 @@ def delete_gorev(id):
 # EKİP ÜYELERİ - KULLANICI BAZLI
 # ========================================
 
+def ekip_sorgusu(kapsam):
+    """Ekip listesi sorgusu: (sql, params). kapsam: proje_kapsami() sonucu, None ise tümü"""
+    if kapsam:
+        # Kullanıcının projelerindeki tüm ekip üyeleri
+        kapsam_sql, params = kapsam
+        return queries.ekip_kullanici(kapsam_sql), params
+    # Tüm kullanıcılar (admin görünümü)
+    return """
+        SELECT DISTINCT k.KullaniciID, k.Ad, k.Soyad, k.Eposta, pui.RolID
+        FROM KULLANICILAR k
+        LEFT JOIN PROJE_UYE_ILISKISI pui ON k.KullaniciID = pui.KullaniciID
+        WHERE k.Silindi = 0
+        ORDER BY k.Ad, k.Soyad
+    """, ()
+
+
 @app.route('/api/ekip', methods=['GET'])
+@table_versions.conditional('KULLANICILAR', 'PROJE_UYE_ILISKISI', 'PROJELER', 'ROLLER',
+                            vary=stream_format)
 def get_ekip():
     """Kullanıcının projelerindeki ekip üyelerini listeler"""
     try:
-        # Kullanıcı ID'sini query parametresinden al
-        kullanici_id = request.args.get('kullanici_id', type=int)
+        # Kullanıcı oturumdan (veya kullanici_id query parametresinden) gelir
+        kullanici_id = request_user_id()
+        sql, params = ekip_sorgusu(proje_kapsami(kullanici_id) if kullanici_id else None)
 
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+        fmt = stream_format()
+        if fmt:
+            return stream_query(db_pool, sql, params, kullanici_row, fmt)
 
-        cursor = conn.cursor()
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        if kullanici_id:
-            # Kullanıcının projelerindeki tüm ekip üyeleri
-            cursor.execute("""
-                SELECT DISTINCT k.KullaniciID, k.Ad, k.Soyad, k.Eposta, r.RolAdi
-                FROM KULLANICILAR k
-                LEFT JOIN PROJE_UYE_ILISKISI pui ON k.KullaniciID = pui.KullaniciID
-                LEFT JOIN ROLLER r ON pui.RolID = r.RolID
-                WHERE pui.ProjeID IN (
-                    SELECT DISTINCT p.ProjeID
-                    FROM PROJELER p
-                    LEFT JOIN PROJE_UYE_ILISKISI pui2 ON p.ProjeID = pui2.ProjeID
-                    WHERE p.YoneticiID = ? OR pui2.KullaniciID = ?
-                )
-                ORDER BY k.Ad, k.Soyad
-            """, (kullanici_id, kullanici_id))
-        else:
-            # Tüm kullanıcılar (admin görünümü)
-            cursor.execute("""
-                SELECT DISTINCT k.KullaniciID, k.Ad, k.Soyad, k.Eposta, r.RolAdi
-                FROM KULLANICILAR k
-                LEFT JOIN PROJE_UYE_ILISKISI pui ON k.KullaniciID = pui.KullaniciID
-                LEFT JOIN ROLLER r ON pui.RolID = r.RolID
-                ORDER BY k.Ad, k.Soyad
-            """)
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
 
-        ekip = []
-        for row in cursor.fetchall():
-            ekip.append({
-                'KullaniciID': row.KullaniciID,
-                'Ad': row.Ad,
-                'Soyad': row.Soyad,
-                'Eposta': row.Eposta,
-                'Rol': row.RolAdi if row.RolAdi else 'Ekip Üyesi'
-            })
-
-        conn.close()
-        return jsonify(ekip)
+            return jsonify(kullanici_row.all(cursor, cursor.fetchall()))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -631,36 +1682,120 @@ def get_ekip():
 # YORUMLAR Endpoints
 # ========================================
 
+# Yorum özeti isteğinde en fazla görev sayısı
+YORUM_OZET_MAX_IDS = 500
+
+
 @app.route('/api/yorumlar/gorev/<int:gorev_id>', methods=['GET'])
+@table_versions.conditional('YORUMLAR', 'KULLANICILAR', vary=stream_format)
 def get_yorumlar(gorev_id):
-    """Belirli bir göreve ait yorumları listeler"""
+    """
+    Belirli bir göreve ait yorumları yeniden eskiye listeler (?stream=1 ile akışlı).
+    Sayfalama: limit ve cursor verilirse {items, next_cursor, has_more} döner
+    ((Tarih, YorumID) üzerinden keyset sayfalama)
+    """
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+        try:
+            limit, cursor_values = parse_page_args(size=2)
+            tarih = parse_cursor_datetime(cursor_values[0]) if cursor_values else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
-        cursor = conn.cursor()
-        cursor.execute("""
+        sql = """
             SELECT y.YorumID, y.YorumMetni, y.Tarih,
                    k.Ad, k.Soyad
             FROM YORUMLAR y
-            JOIN KULLANICILAR k ON y.KullaniciID = k.KullaniciID
+            JOIN KULLANICILAR k ON y.KullaniciID = k.KullaniciID AND k.Silindi = 0
             WHERE y.GorevID = ?
-            ORDER BY y.Tarih DESC
-        """, (gorev_id,))
-
-        yorumlar = []
-        for row in cursor.fetchall():
-            yorumlar.append({
-                'YorumID': row.YorumID,
-                'YorumMetni': row.YorumMetni,
-                'Tarih': str(row.Tarih),
-                'KullaniciAd': row.Ad,
-                'KullaniciSoyad': row.Soyad
+        """
+        params = [gorev_id]
+
+        # Keyset: son görülen (Tarih, YorumID) öncesinden devam et
+        if cursor_values:
+            sql += " AND (y.Tarih < ? OR (y.Tarih = ? AND y.YorumID < ?))"
+            params.extend([tarih, tarih, cursor_values[1]])
+
+        sql += " ORDER BY y.Tarih DESC, y.YorumID DESC"
+        if limit:
+            # Sonraki sayfa olup olmadığını anlamak için bir fazla satır çek
+            sql += " " + db_backend.limit_clause
+            params.append(limit + 1)
+        else:
+            fmt = stream_format()
+            if fmt:
+                return stream_query(db_pool, sql, params, yorum_row, fmt)
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+            has_more = bool(limit) and len(rows) > limit
+            if has_more:
+                rows = rows[:limit]
+
+            yorumlar = yorum_row.all(cursor, rows)
+
+            if not limit:
+                return jsonify(yorumlar)
+
+            next_cursor = None
+            if has_more:
+                last = rows[-1]
+                next_cursor = encode_cursor(last.Tarih, last.YorumID)
+
+            return jsonify({
+                'items': yorumlar,
+                'next_cursor': next_cursor,
+                'has_more': has_more
             })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 
-        conn.close()
-        return jsonify(yorumlar)
+def yorum_ozetleri(cursor, gorev_ids):
+    """{str(GorevID): {YorumSayisi, SonYorum}}; yorumu olmayan görevler 0 / None ile döner"""
+    ozet = {str(g): {'YorumSayisi': 0, 'SonYorum': None} for g in gorev_ids}
+    if not gorev_ids:
+        return ozet
+    id_sql, params = queries.id_list(gorev_ids)
+    cursor.execute(f"""
+        SELECT GorevID, COUNT(*) AS YorumSayisi, MAX(Tarih) AS SonYorum
+        FROM YORUMLAR
+        WHERE GorevID IN ({id_sql})
+        GROUP BY GorevID
+    """, params)
+    for row in cursor.fetchall():
+        ozet[str(row.GorevID)] = {'YorumSayisi': row.YorumSayisi, 'SonYorum': str(row.SonYorum)}
+    return ozet
+
+
+@app.route('/api/yorumlar/ozet', methods=['GET'])
+@table_versions.conditional('YORUMLAR')
+def get_yorum_ozetleri():
+    """
+    Birden fazla görevin yorum sayısı ve son yorum tarihi, tek gruplu sorguyla.
+    ?gorev_ids=1,2,3 -> {"1": {"YorumSayisi": 4, "SonYorum": "..."}, ...}
+    Yorumu olmayan görevler 0 / null ile döner.
+    """
+    try:
+        try:
+            gorev_ids = sorted({int(v) for v in request.args.get('gorev_ids', '').split(',') if v.strip()})
+        except ValueError:
+            return jsonify({'error': 'gorev_ids virgülle ayrılmış tam sayılar olmalı'}), 400
+        if not gorev_ids:
+            return jsonify({'error': 'gorev_ids gerekli'}), 400
+        if len(gorev_ids) > YORUM_OZET_MAX_IDS:
+            return jsonify({'error': f'En fazla {YORUM_OZET_MAX_IDS} görev istenebilir'}), 400
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            return jsonify(yorum_ozetleri(conn.cursor(), gorev_ids))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -670,23 +1805,27 @@ def create_yorum():
     """Yeni yorum oluşturur"""
     try:
         data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO YORUMLAR (GorevID, KullaniciID, YorumMetni)
-            VALUES (?, ?, ?)
-        """, (data['GorevID'], data['KullaniciID'], data['YorumMetni']))
-
-        conn.commit()
-
-        cursor.execute("SELECT @@IDENTITY")
-        new_id = cursor.fetchone()[0]
-
-        conn.close()
-        return jsonify({'message': 'Yorum eklendi', 'YorumID': new_id}), 201
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            proje_id = aktif_gorev_projesi(cursor, data['GorevID'])
+            if proje_id is None:
+                return jsonify({'error': 'Görev bulunamadı'}), 404
+            cursor.execute("""
+                INSERT INTO YORUMLAR (GorevID, KullaniciID, YorumMetni)
+                VALUES (?, ?, ?)
+            """, (data['GorevID'], data['KullaniciID'], data['YorumMetni']))
+            new_id = db_backend.last_insert_id(cursor)
+            log_changes(cursor, 'YORUMLAR', [(new_id, changelog.UPSERT)])
+
+            conn.commit()
+            table_versions.bump('YORUMLAR')
+            search_index.comment_added(new_id, data['GorevID'], data['KullaniciID'], data['YorumMetni'])
+            publish_change('yorum', new_id, changelog.UPSERT, proje_id)
+
+            return jsonify({'message': 'Yorum eklendi', 'YorumID': new_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -705,43 +1844,42 @@ def register():
         if not all(k in data for k in ['Ad', 'Soyad', 'Eposta', 'Sifre']):
             return jsonify({'error': 'Tüm alanları doldurun'}), 400
 
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-
-        # E-posta kontrolü - Bu e-posta daha önce kullanılmış mı?
-        cursor.execute("SELECT KullaniciID FROM KULLANICILAR WHERE Eposta = ?", (data['Eposta'],))
-        if cursor.fetchone():
-            conn.close()
-            return jsonify({'error': 'Bu e-posta adresi zaten kullanılıyor'}), 400
-
-        # Şifreyi hash'le
+        # Şifreyi hash'le (havuzdan bağlantı almadan önce)
         sifre_hash = hash_password(data['Sifre'])
 
-        # Kullanıcıyı veritabanına ekle
-        cursor.execute("""
-            INSERT INTO KULLANICILAR (Ad, Soyad, Eposta, SifreHash)
-            VALUES (?, ?, ?, ?)
-        """, (data['Ad'], data['Soyad'], data['Eposta'], sifre_hash))
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        conn.commit()
+            cursor = conn.cursor()
 
-        # Yeni oluşturulan kullanıcının ID'sini al
-        cursor.execute("SELECT @@IDENTITY")
-        new_id = cursor.fetchone()[0]
+            # E-posta kontrolü - Bu e-posta daha önce kullanılmış mı?
+            cursor.execute("SELECT KullaniciID FROM KULLANICILAR WHERE Eposta = ?", (data['Eposta'],))
+            if cursor.fetchone():
+                return jsonify({'error': 'Bu e-posta adresi zaten kullanılıyor'}), 400
+
+            # Kullanıcıyı veritabanına ekle
+            cursor.execute("""
+                INSERT INTO KULLANICILAR (Ad, Soyad, Eposta, SifreHash)
+                VALUES (?, ?, ?, ?)
+            """, (data['Ad'], data['Soyad'], data['Eposta'], sifre_hash))
 
-        conn.close()
+            conn.commit()
+            table_versions.bump('KULLANICILAR')
 
-        return jsonify({
-            'message': 'Kayıt başarılı! Şimdi giriş yapabilirsiniz.',
-            'KullaniciID': int(new_id),
-            'Ad': data['Ad'],
-            'Soyad': data['Soyad'],
-            'Eposta': data['Eposta']
-        }), 201
+            # Yeni oluşturulan kullanıcının ID'sini al
+            new_id = db_backend.last_insert_id(cursor)
 
+            return jsonify({
+                'message': 'Kayıt başarılı! Şimdi giriş yapabilirsiniz.',
+                'KullaniciID': int(new_id),
+                'Ad': data['Ad'],
+                'Soyad': data['Soyad'],
+                'Eposta': data['Eposta']
+            }), 201
+
+    except PasswordHasherBusy:
+        return busy_response()
     except Exception as e:
         return jsonify({'error': f'Kayıt sırasında hata: {str(e)}'}), 500
 
@@ -758,77 +1896,132 @@ def login():
         email = data.get('email')
         password = data.get('password')
 
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT KullaniciID, Ad, Soyad, Eposta, SifreHash
-            FROM KULLANICILAR
-            WHERE Eposta = ?
-        """, (email,))
-
-        row = cursor.fetchone()
-        if not row:
-            return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
-
-        # Şifre kontrolü
-        password_hash = hash_password(password)
-        if password_hash != row.SifreHash:
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT KullaniciID, Ad, Soyad, Eposta, SifreHash
+                FROM KULLANICILAR
+                WHERE Eposta = ? AND Silindi = 0
+            """, (email,))
+
+            row = cursor.fetchone()
+            if not row:
+                return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+
+        # Şifre kontrolü bağlantı iade edildikten sonra hash havuzunda yapılır
+        ok, needs_rehash = password_hasher.verify(password, row.SifreHash)
+        if not ok:
             return jsonify({'error': 'Şifre hatalı'}), 401
 
+        if needs_rehash:
+            upgrade_password_hash(row.KullaniciID, password, row.SifreHash)
+
         user = {
             'KullaniciID': row.KullaniciID,
             'Ad': row.Ad,
             'Soyad': row.Soyad,
             'Eposta': row.Eposta
         }
+        token, _ = session_store.create(user)
 
-        conn.close()
-        return jsonify({'message': 'Giriş başarılı', 'user': user})
+        return jsonify({
+            'message': 'Giriş başarılı',
+            'user': user,
+            'token': token,
+            'expires_in': int(session_store.ttl)
+        })
+    except PasswordHasherBusy:
+        return busy_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/logout', methods=['POST'])
+def logout():
+    """Oturumu kapatır (token zaten geçersizse de başarılı döner)"""
+    token = bearer_token()
+    if token:
+        session_store.revoke(token)
+    return jsonify({'message': 'Çıkış yapıldı'})
+
+
+@app.route('/api/oturum', methods=['GET'])
+def get_oturum():
+    """Geçerli oturumun kullanıcısını veritabanına gitmeden döndürür"""
+    session = g.get('session')
+    if session is None:
+        return jsonify({'error': 'Oturum bulunamadı'}), 401
+    return jsonify({'user': session.user, 'expires_in': int(session.expires - time.time())})
+
+
+def upgrade_password_hash(kullanici_id, password, old_hash):
+    """
+    Eski biçimli (tuzsuz SHA-256) veya maliyet ayarı değişmiş hash'i yeniler.
+    Başarısız olursa giriş etkilenmez; bir sonraki girişte tekrar denenir.
+    """
+    try:
+        new_hash = password_hasher.hash(password)
+        with db_connection() as conn:
+            if not conn:
+                return
+            cursor = conn.cursor()
+            # Araya bir şifre değişikliği girdiyse üzerine yazma
+            cursor.execute("""
+                UPDATE KULLANICILAR SET SifreHash = ?
+                WHERE KullaniciID = ? AND SifreHash = ?
+            """, (new_hash, kullanici_id, old_hash))
+            conn.commit()
+    except Exception as e:
+        print(f"⚠️ Şifre hash'i yenilenemedi (KullaniciID={kullanici_id}): {str(e)}")
+
+
 # ========================================
 # PROFIL YÖNETİMİ Endpoints
 # ========================================
 
 @app.route('/api/profil/<int:kullanici_id>', methods=['GET'])
+@table_versions.conditional('KULLANICILAR', 'PROJE_UYE_ILISKISI', 'GOREV_ATAMALARI')
 def get_profil(kullanici_id):
     """Kullanıcı profil bilgilerini getirir"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+        profil = detail_cache.get(PROFIL, kullanici_id)
+        if profil is not None:
+            return jsonify(profil)
 
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT k.KullaniciID, k.Ad, k.Soyad, k.Eposta,
-                   COUNT(DISTINCT pui.ProjeID) as ProjeCount,
-                   COUNT(DISTINCT ga.GorevID) as GorevCount
-            FROM KULLANICILAR k
-            LEFT JOIN PROJE_UYE_ILISKISI pui ON k.KullaniciID = pui.KullaniciID
-            LEFT JOIN GOREV_ATAMALARI ga ON k.KullaniciID = ga.KullaniciID
-            WHERE k.KullaniciID = ?
-            GROUP BY k.KullaniciID, k.Ad, k.Soyad, k.Eposta
-        """, (kullanici_id,))
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        row = cursor.fetchone()
-        if not row:
-            return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+            cursor = conn.cursor()
+            # Sayılar üyelik / atama yazmalarında güncellenen sayaç satırından okunur (counters.py)
+            cursor.execute("""
+                SELECT k.KullaniciID, k.Ad, k.Soyad, k.Eposta, s.ProjeSayisi, s.GorevSayisi
+                FROM KULLANICILAR k
+                LEFT JOIN KULLANICI_SAYACLARI s ON s.KullaniciID = k.KullaniciID
+                WHERE k.KullaniciID = ? AND k.Silindi = 0
+            """, (kullanici_id,))
 
-        profil = {
-            'KullaniciID': row.KullaniciID,
-            'Ad': row.Ad,
-            'Soyad': row.Soyad,
-            'Eposta': row.Eposta,
-            'ProjeCount': row.ProjeCount or 0,
-            'GorevCount': row.GorevCount or 0
-        }
+            row = cursor.fetchone()
+            if not row:
+                return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+
+            sayilar = (row.ProjeSayisi, row.GorevSayisi)
+            if row.ProjeSayisi is None:
+                sayilar = counters.read(cursor, kullanici_id)
+
+            profil = {
+                'KullaniciID': row.KullaniciID,
+                'Ad': row.Ad,
+                'Soyad': row.Soyad,
+                'Eposta': row.Eposta,
+                'ProjeCount': sayilar[0],
+                'GorevCount': sayilar[1]
+            }
 
-        conn.close()
+        detail_cache.put(PROFIL, kullanici_id, profil, tags=[tag(KULLANICI, kullanici_id)])
         return jsonify(profil)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -837,150 +2030,721 @@ def get_profil(kullanici_id):
 @app.route('/api/profil/<int:kullanici_id>', methods=['PUT'])
 def update_profil(kullanici_id):
     """Kullanıcı profil bilgilerini günceller"""
+    denied = forbidden_for(kullanici_id)
+    if denied:
+        return denied
     try:
         data = request.json
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-
-        # E-posta değişiyorsa, başka kullanıcı tarafından kullanılıp kullanılmadığını kontrol et
-        if 'Eposta' in data:
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+
+            # E-posta değişiyorsa, başka kullanıcı tarafından kullanılıp kullanılmadığını kontrol et
+            if 'Eposta' in data:
+                cursor.execute("""
+                    SELECT KullaniciID FROM KULLANICILAR 
+                    WHERE Eposta = ? AND KullaniciID != ?
+                """, (data['Eposta'], kullanici_id))
+                if cursor.fetchone():
+                    return jsonify({'error': 'Bu e-posta adresi başka bir kullanıcı tarafından kullanılıyor'}), 400
+
+            # Profil bilgilerini güncelle
             cursor.execute("""
-                SELECT KullaniciID FROM KULLANICILAR 
-                WHERE Eposta = ? AND KullaniciID != ?
-            """, (data['Eposta'], kullanici_id))
-            if cursor.fetchone():
-                return jsonify({'error': 'Bu e-posta adresi başka bir kullanıcı tarafından kullanılıyor'}), 400
-
-        # Profil bilgilerini güncelle
-        cursor.execute("""
-            UPDATE KULLANICILAR
-            SET Ad = ?, Soyad = ?, Eposta = ?
-            WHERE KullaniciID = ?
-        """, (data['Ad'], data['Soyad'], data['Eposta'], kullanici_id))
-
-        conn.commit()
-        conn.close()
-        return jsonify({'message': 'Profil bilgileri güncellendi'})
+                UPDATE KULLANICILAR
+                SET Ad = ?, Soyad = ?, Eposta = ?
+                WHERE KullaniciID = ?
+            """, (data['Ad'], data['Soyad'], data['Eposta'], kullanici_id))
+
+            conn.commit()
+            table_versions.bump('KULLANICILAR')
+            detail_cache.invalidate(KULLANICI, kullanici_id)
+            session_store.update_user(kullanici_id, Ad=data['Ad'], Soyad=data['Soyad'],
+                                      Eposta=data['Eposta'])
+            return jsonify({'message': 'Profil bilgileri güncellendi'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/profil/<int:kullanici_id>/sifre', methods=['PUT'])
 def change_password(kullanici_id):
-    """Kullanıcı şifresini değiştirir"""
+    """Kullanıcı şifresini değiştirir; diğer tüm oturumlar kapatılır"""
+    denied = forbidden_for(kullanici_id)
+    if denied:
+        return denied
     try:
         data = request.json
 
         if not all(k in data for k in ['EskiSifre', 'YeniSifre']):
             return jsonify({'error': 'Eksik bilgi'}), 400
 
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
 
-        cursor = conn.cursor()
+            cursor = conn.cursor()
 
-        # Mevcut şifreyi kontrol et
-        cursor.execute("""
-            SELECT SifreHash FROM KULLANICILAR WHERE KullaniciID = ?
-        """, (kullanici_id,))
+            # Mevcut şifreyi kontrol et
+            cursor.execute("""
+                SELECT SifreHash FROM KULLANICILAR WHERE KullaniciID = ?
+            """, (kullanici_id,))
 
-        row = cursor.fetchone()
-        if not row:
-            return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
+            row = cursor.fetchone()
+            if not row:
+                return jsonify({'error': 'Kullanıcı bulunamadı'}), 404
 
-        # Eski şifre kontrolü
-        eski_sifre_hash = hash_password(data['EskiSifre'])
-        if eski_sifre_hash != row.SifreHash:
+        # Hash hesapları bağlantı tutulmadan yapılır
+        ok, _ = password_hasher.verify(data['EskiSifre'], row.SifreHash)
+        if not ok:
             return jsonify({'error': 'Mevcut şifre hatalı'}), 401
 
-        # Yeni şifreyi güncelle
         yeni_sifre_hash = hash_password(data['YeniSifre'])
-        cursor.execute("""
-            UPDATE KULLANICILAR
-            SET SifreHash = ?
-            WHERE KullaniciID = ?
-        """, (yeni_sifre_hash, kullanici_id))
-
-        conn.commit()
-        conn.close()
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+
+            # Yeni şifreyi güncelle
+            cursor.execute("""
+                UPDATE KULLANICILAR
+                SET SifreHash = ?
+                WHERE KullaniciID = ?
+            """, (yeni_sifre_hash, kullanici_id))
+
+            conn.commit()
+
+        # Şifreyi değiştiren oturum açık kalır, diğer cihazlardaki oturumlar düşer
+        session = g.get('session')
+        session_store.revoke_user(kullanici_id, keep=session.sid if session else None)
         return jsonify({'message': 'Şifre başarıyla değiştirildi'})
+    except PasswordHasherBusy:
+        return busy_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/profil/<int:kullanici_id>/gorevler', methods=['GET'])
+@table_versions.conditional('GOREV_ATAMALARI', 'GOREVLER', 'PROJELER', 'DURUMLAR', 'ONCELIKLER')
 def get_kullanici_gorevler(kullanici_id):
     """Kullanıcının atanmış olduğu görevleri getirir"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT g.GorevID, g.GorevAdi, g.TeslimTarihi,
-                   p.ProjeAdi, d.DurumAdi, o.OncelikAdi
-            FROM GOREV_ATAMALARI ga
-            JOIN GOREVLER g ON ga.GorevID = g.GorevID
-            JOIN PROJELER p ON g.ProjeID = p.ProjeID
-            JOIN DURUMLAR d ON g.DurumID = d.DurumID
-            JOIN ONCELIKLER o ON g.OncelikID = o.OncelikID
-            WHERE ga.KullaniciID = ?
-            ORDER BY g.TeslimTarihi ASC
-        """, (kullanici_id,))
-
-        gorevler = []
-        for row in cursor.fetchall():
-            gorevler.append({
-                'GorevID': row.GorevID,
-                'GorevAdi': row.GorevAdi,
-                'TeslimTarihi': format_date(row.TeslimTarihi),
-                'ProjeAdi': row.ProjeAdi,
-                'DurumAdi': row.DurumAdi,
-                'OncelikAdi': row.OncelikAdi
-            })
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT g.GorevID, g.GorevAdi, g.TeslimTarihi,
+                       p.ProjeAdi, g.DurumID, g.OncelikID
+                FROM GOREV_ATAMALARI ga
+                JOIN GOREVLER g ON ga.GorevID = g.GorevID
+                JOIN PROJELER p ON g.ProjeID = p.ProjeID AND p.Silindi = 0
+                WHERE ga.KullaniciID = ?
+                ORDER BY g.TeslimTarihi ASC
+            """, (kullanici_id,))
 
-        conn.close()
-        return jsonify(gorevler)
+            return jsonify(kullanici_gorev_row.all(cursor, cursor.fetchall()))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/profil/<int:kullanici_id>/projeler', methods=['GET'])
+@table_versions.conditional('PROJE_UYE_ILISKISI', 'PROJELER', 'ROLLER')
 def get_kullanici_projeler(kullanici_id):
     """Kullanıcının dahil olduğu projeleri getirir"""
     try:
-        conn = get_db_connection()
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT p.ProjeID, p.ProjeAdi, p.BaslangicTarihi, p.BitisTarihi,
+                       pui.RolID
+                FROM PROJE_UYE_ILISKISI pui
+                JOIN PROJELER p ON pui.ProjeID = p.ProjeID
+                WHERE pui.KullaniciID = ?
+                ORDER BY p.BaslangicTarihi DESC
+            """, (kullanici_id,))
+
+            return jsonify(kullanici_proje_row.all(cursor, cursor.fetchall()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/sayaclar/dogrula', methods=['POST'])
+@admin_required
+def reconcile_sayaclar():
+    """
+    Profil sayaçlarını (KULLANICI_SAYACLARI) üyelik / atama tablolarıyla karşılaştırır.
+    ?duzelt=1 verilirse farklar aynı işlemde düzeltilir (bkz. counters.reconcile)
+    """
+    try:
+        duzelt = request.args.get('duzelt') in ('1', 'true')
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            rapor = counters.reconcile(conn.cursor(), fix=duzelt)
+            conn.commit()
+        if rapor['duzeltildi']:
+            # Düzeltilen sayaçlar önbellekteki profillerde eski kalmasın
+            detail_cache.clear()
+        return jsonify(rapor)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ========================================
+# ARKA PLAN SİLME İŞLERİ
+# ========================================
+
+def silme_isi(cursor, row):
+    isi = silme_isi_row.one(cursor, row)
+    isi['Ilerleme'] = (min(100, round(isi['Silinen'] * 100 / isi['Toplam']))
+                       if isi['Toplam'] else None)
+    return isi
+
+
+@app.route('/api/silme-isleri', methods=['GET'])
+@admin_required
+def get_silme_isleri():
+    """Son silme işleri (?durum=bekliyor|calisiyor|tamamlandi|hata, ?limit=)"""
+    try:
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        durum = request.args.get('durum')
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            where, params = (" WHERE Durum = ?", [durum]) if durum else ("", [])
+            cursor.execute(f"{JOB_SELECT}{where} ORDER BY IsID DESC {db_backend.limit_clause}",
+                           [*params, limit])
+            return jsonify([silme_isi(cursor, row) for row in cursor.fetchall()])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/silme-isleri/<int:is_id>', methods=['GET'])
+def get_silme_isi(is_id):
+    """Silme işinin durumu ve ilerlemesi"""
+    try:
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            cursor.execute(JOB_SELECT + " WHERE IsID = ?", (is_id,))
+            row = cursor.fetchone()
+            if not row:
+                return jsonify({'error': 'Silme işi bulunamadı'}), 404
+            return jsonify(silme_isi(cursor, row))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/silme-isleri/<int:is_id>/yeniden', methods=['POST'])
+@admin_required
+def retry_silme_isi(is_id):
+    """Hata vermiş silme işini kaldığı yerden yeniden başlatır"""
+    try:
+        if not deletion_jobs.retry(is_id):
+            return jsonify({'error': 'Sadece hata durumundaki işler yeniden başlatılabilir'}), 409
+        return jsonify({'message': 'Silme işi yeniden kuyruğa alındı', 'IsID': is_id}), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ========================================
+# DELTA SENKRONİZASYON
+# ========================================
+
+SYNC_DEFAULT_LIMIT = 1000
+SYNC_MAX_LIMIT = 5000
+
+YORUMLAR_SYNC_SELECT = """
+    SELECT y.YorumID, y.GorevID, y.YorumMetni, y.Tarih, k.Ad, k.Soyad
+    FROM YORUMLAR y
+    JOIN KULLANICILAR k ON y.KullaniciID = k.KullaniciID AND k.Silindi = 0
+"""
+
+
+def _fetch_changed(cursor, sql, id_column, ids, scope, scope_params, serializer, chunk_size=500):
+    """Değişen kayıtları ID listesi parçalarıyla okur; scope görünürlük koşuludur (veya None)"""
+    items = []
+    for start in range(0, len(ids), chunk_size):
+        id_sql, params = queries.id_list(ids[start:start + chunk_size])
+        query = f"{sql} WHERE {id_column} IN ({id_sql})"
+        if scope:
+            query += f" AND {scope}"
+            params = params + list(scope_params)
+        cursor.execute(query, params)
+        items.extend(serializer.all(cursor, cursor.fetchall()))
+    return items
+
+
+@app.route('/api/sync', methods=['GET'])
+def get_sync():
+    """
+    since filigranından sonra değişen projeleri, görevleri ve yeni yorumları döndürür.
+    since verilmezse sadece güncel filigran döner; istemci önce filigranı alır, sonra
+    listeleri tam yükler ve sonraki her senkronizasyonda dönen filigranı gönderir.
+
+    silinen: silinmiş veya artık görünmeyen kayıtların ID'leri
+    reset: kullanıcının görebildiği projeler değişti; listeler baştan yüklenmeli
+    has_more: limit dolduğu için devamı var; dönen filigranla hemen tekrar çağrılmalı
+    """
+    try:
+        since = request.args.get('since', type=int)
+        limit = request.args.get('limit', SYNC_DEFAULT_LIMIT, type=int)
+        if limit < 1 or limit > SYNC_MAX_LIMIT:
+            return jsonify({'error': f'limit 1 ile {SYNC_MAX_LIMIT} arasında olmalı'}), 400
+        if since is not None and since < 0:
+            return jsonify({'error': 'Geçersiz since'}), 400
+
+        kullanici_id = request_user_id()
+        proje_scope = gorev_scope = None
+        proje_params = gorev_params = ()
+        if kullanici_id and since is not None:
+            # Görünürlük indeksi kendi bağlantısını kullanabilir; bağlantı almadan önce çöz
+            kapsam, kapsam_params = proje_kapsami(kullanici_id)
+            proje_scope, proje_params = f"p.ProjeID IN ({kapsam})", kapsam_params
+            gorunur = queries.gorunur_gorevler(kapsam)
+            gorev_scope, gorev_params = f"g.GorevID IN ({gorunur})", [kullanici_id] + list(kapsam_params)
+            yorum_scope = f"y.GorevID IN ({gorunur})"
+        else:
+            yorum_scope = None
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            if since is None:
+                return jsonify({'watermark': changelog.current_position(db_backend, cursor)})
+
+            changes, watermark, has_more = changelog.read(db_backend, cursor, since, limit)
+
+            upserts = {'PROJELER': [], 'GOREVLER': [], 'YORUMLAR': []}
+            silinen = {'PROJELER': [], 'GOREVLER': []}
+            reset = False
+            for change in changes:
+                if change.islem == changelog.VISIBILITY:
+                    reset = reset or change.kayit_id == kullanici_id
+                elif change.islem == changelog.DELETE:
+                    silinen[change.table].append(change.kayit_id)
+                else:
+                    upserts[change.table].append(change.kayit_id)
+
+            projeler = _fetch_changed(cursor, queries.PROJELER_SELECT, 'p.ProjeID',
+                                      upserts['PROJELER'], proje_scope, proje_params, proje_row)
+            gorevler = _fetch_changed(cursor, queries.GOREVLER_SELECT, 'g.GorevID',
+                                      upserts['GOREVLER'], gorev_scope, gorev_params, gorev_row)
+            yorumlar = _fetch_changed(cursor, YORUMLAR_SYNC_SELECT, 'y.YorumID',
+                                      upserts['YORUMLAR'], yorum_scope, gorev_params, sync_yorum_row)
+
+        # Güncellenip artık görünmeyen (başka projeye taşınan vb.) kayıtlar istemciden silinmeli
+        for table, items, key in (('PROJELER', projeler, 'ProjeID'), ('GOREVLER', gorevler, 'GorevID')):
+            returned = {item[key] for item in items}
+            silinen[table].extend(i for i in upserts[table] if i not in returned)
+
+        return jsonify({
+            'watermark': watermark,
+            'has_more': has_more,
+            'reset': reset,
+            'projeler': projeler,
+            'gorevler': gorevler,
+            'yorumlar': yorumlar,
+            'silinen': {'projeler': silinen['PROJELER'], 'gorevler': silinen['GOREVLER']}
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ========================================
+# CANLI OLAYLAR (Server-Sent Events)
+# ========================================
+
+@app.route('/api/olaylar', methods=['GET'])
+def get_olaylar():
+    """
+    Kullanıcının görebildiği projelerdeki proje / görev / yorum değişikliklerini
+    text/event-stream olarak yayınlar. İstemci olay gelince /api/sync çağırır.
+    """
+    kullanici_id = request_user_id()
+    if kullanici_id is None:
+        # Olaylar projeye göre süzülür; kimliği bilinmeyen abone hiçbir şey göremez
+        response = jsonify({'error': 'Oturum gerekli'})
+        response.headers['WWW-Authenticate'] = 'Bearer'
+        return response, 401
+    try:
+        # Küme burada yüklenir; yayın sırasında veritabanına gidilmez
+        visibility_index.projects(kullanici_id)
+        subscriber = event_hub.subscribe(kullanici_id)
+    except HubFull as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    response = Response(event_hub.stream(subscriber), mimetype='text/event-stream')
+    # Akış önbelleğe alınmamalı ve proxy'de (nginx) tamponlanmamalı
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# ========================================
+# ARAMA (bkz. search.py)
+# ========================================
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+
+@app.route('/api/search', methods=['GET'])
+@table_versions.conditional('GOREVLER', 'YORUMLAR', 'PROJELER', 'PROJE_UYE_ILISKISI',
+                            'KULLANICILAR', 'DURUMLAR', 'ONCELIKLER')
+def search():
+    """
+    Görev adı / açıklaması ve yorum metinlerinde arar; sonuçlar puana göre sıralıdır
+    ve kullanıcının görebildiği projelerle sınırlıdır.
+    Parametreler: q, tur (gorev | yorum), limit
+    """
+    try:
+        q = request.args.get('q', '').strip()
+        if not q:
+            return jsonify({'error': "'q' parametresi gerekli"}), 400
+        tur = request.args.get('tur')
+        if tur not in (None, 'gorev', 'yorum'):
+            return jsonify({'error': "tur 'gorev' veya 'yorum' olmalı"}), 400
+        limit = request.args.get('limit', SEARCH_DEFAULT_LIMIT, type=int)
+        if limit < 1 or limit > SEARCH_MAX_LIMIT:
+            return jsonify({'error': f'limit 1 ile {SEARCH_MAX_LIMIT} arasında olmalı'}), 400
+
+        kullanici_id = request_user_id()
+        visible = visibility_index.projects(kullanici_id) if kullanici_id else None
+
+        search_index.ensure_loaded()
+        hits, toplam = search_index.search(q, visible=visible,
+                                           kinds=(tur,) if tur else ('gorev', 'yorum'), limit=limit)
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            cursor = conn.cursor()
+            # Sonuç satırları indeksten değil veritabanından okunur (güncel alanlar, adlar)
+            gorevler = {item['GorevID']: item for item in _fetch_changed(
+                cursor, queries.GOREVLER_SELECT, 'g.GorevID',
+                [kayit_id for kind, kayit_id, *_ in hits if kind == 'gorev'], None, (), gorev_row)}
+            yorumlar = {item['YorumID']: item for item in _fetch_changed(
+                cursor, YORUMLAR_SYNC_SELECT, 'y.YorumID',
+                [kayit_id for kind, kayit_id, *_ in hits if kind == 'yorum'], None, (), sync_yorum_row)}
+
+        sonuclar = []
+        for kind, kayit_id, _, proje_id, skor in hits:
+            kayit = (gorevler if kind == 'gorev' else yorumlar).get(kayit_id)
+            # İndeks ile okuma arasında silinmiş olabilir
+            if kayit is not None:
+                sonuclar.append({'tur': kind, 'skor': skor, 'ProjeID': proje_id, 'kayit': kayit})
+
+        return jsonify({'q': q, 'toplam': toplam, 'sonuclar': sonuclar})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/search/yenile', methods=['POST'])
+@admin_required
+def rebuild_search():
+    """Arama indeksini veritabanından yeniden kurar (uygulama dışı değişikliklerden sonra)"""
+    try:
+        search_index.rebuild()
+        return jsonify({'message': 'Arama indeksi yenilendi', 'search': search_index.stats()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ========================================
+# DASHBOARD - KULLANICI BAZLI
+# ========================================
+
+def dashboard_ozeti(cursor, kullanici_id, kapsam):
+    """
+    Proje ilerlemeleri ve genel görev istatistikleri.
+    kapsam: proje_kapsami() sonucu (None ise tüm görevler)
+    """
+    sql = queries.DASHBOARD_GOREV_OZETI
+    params = [date.today().isoformat(), TAMAMLANDI_DURUM_ID]
+    if kapsam:
+        # Sadece kullanıcının görebildiği görevler
+        kapsam_sql, kapsam_params = kapsam
+        sql += f" WHERE g.GorevID IN ({queries.gorunur_gorevler(kapsam_sql)})"
+        params.append(kullanici_id)
+        params.extend(kapsam_params)
+    sql += queries.DASHBOARD_GROUP_BY
+
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+
+    projeler = {}
+    toplam = {'GorevSayisi': 0, 'TamamlananGorev': 0, 'GecikenGorev': 0, 'Durumlar': {}}
+    for row in rows:
+        proje = projeler.setdefault(row.ProjeID, {
+            'ProjeID': row.ProjeID,
+            'GorevSayisi': 0,
+            'TamamlananGorev': 0,
+            'GecikenGorev': 0,
+            'Durumlar': {}
+        })
+        for ozet in (proje, toplam):
+            ozet['GorevSayisi'] += row.GorevSayisi
+            ozet['GecikenGorev'] += row.GecikenSayisi or 0
+            ozet['Durumlar'][str(row.DurumID)] = \
+                ozet['Durumlar'].get(str(row.DurumID), 0) + row.GorevSayisi
+            if row.DurumID == TAMAMLANDI_DURUM_ID:
+                ozet['TamamlananGorev'] += row.GorevSayisi
+
+    for ozet in list(projeler.values()) + [toplam]:
+        ozet['TamamlanmaOrani'] = (
+            round(ozet['TamamlananGorev'] * 100 / ozet['GorevSayisi'])
+            if ozet['GorevSayisi'] else 0
+        )
+
+    return {
+        'projeler': list(projeler.values()),
+        'toplam': toplam
+    }
+
+
+@app.route('/api/dashboard', methods=['GET'])
+@table_versions.conditional('GOREVLER', 'PROJELER', 'GOREV_ATAMALARI', 'PROJE_UYE_ILISKISI',
+                            vary=lambda: date.today().isoformat())
+def get_dashboard():
+    """Proje ilerlemeleri ve genel görev istatistiklerini tek bir gruplu sorguyla döndürür"""
+    try:
+        # Kullanıcı oturumdan (veya kullanici_id query parametresinden) gelir
+        kullanici_id = request_user_id()
+        # Görünürlük indeksi kendi bağlantısını kullanabilir; bağlantı almadan önce çöz
+        kapsam = proje_kapsami(kullanici_id) if kullanici_id else None
+
+        with db_connection() as conn:
+            if not conn:
+                return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
+
+            ozet = dashboard_ozeti(conn.cursor(), kullanici_id, kapsam)
+        return jsonify(ozet)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ========================================
+# AÇILIŞ (tek istekte ilk yükleme)
+# ========================================
+
+# /api/bootstrap bölümlerini paralel çalıştıran thread'ler; her bölüm havuzdan kendi
+# bağlantısını alır. 0: bölümler istek thread'inde sırayla çalışır
+BOOTSTRAP_WORKERS = int(os.environ.get('PGYS_BOOTSTRAP_WORKERS', 4))
+bootstrap_executor = (ThreadPoolExecutor(max_workers=BOOTSTRAP_WORKERS, thread_name_prefix='pgys-bootstrap')
+                      if BOOTSTRAP_WORKERS > 0 else None)
+
+
+def _bootstrap_bolumu(fn, submitted):
+    """
+    fn(cursor)'u havuzdan alınan bağlantıyla çalıştırır; (sonuç, süreler) döndürür.
+    bekleme_ms: thread + bağlantı bekleme, ms: toplam (bekleme dahil)
+    """
+    with db_connection() as conn:
         if not conn:
-            return jsonify({'error': 'Veritabanı bağlantısı kurulamadı'}), 500
-
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT p.ProjeID, p.ProjeAdi, p.BaslangicTarihi, p.BitisTarihi,
-                   r.RolAdi
-            FROM PROJE_UYE_ILISKISI pui
-            JOIN PROJELER p ON pui.ProjeID = p.ProjeID
-            LEFT JOIN ROLLER r ON pui.RolID = r.RolID
-            WHERE pui.KullaniciID = ?
-            ORDER BY p.BaslangicTarihi DESC
-        """, (kullanici_id,))
-
-        projeler = []
-        for row in cursor.fetchall():
-            projeler.append({
-                'ProjeID': row.ProjeID,
-                'ProjeAdi': row.ProjeAdi,
-                'BaslangicTarihi': format_date(row.BaslangicTarihi),
-                'BitisTarihi': format_date(row.BitisTarihi) if row.BitisTarihi else None,
-                'RolAdi': row.RolAdi if row.RolAdi else 'Ekip Üyesi'
-            })
+            raise RuntimeError('Veritabanı bağlantısı kurulamadı')
+        acquired = time.perf_counter()
+        result = fn(conn.cursor())
+    finished = time.perf_counter()
+    return result, {'ms': round((finished - submitted) * 1000, 2),
+                    'bekleme_ms': round((acquired - submitted) * 1000, 2)}
+
+
+def _bootstrap_thread(fn, submitted):
+    """Bölümü havuz thread'inde çalıştırır; veritabanı süreleri isteğin metriklerine eklenmek üzere ayrıca döner"""
+    # Havuz thread'inde istek bağlamı yok; ifadeler yine get_bootstrap altında gruplanır
+    with request_metrics.child() as olcum, query_profiler.tag('get_bootstrap'):
+        return _bootstrap_bolumu(fn, submitted), olcum
+
+
+@app.route('/api/bootstrap', methods=['GET'])
+def get_bootstrap():
+    """
+    İstemcinin açılışta ihtiyaç duyduğu her şeyi tek istekte döndürür: senkronizasyon
+    filigranı, projeler, görevlerin ilk sayfası (+ yorum özetleri), ekip, dashboard ve
+    tanımlar. Bölümler birbirinden bağımsızdır ve havuzdaki ayrı bağlantılarla paralel
+    çalışır; bölüm süreleri 'zamanlama' alanında ve Server-Timing başlığında döner.
+
+    Filigran listelerden ÖNCE alınır; aradaki yazmalar bir sonraki /api/sync'te gelir.
+    """
+    started = time.perf_counter()
+    bolum = 'kapsam'
+    try:
+        # Kullanıcı oturumdan (veya kullanici_id query parametresinden) gelir
+        kullanici_id = request_user_id()
+        # Görünürlük indeksi kendi bağlantısını kullanabilir; bölümlerden önce bir kez çözülür
+        kapsam = proje_kapsami(kullanici_id) if kullanici_id else None
+
+        def projeler(cursor):
+            cursor.execute(*projeler_sorgusu(kapsam))
+            return proje_row.all(cursor, cursor.fetchall())
+
+        def gorevler(cursor):
+            sql, params = gorevler_sorgusu(kullanici_id, kapsam, limit=DEFAULT_PAGE_SIZE)
+            sayfa = gorev_sayfasi(cursor, sql, params, DEFAULT_PAGE_SIZE)
+            return sayfa, yorum_ozetleri(cursor, [g['GorevID'] for g in sayfa['items']])
+
+        def ekip(cursor):
+            cursor.execute(*ekip_sorgusu(kapsam))
+            return kullanici_row.all(cursor, cursor.fetchall())
+
+        def dashboard(cursor):
+            return dashboard_ozeti(cursor, kullanici_id, kapsam)
+
+        zamanlama = {}
+        bolum = 'watermark'
+        watermark, zamanlama['watermark'] = _bootstrap_bolumu(
+            lambda cursor: changelog.current_position(db_backend, cursor), time.perf_counter())
+
+        bolumler = {'projeler': projeler, 'gorevler': gorevler, 'ekip': ekip, 'dashboard': dashboard}
+        submitted = time.perf_counter()
+        if bootstrap_executor:
+            futures = {ad: bootstrap_executor.submit(_bootstrap_thread, fn, submitted)
+                       for ad, fn in bolumler.items()}
+            sonuclar = {}
+            for bolum, future in futures.items():
+                (sonuclar[bolum], zamanlama[bolum]), olcum = future.result()
+                request_metrics.merge(olcum)
+        else:
+            sonuclar = {}
+            for bolum, fn in bolumler.items():
+                sonuclar[bolum], zamanlama[bolum] = _bootstrap_bolumu(fn, time.perf_counter())
+
+        bolum = 'tanimlar'
+        tanimlar = lookup_cache.as_dict()
+        zamanlama['toplam_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+        ilk_sayfa, yorum_ozet = sonuclar['gorevler']
+        response = jsonify({
+            'watermark': watermark,
+            'projeler': sonuclar['projeler'],
+            'gorevler': ilk_sayfa,
+            'yorum_ozet': yorum_ozet,
+            'ekip': sonuclar['ekip'],
+            'dashboard': sonuclar['dashboard'],
+            'tanimlar': tanimlar,
+            'zamanlama': zamanlama
+        })
+        response.headers['Server-Timing'] = ', '.join(
+            f"{ad};dur={sure['ms']}" for ad, sure in zamanlama.items() if isinstance(sure, dict)
+        ) + f", toplam;dur={zamanlama['toplam_ms']}"
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e), 'bolum': bolum}), 500
+
 
-        conn.close()
-        return jsonify(projeler)
+# ========================================
+# TANIM TABLOLARI (Durum / Öncelik / Rol)
+# ========================================
+
+@app.route('/api/tanimlar', methods=['GET'])
+@table_versions.conditional('DURUMLAR', 'ONCELIKLER', 'ROLLER')
+def get_tanimlar():
+    """Durum, öncelik ve rol tanımlarını önbellekten döndürür"""
+    try:
+        return jsonify(lookup_cache.as_dict())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/tanimlar/yenile', methods=['POST'])
+@admin_required
+def refresh_tanimlar():
+    """Tanım tablosu önbelleğini veritabanından yeniden yükler"""
+    try:
+        lookup_cache.refresh()
+        return jsonify({'message': 'Tanımlar yenilendi', 'cache': lookup_cache.stats()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ========================================
+# METRİKLER (Prometheus, bkz. metrics.py)
+# ========================================
+
+def _metrics_collector():
+    """Havuz ve canlı olay metrikleri (dışa aktarma anında okunur)"""
+    pool = db_pool.stats()
+    events = event_hub.stats()
+    return [
+        ('pgys_db_pool_connections', 'gauge', 'Havuzdaki bağlantılar',
+         [([('state', 'in_use')], pool['in_use']), ([('state', 'idle')], pool['idle'])]),
+        ('pgys_db_pool_max_connections', 'gauge', 'Havuzun en çok bağlantı sayısı', [([], pool['max_size'])]),
+        ('pgys_db_pool_waits_total', 'counter', 'Boş bağlantı beklenen alım sayısı', [([], pool['waits'])]),
+        ('pgys_db_pool_timeouts_total', 'counter', 'Zaman aşımına uğrayan alım sayısı', [([], pool['timeouts'])]),
+        ('pgys_db_pool_wait_seconds_total', 'counter', 'Bağlantı beklemede geçen toplam süre',
+         [([], pool['wait_time_total_ms'] / 1000)]),
+        ('pgys_events_subscribers', 'gauge', 'Açık SSE abonelikleri', [([], events['subscribers'])]),
+        ('pgys_events_dropped_slow_total', 'counter', 'Yavaş olduğu için düşürülen aboneler',
+         [([], events['dropped_slow'])]),
+    ]
+
+
+request_metrics.register_collector(_metrics_collector)
+
+
+@app.route('/api/metrics', methods=['GET'])
+@admin_required
+def get_metrics():
+    """Route bazında süre, aşama, satır / bayt ve hata metrikleri (Prometheus metin biçimi)"""
+    return Response(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# ========================================
+# SORGU PROFİLİ (bkz. profiling.py)
+# ========================================
+
+@app.route('/api/sorgular', methods=['GET'])
+@admin_required
+def get_sorgular():
+    """
+    En pahalı SQL ifadeleri (son iki pencere) ve son yavaş sorgular.
+    siralama: toplam (varsayılan) | ortalama | en_uzun | sayi
+    """
+    try:
+        siralama = request.args.get('siralama', 'toplam')
+        if siralama not in SORT_KEYS:
+            return jsonify({'error': f"siralama şunlardan biri olmalı: {', '.join(SORT_KEYS)}"}), 400
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), 200)
+        except ValueError:
+            return jsonify({'error': 'limit sayı olmalı'}), 400
+
+        return jsonify({
+            'sorgular': query_profiler.top(limit, siralama),
+            'yavas_son': query_profiler.recent_slow(),
+            'profil': query_profiler.stats()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/sorgular/sifirla', methods=['POST'])
+@admin_required
+def reset_sorgular():
+    """Sorgu istatistiklerini, yavaş sorgu listesini ve yakalanan planları temizler"""
+    try:
+        query_profiler.reset()
+        return jsonify({'message': 'Sorgu profili sıfırlandı'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -993,20 +2757,32 @@ def get_kullanici_projeler(kullanici_id):
 def health_check():
     """API sağlık kontrolü"""
     try:
-        conn = get_db_connection()
-        if conn:
-            conn.close()
-            return jsonify({
-                'status': 'healthy',
-                'database': 'connected',
-                'message': 'PGYS API çalışıyor'
-            })
-        else:
-            return jsonify({
-                'status': 'unhealthy',
-                'database': 'disconnected',
-                'message': 'Veritabanı bağlantısı kurulamadı'
-            }), 503
+        with db_connection() as conn:
+            if conn:
+                return jsonify({
+                    'status': 'healthy',
+                    'database': 'connected',
+                    'message': 'PGYS API çalışıyor',
+                    'storage': db_backend.describe(),
+                    'pool': db_pool.stats(),
+                    'json': json_provider,
+                    'passwords': password_hasher.stats(),
+                    'sessions': session_store.stats(),
+                    'visibility': visibility_index.stats(),
+                    'events': event_hub.stats(),
+                    'search': search_index.stats(),
+                    'queries': query_profiler.stats(),
+                    'detail_cache': detail_cache.stats(),
+                    'deletion': deletion_jobs.stats()
+                })
+            else:
+                return jsonify({
+                    'status': 'unhealthy',
+                    'database': 'disconnected',
+                    'message': 'Veritabanı bağlantısı kurulamadı',
+                    'storage': db_backend.describe(),
+                    'pool': db_pool.stats()
+                }), 503
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -0,0 +1,351 @@
+"""
+PGYS - ASGI sunucu modu
+Aynı Flask uygulamasını (/api/* route'larının hepsi) asyncio tabanlı bir sunucu
+üzerinden çalıştırır. Bağlantılar olay döngüsünde tutulur; sadece veritabanı işi
+yapan handler'lar sınırlı bir thread havuzunda (varsayılan: bağlantı havuzu boyutu
+kadar) çalışır. Kapasite doluyken gelen istekler thread tutmadan kuyrukta bekler,
+bekleme süresi aşılırsa 503 döner.
+
+/api/olaylar (SSE) bu modda doğrudan olay döngüsünde sunulur; boşta bekleyen binlerce
+abone handler thread'i tutmaz.
+
+Kullanım (backend dizininde):
+    pip install uvicorn
+    uvicorn asgi:application --port 5000
+
+Ayarlar:
+    PGYS_ASGI_WORKERS        handler thread sayısı (varsayılan PGYS_POOL_MAX)
+    PGYS_ASGI_QUEUE_TIMEOUT  boş thread için en fazla bekleme, sn (varsayılan PGYS_POOL_TIMEOUT)
+    PGYS_ASGI_MAX_QUEUE      kuyrukta bekleyebilecek en çok istek (varsayılan 1000)
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from app import (LEGACY_AUTH, app as flask_app, db_backend, db_pool, event_hub, session_store,
+                 visibility_index)
+from async_db import AsyncConnectionPool
+from config import POOL_CONFIG
+from events import HEARTBEAT, HubFull
+
+ASGI_CONFIG = {
+    'workers': int(os.environ.get('PGYS_ASGI_WORKERS', POOL_CONFIG['max_size'])),
+    'queue_timeout': float(os.environ.get('PGYS_ASGI_QUEUE_TIMEOUT', POOL_CONFIG['timeout'])),
+    'max_queue': int(os.environ.get('PGYS_ASGI_MAX_QUEUE', 1000)),
+}
+
+BUSY_BODY = '{"error": "Sunucu meşgul, lütfen tekrar deneyin"}'.encode()
+
+
+def _environ(scope, body):
+    """ASGI scope'undan PEP 3333 WSGI environ'u üretir"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            key = 'CONTENT_TYPE'
+        elif name == 'CONTENT_LENGTH':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = f'HTTP_{name}'
+        # Tekrarlanan başlıklar virgülle birleştirilir
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class WSGIBridge:
+    """
+    WSGI uygulamasını ASGI'ye bağlar.
+    Handler'lar ve yanıt gövdesinin üretimi (akışlı yanıtlarda imleç okuma dahil)
+    executor'da; istek gövdesini okuma ve yanıtı gönderme olay döngüsünde yapılır.
+    """
+
+    def __init__(self, wsgi_app, workers, queue_timeout, max_queue):
+        self.wsgi_app = wsgi_app
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pgys-asgi')
+        self._slots = asyncio.Semaphore(workers)
+        self._queued = 0
+        self._in_flight = 0
+        self._stats = {'requests': 0, 'rejected': 0, 'queue_timeouts': 0,
+                       'queue_wait_total': 0.0, 'queue_wait_max': 0.0}
+
+    def stats(self):
+        requests = self._stats['requests']
+        return {
+            'workers': self.workers,
+            'in_flight': self._in_flight,
+            'queued': self._queued,
+            'requests': requests,
+            'rejected': self._stats['rejected'],
+            'queue_timeouts': self._stats['queue_timeouts'],
+            'queue_wait_avg_ms': round(self._stats['queue_wait_total'] / requests * 1000, 2) if requests else 0.0,
+            'queue_wait_max_ms': round(self._stats['queue_wait_max'] * 1000, 2),
+        }
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def _start(self, environ):
+        """Uygulamayı çağırır; durum, başlıklar ve ilk gövde parçasını döndürür"""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                                   for k, v in headers]
+            return lambda data: response.setdefault('writes', []).append(data)
+
+        iterable = self.wsgi_app(environ, start_response)
+        iterator = iter(iterable)
+        first = next(iterator, None)
+        first = b''.join(response.pop('writes', [])) + (first or b'')
+
+        # Tek parçalık (tamponlanmış) yanıtlarda ikinci bir executor turuna gerek yok
+        done = False
+        length = dict(response['headers']).get(b'content-length')
+        if length is not None and len(first) >= int(length):
+            done = True
+            self._close(iterable)
+        return response, iterable, iterator, first, done
+
+    @staticmethod
+    def _close(iterable):
+        close = getattr(iterable, 'close', None)
+        if close:
+            close()
+
+    async def _acquire_slot(self):
+        if self._queued >= self.max_queue:
+            self._stats['rejected'] += 1
+            return False
+        self._queued += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._stats['queue_timeouts'] += 1
+            return False
+        finally:
+            self._queued -= 1
+        waited = time.monotonic() - started
+        self._stats['requests'] += 1
+        self._stats['queue_wait_total'] += waited
+        self._stats['queue_wait_max'] = max(self._stats['queue_wait_max'], waited)
+        return True
+
+    async def _read_body(self, receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    async def handle(self, scope, receive, send):
+        body = await self._read_body(receive)
+        if body is None:
+            return
+
+        if not await self._acquire_slot():
+            await send({'type': 'http.response.start', 'status': 503,
+                        'headers': [(b'content-type', b'application/json'), (b'retry-after', b'1')]})
+            await send({'type': 'http.response.body', 'body': BUSY_BODY})
+            return
+
+        self._in_flight += 1
+        iterable = None
+        done = True
+        try:
+            response, iterable, iterator, first, done = await self._run(self._start, _environ(scope, body))
+            await send({'type': 'http.response.start', 'status': response['status'],
+                        'headers': response['headers']})
+            if done:
+                await send({'type': 'http.response.body', 'body': first})
+                return
+
+            await send({'type': 'http.response.body', 'body': first, 'more_body': True})
+            while True:
+                chunk = await self._run(next, iterator, None)
+                if chunk is None:
+                    break
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            # İstemci bağlantıyı kesse bile gövde kapatılır (akışlı yanıtın bağlantısı iade edilir)
+            if iterable is not None and not done:
+                await self._run(self._close, iterable)
+            self._in_flight -= 1
+            self._slots.release()
+
+
+class Application:
+    """ASGI giriş noktası: lifespan, yerel /api/health ve geri kalan her şey için WSGIBridge"""
+
+    def __init__(self, wsgi_app, config):
+        self.bridge = WSGIBridge(wsgi_app, **config)
+        self.db = AsyncConnectionPool(db_pool, self.bridge.executor)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            if scope['path'] == '/api/health' and scope['method'] == 'GET':
+                await self._health(send)
+            elif scope['path'] == '/api/olaylar' and scope['method'] == 'GET':
+                await self._events(scope, receive, send)
+            else:
+                await self.bridge.handle(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.bridge.executor.shutdown(wait=True)
+                db_pool.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _health(self, send):
+        """
+        Sağlık kontrolü kuyruğa girmez; tüm thread'ler meşgulken de yanıt verir
+        ve kuyruk durumunu raporlar.
+        """
+        status, database, code = 'healthy', 'connected', 200
+        try:
+            async def ping():
+                async with self.db.connection() as conn:
+                    await conn.fetchall(db_backend.validate_query)
+            await asyncio.wait_for(ping(), self.bridge.queue_timeout)
+        except asyncio.TimeoutError:
+            status, database, code = 'degraded', 'busy', 200
+        except Exception:
+            status, database, code = 'unhealthy', 'disconnected', 503
+
+        body = flask_app.json.dumps({
+            'status': status,
+            'database': database,
+            'mode': 'asgi',
+            'storage': db_backend.describe(),
+            'pool': db_pool.stats(),
+            'asgi': self.bridge.stats(),
+            'sessions': session_store.stats(),
+            'visibility': visibility_index.stats(),
+            'events': event_hub.stats(),
+        }).encode()
+        await send({'type': 'http.response.start', 'status': code,
+                    'headers': [(b'content-type', b'application/json'),
+                                (b'cache-control', b'no-cache')]})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+    async def _json_error(self, send, status, message, headers=()):
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json'),
+                                (b'access-control-allow-origin', b'*'), *headers]})
+        await send({'type': 'http.response.body',
+                    'body': flask_app.json.dumps({'error': message}).encode()})
+
+    async def _events(self, scope, receive, send):
+        """
+        app.get_olaylar'ın olay döngüsü karşılığı: token / kullanici_id aynı kurallarla
+        (app.load_session) çözülür, sonra bağlantı kopana kadar olaylar ve heartbeat'ler
+        yazılır.
+        """
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        headers = dict(scope.get('headers', []))
+        scheme, _, token = headers.get(b'authorization', b'').decode('latin-1').partition(' ')
+        token = token.strip() if scheme.lower() == 'bearer' else ''
+        token = token or query.get('token', [''])[0]
+
+        if token:
+            session = session_store.resolve(token)
+            if session is None:
+                await self._json_error(send, 401, 'Oturum geçersiz veya süresi doldu',
+                                       [(b'www-authenticate', b'Bearer error="invalid_token"')])
+                return
+            kullanici_id = session.kullanici_id
+        elif LEGACY_AUTH:
+            try:
+                kullanici_id = int(query['kullanici_id'][0]) if 'kullanici_id' in query else None
+            except ValueError:
+                kullanici_id = None
+        else:
+            kullanici_id = None
+
+        if kullanici_id is None:
+            await self._json_error(send, 401, 'Oturum gerekli', [(b'www-authenticate', b'Bearer')])
+            return
+
+        try:
+            # Küme yüklenmemişse veritabanından yüklenir (handler thread'inde)
+            await self.bridge._run(visibility_index.projects, kullanici_id)
+            subscriber = event_hub.subscribe_async(kullanici_id, asyncio.get_running_loop())
+        except HubFull as e:
+            await self._json_error(send, 503, str(e), [(b'retry-after', b'5')])
+            return
+        except Exception as e:
+            await self._json_error(send, 500, str(e))
+            return
+
+        async def watch_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+            subscriber.close()
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await send({'type': 'http.response.start', 'status': 200,
+                        'headers': [(b'content-type', b'text/event-stream; charset=utf-8'),
+                                    (b'cache-control', b'no-cache'),
+                                    (b'x-accel-buffering', b'no'),
+                                    (b'access-control-allow-origin', b'*')]})
+            await send({'type': 'http.response.body', 'body': b'retry: 3000\n\n', 'more_body': True})
+            while not subscriber.closed:
+                frames = await subscriber.wait(event_hub.heartbeat)
+                if subscriber.closed:
+                    break
+                await send({'type': 'http.response.body',
+                            'body': b''.join(frames) if frames else HEARTBEAT, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        except OSError:
+            # İstemci yazma sırasında bağlantıyı kesti
+            pass
+        finally:
+            watcher.cancel()
+            event_hub.unsubscribe(subscriber)
+
+
+application = Application(flask_app, ASGI_CONFIG)
@@ -0,0 +1,105 @@
+"""
+PGYS - asyncio için veritabanı adaptörü
+pyodbc ve sqlite3 sürücüleri bloklayan API'lerdir. Bu modül ConnectionPool ve
+bağlantılarını asyncio'dan kullanılabilir hale getirir: her bloklayan çağrı sınırlı
+bir executor'da çalışır, olay döngüsü beklerken başka istekleri işlemeye devam eder.
+
+Bir bağlantı aynı anda tek bir coroutine'e verilir; SQLite bağlantıları da bu
+sayede farklı executor thread'lerinden sırayla (eşzamanlı değil) kullanılır.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from functools import partial
+
+
+class AsyncCursor:
+    """DB-API imlecinin async karşılığı"""
+
+    def __init__(self, cursor, run):
+        self._cursor = cursor
+        self._run = run
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    async def execute(self, sql, params=()):
+        await self._run(self._cursor.execute, sql, params)
+        return self
+
+    async def fetchone(self):
+        return await self._run(self._cursor.fetchone)
+
+    async def fetchmany(self, size):
+        return await self._run(self._cursor.fetchmany, size)
+
+    async def fetchall(self):
+        return await self._run(self._cursor.fetchall)
+
+    async def close(self):
+        await self._run(self._cursor.close)
+
+
+class AsyncConnection:
+    """Havuzdan alınmış ham bağlantının async karşılığı"""
+
+    def __init__(self, raw, run):
+        self.raw = raw
+        self._run = run
+
+    async def cursor(self):
+        return AsyncCursor(await self._run(self.raw.cursor), self._run)
+
+    async def execute(self, sql, params=()):
+        """Yeni bir imleçte sorguyu çalıştırır ve imleci döndürür"""
+        cursor = await self.cursor()
+        return await cursor.execute(sql, params)
+
+    async def fetchall(self, sql, params=()):
+        """Sorguyu çalıştırıp tüm satırları tek executor çağrısında döndürür"""
+        def query():
+            cursor = self.raw.cursor()
+            try:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+        return await self._run(query)
+
+    async def commit(self):
+        await self._run(self.raw.commit)
+
+    async def rollback(self):
+        await self._run(self.raw.rollback)
+
+
+class AsyncConnectionPool:
+    """
+    ConnectionPool'un async sarmalayıcısı.
+
+    pool: db_pool.ConnectionPool
+    executor: bloklayan çağrıların çalışacağı executor (boyutu, aynı anda veritabanını
+    bekleyebilecek thread sayısını sınırlar)
+    """
+
+    def __init__(self, pool, executor):
+        self.pool = pool
+        self.executor = executor
+
+    async def run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(fn, *args))
+
+    @asynccontextmanager
+    async def connection(self):
+        """async with bloğu için havuzdan bağlantı; blok bitince iade edilir"""
+        pooled = await self.run(self.pool.acquire)
+        try:
+            yield AsyncConnection(pooled.raw, self.run)
+        finally:
+            await self.run(self.pool.release, pooled)
@@ -0,0 +1 @@
+"""PGYS performans ölçüm betikleri (backend dizininden `python -m benchmarks.<ad>` ile çalıştırılır)"""
@@ -0,0 +1,255 @@
+"""
+Yüksek eşzamanlılıkta verim: thread'li WSGI sunucusu (app.run ile aynı Werkzeug sunucusu)
+ile ASGI modunun (uvicorn asgi:application) karşılaştırması.
+
+Her mod ayrı bir süreçte, aynı SQLite veritabanı ve yapay sorgu gecikmesiyle
+(yavaş bir ODBC gidiş-dönüşünü taklit eder) başlatılır; asyncio tabanlı bir
+istemci çok sayıda keep-alive bağlantıyla istek gönderir.
+
+Kullanım (backend dizininde, uvicorn gerekir):
+    python -m benchmarks.asgi_throughput --concurrency 50 200 500 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ('threaded', 'asgi')
+
+
+# ========================================
+# Sunucu tarafı (--serve ile alt süreçte çalışır)
+# ========================================
+
+class _SlowCursor:
+    def __init__(self, cursor, delay):
+        self._cursor = cursor
+        self._delay = delay
+
+    def execute(self, *args):
+        time.sleep(self._delay)
+        self._cursor.execute(*args)
+        return self
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _SlowConnection:
+    def __init__(self, conn, delay):
+        self._conn = conn
+        self._delay = delay
+
+    def cursor(self):
+        return _SlowCursor(self._conn.cursor(), self._delay)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def serve(mode, path, port, latency_ms):
+    os.environ['PGYS_DB_BACKEND'] = 'sqlite'
+    os.environ['PGYS_SQLITE_PATH'] = path
+
+    import storage
+    connect = storage.SQLiteBackend.connect
+    delay = latency_ms / 1000.0
+    storage.SQLiteBackend.connect = lambda self: _SlowConnection(connect(self), delay)
+
+    if mode == 'threaded':
+        from werkzeug.serving import make_server
+        from app import app
+        make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+    else:
+        import uvicorn
+        uvicorn.run('asgi:application', host='127.0.0.1', port=port, log_level='warning')
+
+
+# ========================================
+# İstemci
+# ========================================
+
+async def _request(reader, writer, path):
+    """Tek GET isteği; (durum kodu, bağlantı açık kalabilir mi) döndürür"""
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: keep-alive\r\n\r\n'.encode())
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    keep_alive = True
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        name = name.strip().lower()
+        if name == b'content-length':
+            length = int(value)
+        elif name == b'connection' and value.strip().lower() == b'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def _client(port, paths, deadline, latencies, errors, timeout=30.0):
+    reader = writer = None
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            started = time.perf_counter()
+            status, keep_alive = await asyncio.wait_for(
+                _request(reader, writer, random.choice(paths)), timeout)
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors[status] = errors.get(status, 0) + 1
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+def _threads(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+async def _load(port, paths, concurrency, duration, pid):
+    latencies, errors, thread_samples = [], {}, []
+    deadline = time.monotonic() + duration
+    clients = [asyncio.create_task(_client(port, paths, deadline, latencies, errors))
+               for _ in range(concurrency)]
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.5)
+        thread_samples.append(_threads(pid))
+    await asyncio.gather(*clients)
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1) if latencies else None
+
+    return {
+        'rps': round(len(latencies) / duration, 1),
+        'ok': len(latencies),
+        'errors': errors,
+        'p50_ms': pct(0.50),
+        'p99_ms': pct(0.99),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 1) if latencies else None,
+        'threads_max': max((t for t in thread_samples if t), default=None),
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Sunucu başlatılamadı')
+
+
+def run(concurrency_levels, duration, latency_ms, users, projects, tasks, seed):
+    from benchmarks.synthetic import populate
+    from storage import SQLiteBackend
+
+    workdir = tempfile.mkdtemp(prefix='pgys-bench-')
+    try:
+        path = os.path.join(workdir, 'bench.db')
+        backend = SQLiteBackend(path)
+        backend.initialize()
+        counts = populate(backend, users=users, projects=projects, tasks=tasks, seed=seed)
+
+        rnd = random.Random(seed)
+        paths = ([f'/api/gorevler/{rnd.randint(1, tasks)}' for _ in range(200)]
+                 + [f'/api/projeler/{rnd.randint(1, projects)}' for _ in range(100)])
+
+        results = {'dataset': counts, 'latency_ms': latency_ms, 'duration_s': duration, 'runs': {}}
+        for mode in MODES:
+            port = _free_port()
+            proc = subprocess.Popen(
+                [sys.executable, '-m', 'benchmarks.asgi_throughput', '--serve', mode,
+                 '--path', path, '--port', str(port), '--latency-ms', str(latency_ms)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                _wait_ready(port)
+                for concurrency in concurrency_levels:
+                    results['runs'].setdefault(str(concurrency), {})[mode] = asyncio.run(
+                        _load(port, paths, concurrency, duration, proc.pid))
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Thread\'li WSGI / ASGI verim karşılaştırması')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--latency-ms', type=float, default=20.0,
+                        help='Her sorguya eklenecek yapay gecikme')
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--projects', type=int, default=500)
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Sonucu JSON olarak yaz')
+    parser.add_argument('--serve', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.path, args.port, args.latency_ms)
+        return
+
+    results = run(args.concurrency, args.duration, args.latency_ms,
+                  args.users, args.projects, args.tasks, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Veri seti: {results['dataset']}, sorgu gecikmesi: {args.latency_ms} ms")
+    print(f"{'eşzamanlı':>9} {'mod':<9} {'istek/sn':>9} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'thread':>7}  hatalar")
+    for concurrency, modes in results['runs'].items():
+        for mode, r in modes.items():
+            print(f"{concurrency:>9} {mode:<9} {r['rps']:>9} {r['p50_ms']!s:>8} {r['p99_ms']!s:>8} "
+                  f"{r['threads_max']!s:>7}  {r['errors'] or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+"""
+Yük testi: gerçek trafik karışımını (giriş, açılış, görev listesi / detay / düzenleme,
+yorumlar, dashboard, ekip, arama) thread'li sunucuya karşı tekrarlar ve endpoint başına
+istek/sn ile p50 / p95 / p99 gecikmeyi raporlar.
+
+Sunucu ayrı bir süreçte (app.run ile aynı Werkzeug sunucusu) sentetik veriyle başlatılır.
+Her sanal kullanıcı kendi tohumlu rastgele üreteciyle çalışır; aynı parametrelerle iki koşu
+aynı veriyi ve aynı istek karışımını üretir. --json çıktısı saklanıp --baseline ile
+sonraki koşularla karşılaştırılır.
+
+Kullanım (backend dizininde):
+    python -m benchmarks.load_test --preset small --concurrency 16 --duration 30
+    python -m benchmarks.load_test --json > once.json
+    python -m benchmarks.load_test --baseline once.json
+    python -m benchmarks.load_test --db bench.db     # synthetic --password ile üretilmiş veri
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+from benchmarks.asgi_throughput import _free_port, _wait_ready
+from benchmarks.synthetic import DEFAULT_PASSWORD, PRESETS, hash_password, populate
+
+# İşlem -> ağırlık (tarayıcıdaki tipik oturumdan; okumalar yazmalardan çok daha sık)
+DEFAULT_MIX = {
+    'giris': 2,
+    'acilis': 5,
+    'gorev_listesi': 20,
+    'gorev_detay': 20,
+    'gorev_guncelle': 8,
+    'yorumlar': 15,
+    'yorum_ekle': 5,
+    'dashboard': 10,
+    'ekip': 5,
+    'arama': 5,
+}
+
+
+# ========================================
+# Sunucu tarafı (--serve ile alt süreçte çalışır)
+# ========================================
+
+def serve(path, port, scrypt_n):
+    os.environ['PGYS_DB_BACKEND'] = 'sqlite'
+    os.environ['PGYS_SQLITE_PATH'] = path
+    os.environ['PGYS_SCRYPT_N'] = str(2 ** scrypt_n)
+
+    from werkzeug.serving import make_server
+    from app import app
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+
+# ========================================
+# İstemci
+# ========================================
+
+class _VirtualUser:
+    """Tek kullanıcının oturumu: giriş yapar, açılış ekranını yükler, karışımdan işlem seçer"""
+
+    def __init__(self, port, kullanici_id, rnd):
+        self.port = port
+        self.kullanici_id = kullanici_id
+        self.rnd = rnd
+        self.conn = None
+        self.token = None
+        self.gorevler = []
+
+    def request(self, method, path, body=None):
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        payload = json.dumps(body).encode() if body is not None else None
+        for attempt in (0, 1):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+            try:
+                self.conn.request(method, path, payload, headers)
+                response = self.conn.getresponse()
+                data = response.read()
+                return response.status, data
+            except (OSError, http.client.HTTPException):
+                # Sunucu keep-alive bağlantısını kapatmış olabilir; bir kez yeniden bağlanılır
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+    def gorev(self):
+        return self.rnd.choice(self.gorevler) if self.gorevler else None
+
+    # ---------- işlemler: (durum kodu) döndürür ----------
+
+    def giris(self):
+        status, data = self.request('POST', '/api/login', {
+            'email': f'kullanici{self.kullanici_id}@pgys.test', 'password': DEFAULT_PASSWORD})
+        if status == 200:
+            self.token = json.loads(data)['token']
+        return status
+
+    def acilis(self):
+        status, data = self.request('GET', '/api/bootstrap')
+        if status == 200:
+            self.gorevler = json.loads(data)['gorevler']['items']
+        return status
+
+    def gorev_listesi(self):
+        status, data = self.request('GET', '/api/gorevler?limit=50')
+        if status == 200:
+            items = json.loads(data)['items']
+            if items:
+                self.gorevler = items
+        return status
+
+    def gorev_detay(self):
+        gorev = self.gorev()
+        return self.request('GET', f"/api/gorevler/{gorev['GorevID']}")[0] if gorev else None
+
+    def gorev_guncelle(self):
+        gorev = self.gorev()
+        if gorev is None:
+            return None
+        gorev['DurumID'] = self.rnd.randint(1, 5)
+        return self.request('PUT', f"/api/gorevler/{gorev['GorevID']}", {
+            key: gorev[key] for key in ('GorevAdi', 'Aciklama', 'TeslimTarihi', 'ProjeID', 'DurumID', 'OncelikID')
+        })[0]
+
+    def yorumlar(self):
+        gorev = self.gorev()
+        return self.request('GET', f"/api/yorumlar/gorev/{gorev['GorevID']}")[0] if gorev else None
+
+    def yorum_ekle(self):
+        gorev = self.gorev()
+        if gorev is None:
+            return None
+        return self.request('POST', '/api/yorumlar', {
+            'GorevID': gorev['GorevID'], 'KullaniciID': self.kullanici_id,
+            'YorumMetni': f'Yük testi yorumu {self.rnd.randint(1, 10 ** 6)}'})[0]
+
+    def dashboard(self):
+        return self.request('GET', '/api/dashboard')[0]
+
+    def ekip(self):
+        return self.request('GET', '/api/ekip')[0]
+
+    def arama(self):
+        return self.request('GET', f"/api/search?q={quote(f'Görev {self.rnd.randint(1, 999)}')}&limit=20")[0]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+def _pct(latencies, p):
+    return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1) if latencies else None
+
+
+def _summary(latencies, errors, duration):
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': _pct(latencies, 0.50),
+        'p95_ms': _pct(latencies, 0.95),
+        'p99_ms': _pct(latencies, 0.99),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 1) if latencies else None,
+    }
+
+
+def _load(port, kullanici_ids, mix, concurrency, warmup, duration, seed):
+    operations = list(mix)
+    weights = [mix[name] for name in operations]
+    latencies = {name: [] for name in operations}
+    errors = {name: {} for name in operations}
+    lock = threading.Lock()
+    started = time.monotonic()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    def worker(n):
+        rnd = random.Random(seed * 1000 + n)
+        user = _VirtualUser(port, kullanici_ids[n % len(kullanici_ids)], rnd)
+        local = {name: [] for name in operations}
+        local_errors = {name: {} for name in operations}
+        # Oturum her zaman giriş + açılışla başlar; sonra karışımdan seçilir
+        queue = ['giris', 'acilis']
+        try:
+            while time.monotonic() < deadline:
+                name = queue.pop(0) if queue else rnd.choices(operations, weights)[0]
+                began = time.perf_counter()
+                try:
+                    status = getattr(user, name)()
+                except (OSError, http.client.HTTPException) as e:
+                    status = type(e).__name__
+                finished = time.perf_counter()
+                # --mix'te olmayan açılış adımları çalışır ama ölçülmez
+                if status is None or name not in local or time.monotonic() < measure_from:
+                    continue
+                if status in (200, 201):
+                    local[name].append(finished - began)
+                else:
+                    local_errors[name][str(status)] = local_errors[name].get(str(status), 0) + 1
+        finally:
+            user.close()
+        with lock:
+            for name in operations:
+                latencies[name].extend(local[name])
+                for status, count in local_errors[name].items():
+                    errors[name][status] = errors[name].get(status, 0) + count
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    endpoints = {name: _summary(latencies[name], errors[name], duration) for name in operations}
+    total_errors = {}
+    for name in operations:
+        for status, count in errors[name].items():
+            total_errors[status] = total_errors.get(status, 0) + count
+    total = _summary([value for name in operations for value in latencies[name]], total_errors, duration)
+    return endpoints, total
+
+
+def _dataset(path):
+    conn = sqlite3.connect(path)
+    try:
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ('KULLANICILAR', 'PROJELER', 'PROJE_UYE_ILISKISI', 'GOREVLER',
+                                'GOREV_ATAMALARI', 'YORUMLAR')}
+        # Sanal kullanıcılar en az bir projede üye olanlar arasından seçilir (açılış ekranı boş olmasın)
+        members = [row[0] for row in conn.execute(
+            "SELECT DISTINCT KullaniciID FROM PROJE_UYE_ILISKISI ORDER BY KullaniciID")]
+        return counts, members
+    finally:
+        conn.close()
+
+
+def compare(results, baseline):
+    """Endpoint başına istek/sn ve p95 değişimi (%); pozitif p95 farkı yavaşlamadır"""
+    def change(new, old):
+        return round((new - old) / old * 100, 1) if new is not None and old else None
+
+    comparison = {}
+    for name, current in {**results['endpoints'], 'toplam': results['total']}.items():
+        old = baseline['total'] if name == 'toplam' else baseline.get('endpoints', {}).get(name)
+        if old:
+            comparison[name] = {'rps_pct': change(current['rps'], old['rps']),
+                                'p95_pct': change(current['p95_ms'], old['p95_ms']),
+                                'p99_pct': change(current['p99_ms'], old['p99_ms'])}
+    return comparison
+
+
+def run(preset, db, concurrency, warmup, duration, mix, scrypt_n, seed):
+    workdir = tempfile.mkdtemp(prefix='pgys-bench-')
+    try:
+        path = os.path.join(workdir, 'bench.db')
+        if db:
+            # Yazma işlemleri kaynak dosyayı değiştirmesin; her koşu aynı veriden başlar
+            shutil.copyfile(db, path)
+        else:
+            from storage import SQLiteBackend
+            users, projects, tasks, comments = PRESETS[preset]
+            backend = SQLiteBackend(path)
+            backend.initialize()
+            populate(backend, users=users, projects=projects, tasks=tasks, comments_per_task=comments,
+                     seed=seed, password_hash=hash_password(DEFAULT_PASSWORD, 2 ** scrypt_n))
+        counts, members = _dataset(path)
+        kullanici_ids = random.Random(seed).sample(members, min(len(members), concurrency))
+
+        port = _free_port()
+        proc = subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.load_test', '--serve', '--path', path,
+             '--port', str(port), '--scrypt-n', str(scrypt_n)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            # Açılışta arama indeksi kurulur; büyük veri setinde birkaç saniye sürebilir
+            _wait_ready(port, timeout=600)
+            endpoints, total = _load(port, kullanici_ids, mix, concurrency, warmup, duration, seed)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+        return {
+            'dataset': counts,
+            'config': {'preset': None if db else preset, 'concurrency': concurrency, 'warmup_s': warmup,
+                       'duration_s': duration, 'scrypt_n': scrypt_n, 'seed': seed, 'mix': mix},
+            'endpoints': endpoints,
+            'total': total,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"bilinmeyen işlem: {name} ({', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API yük testi (trafik karışımı, endpoint başına yüzdelikler)')
+    parser.add_argument('--preset', choices=PRESETS, default='small', help='Üretilecek veri ölçeği')
+    parser.add_argument('--db', help='Hazır SQLite dosyası (synthetic --password ile); kopyası kullanılır')
+    parser.add_argument('--concurrency', type=int, default=16, help='Eşzamanlı sanal kullanıcı')
+    parser.add_argument('--warmup', type=float, default=3.0, help='Ölçülmeyen ısınma süresi (sn)')
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--mix', type=_parse_mix, default=DEFAULT_MIX,
+                        help='İşlem ağırlıkları, örn. acilis=5,gorev_listesi=20,gorev_guncelle=8')
+    parser.add_argument('--scrypt-n', type=int, default=14,
+                        help='Şifre hash maliyeti, 2^x (--db ile üretimdeki değerle aynı olmalı)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', help='Karşılaştırılacak önceki --json çıktısı')
+    parser.add_argument('--json', action='store_true', help='Sonucu JSON olarak yaz')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.path, args.port, args.scrypt_n)
+        return
+
+    results = run(args.preset, args.db, args.concurrency, args.warmup, args.duration,
+                  args.mix, args.scrypt_n, args.seed)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            results['comparison'] = compare(results, json.load(f))
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Veri seti: {results['dataset']}")
+    print(f"Eşzamanlı kullanıcı: {args.concurrency}, süre: {args.duration} sn")
+    print(f"{'işlem':<15} {'istek':>7} {'istek/sn':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  hatalar")
+    for name, r in {**results['endpoints'], 'toplam': results['total']}.items():
+        line = (f"{name:<15} {r['requests']:>7} {r['rps']:>9} {r['p50_ms']!s:>8} "
+                f"{r['p95_ms']!s:>8} {r['p99_ms']!s:>8}  {r['errors'] or '-'}")
+        diff = results.get('comparison', {}).get(name)
+        if diff:
+            line += '  (' + ', '.join(f"{label} {value:+}%" for label, value in
+                                      (('istek/sn', diff['rps_pct']), ('p95', diff['p95_pct'])) if value is not None) + ')'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Giriş (şifre doğrulama) verimi: farklı KDF maliyetlerinde, eşzamanlı giriş fırtınası
+altında saniyedeki giriş sayısı ve p50 / p95 / p99 gecikme. Hedef p99'u karşılayan
+en yüksek maliyet önerilir.
+
+Kullanım (backend dizininde):
+    python -m benchmarks.login_throughput --concurrency 32 --target-p99-ms 500
+    python -m benchmarks.login_throughput --workers 8 --scrypt-n 14 15 16 --pbkdf2 300000 600000
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from passwords import PasswordHasher, PasswordHasherBusy
+
+
+def _candidates(scrypt_exponents, pbkdf2_iterations):
+    for exponent in scrypt_exponents:
+        yield f'scrypt n=2^{exponent}', {'scheme': 'scrypt', 'scrypt_n': 2 ** exponent}
+    for iterations in pbkdf2_iterations:
+        yield f'pbkdf2_sha256 {iterations}', {'scheme': 'pbkdf2_sha256', 'pbkdf2_iterations': iterations}
+
+
+def _storm(hasher, stored, concurrency, duration):
+    latencies = []
+    busy = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        local = []
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                ok, _ = hasher.verify('Sifre123!', stored)
+                assert ok
+                local.append(time.perf_counter() - started)
+            except PasswordHasherBusy:
+                with lock:
+                    busy[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1) if latencies else None
+
+    return {
+        'logins_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': pct(0.50),
+        'p95_ms': pct(0.95),
+        'p99_ms': pct(0.99),
+        'busy': busy[0],
+    }
+
+
+def run(workers, concurrency, duration, max_pending, executor, scrypt_exponents, pbkdf2_iterations):
+    results = {'workers': workers, 'concurrency': concurrency, 'runs': {}}
+    for label, options in _candidates(scrypt_exponents, pbkdf2_iterations):
+        hasher = PasswordHasher(workers=workers, max_pending=max_pending, executor=executor,
+                                **options).start()
+        try:
+            stored = hasher.hash('Sifre123!')
+            single_started = time.perf_counter()
+            hasher.verify('Sifre123!', stored)
+            single_ms = round((time.perf_counter() - single_started) * 1000, 1)
+
+            run_result = _storm(hasher, stored, concurrency, duration)
+            run_result['single_ms'] = single_ms
+            run_result['executor'] = hasher.executor_kind
+            results['runs'][label] = run_result
+        finally:
+            hasher.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Şifre doğrulama verimi / maliyet seçimi')
+    parser.add_argument('--workers', type=int, default=None, help='Hash süreç sayısı (varsayılan: CPU sayısı)')
+    parser.add_argument('--concurrency', type=int, default=32, help='Eşzamanlı giriş isteği')
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--max-pending', type=int, default=64)
+    parser.add_argument('--executor', choices=('process', 'thread'), default=None)
+    parser.add_argument('--scrypt-n', type=int, nargs='*', default=[13, 14, 15],
+                        help='scrypt n üsleri (2^x)')
+    parser.add_argument('--pbkdf2', type=int, nargs='*', default=[210000, 600000],
+                        help='PBKDF2-SHA256 tur sayıları')
+    parser.add_argument('--target-p99-ms', type=float, default=None,
+                        help='Bu p99 hedefini karşılayan en yüksek maliyeti öner')
+    parser.add_argument('--json', action='store_true', help='Sonucu JSON olarak yaz')
+    args = parser.parse_args()
+
+    workers = args.workers if args.workers is not None else PasswordHasher().workers
+    results = run(workers, args.concurrency, args.duration, args.max_pending, args.executor,
+                  args.scrypt_n, args.pbkdf2)
+
+    if args.target_p99_ms is not None:
+        meeting = [label for label, r in results['runs'].items()
+                   if r['p99_ms'] is not None and r['p99_ms'] <= args.target_p99_ms and not r['busy']]
+        # Aday listesi şema içinde artan maliyet sırasında; her şemanın son uygun adayı
+        results['recommended'] = {
+            scheme: [label for label in meeting if label.startswith(scheme)][-1]
+            for scheme in ('scrypt', 'pbkdf2_sha256')
+            if any(label.startswith(scheme) for label in meeting)
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Hash süreci: {results['workers']}, eşzamanlı giriş: {results['concurrency']}")
+    print(f"{'maliyet':<22} {'tek ms':>7} {'giriş/sn':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'503':>5}")
+    for label, r in results['runs'].items():
+        print(f"{label:<22} {r['single_ms']:>7} {r['logins_per_sec']:>9} {r['p50_ms']!s:>8} "
+              f"{r['p95_ms']!s:>8} {r['p99_ms']!s:>8} {r['busy']:>5}")
+    if 'recommended' in results:
+        print(f"p99 <= {args.target_p99_ms} ms için öneri: {results['recommended'] or 'yok'}")
+
+
+if __name__ == '__main__':
+    main()
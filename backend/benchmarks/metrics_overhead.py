@@ -0,0 +1,113 @@
+"""
+İstek metriklerinin (metrics.py) sıcak yoldaki maliyeti: aynı sorgular çıplak imleçle,
+TimedCursor ile ve sorgu profili (profiling.py) açık TimedCursor ile çalıştırılır; istek
+başına begin/end işleme ve /api/metrics üretim süresi ayrıca ölçülür.
+
+Kullanım (backend dizininde):
+    python -m benchmarks.metrics_overhead --tasks 20000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import queries
+from benchmarks.synthetic import populate
+from metrics import Metrics, TimedConnection
+from profiling import QueryProfiler
+from storage import SQLiteBackend
+
+PAGE_SQL = queries.GOREVLER_SELECT + " WHERE g.ProjeID = ? ORDER BY g.TeslimTarihi, g.GorevID LIMIT 50"
+
+
+def _queries(conn, projects, count):
+    for n in range(count):
+        cursor = conn.cursor()
+        cursor.execute(PAGE_SQL, (n % projects + 1,))
+        cursor.fetchall()
+        cursor.execute("SELECT 1 FROM PROJELER WHERE ProjeID = ?", (n % projects + 1,))
+        cursor.fetchone()
+
+
+def _median_us(fn, count, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) / count * 1e6)
+    return round(statistics.median(samples), 2)
+
+
+def run(tasks, requests, routes, repeat, seed):
+    workdir = tempfile.mkdtemp(prefix='pgys-bench-')
+    try:
+        backend = SQLiteBackend(os.path.join(workdir, 'bench.db'))
+        backend.initialize(migrate=False)
+        projects = max(10, tasks // 25)
+        counts = populate(backend, users=max(10, tasks // 50), projects=projects, tasks=tasks, seed=seed)
+
+        conn = backend.connect()
+        try:
+            metrics = Metrics()
+            state = [0.0, 0.0, 0.0, 0.0, 0, 0, 0.0]
+            timed = TimedConnection(conn, state)
+            # Eşik yüksek: sadece gruplama / sayma maliyeti ölçülür, günlük yazılmaz
+            profiled = TimedConnection(conn, state, QueryProfiler(context_fn=lambda: 'bench', slow_ms=1e9))
+            results = {'dataset': counts, 'requests': requests, 'us_per_request': {}}
+            # İstek başına iki sorgu (sayfa + varlık kontrolü), tipik bir handler gibi
+            results['us_per_request']['çıplak imleç'] = _median_us(
+                lambda: _queries(conn, projects, requests), requests, repeat)
+            results['us_per_request']['TimedCursor'] = _median_us(
+                lambda: _queries(timed, projects, requests), requests, repeat)
+            results['us_per_request']['+ sorgu profili'] = _median_us(
+                lambda: _queries(profiled, projects, requests), requests, repeat)
+            results['us_per_request']['sarma farkı'] = round(
+                results['us_per_request']['TimedCursor'] - results['us_per_request']['çıplak imleç'], 2)
+
+            def cycles():
+                for n in range(requests):
+                    metrics.begin()
+                    metrics.end(f'/api/route{n % routes}', 'GET', 200, 1024)
+
+            results['us_per_request']['begin + end'] = _median_us(cycles, requests, repeat)
+
+            started = time.perf_counter()
+            text = metrics.render()
+            results['render'] = {'routes': routes, 'ms': round((time.perf_counter() - started) * 1000, 2),
+                                 'bytes': len(text.encode())}
+            return results
+        finally:
+            conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='İstek metrikleri maliyet ölçümü')
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--routes', type=int, default=60, help='Metrik üretilecek farklı route sayısı')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Sonucu JSON olarak yaz')
+    args = parser.parse_args()
+
+    results = run(args.tasks, args.requests, args.routes, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Veri seti: {results['dataset']}")
+    print(f"{'ölçüm':<16} {'µs / istek':>12}")
+    for label, us in results['us_per_request'].items():
+        print(f"{label:<16} {us:>12}")
+    render = results['render']
+    print(f"/api/metrics üretimi: {render['routes']} route, {render['ms']} ms, {render['bytes']} bayt")
+
+
+if __name__ == '__main__':
+    main()
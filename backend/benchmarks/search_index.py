@@ -0,0 +1,164 @@
+"""
+Arama: LIKE '%terim%' taraması ile ters indeksin (search.py) karşılaştırması.
+Sentetik görev adı / açıklaması / yorum metinleri Türkçe kelimelerden üretilir;
+indeksin kurulum süresi ve artımlı güncelleme maliyeti de raporlanır.
+
+Kullanım (backend dizininde):
+    python -m benchmarks.search_index --tasks 100000 --comments-per-task 1
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+
+import queries
+from benchmarks.synthetic import populate
+from migrate import apply_migrations
+from search import SearchIndex
+from storage import SQLiteBackend
+
+WORDS = ('veritabanı', 'yedekleme', 'sunucu', 'güncelleme', 'arayüz', 'müşteri', 'ödeme',
+         'rapor', 'şifre', 'giriş', 'ışık', 'doğrulama', 'entegrasyon', 'taşıma', 'hata',
+         'düzeltme', 'performans', 'önbellek', 'bildirim', 'kullanıcı', 'yetki', 'sözleşme',
+         'fatura', 'çeviri', 'İstanbul', 'Ankara', 'İzmir', 'toplantı', 'sunum', 'tasarım',
+         'test', 'kurulum', 'dağıtım', 'izleme', 'günlük', 'arşiv', 'yapılandırma', 'ağ')
+
+QUERIES = ('yedekleme', 'SUNUCU hata', 'isik', 'istanbul toplanti', 'perf', 'gunc', 'sifre dogrulama')
+
+LIKE_SQL = f"""
+    SELECT 'gorev', g.GorevID FROM GOREVLER g
+    WHERE ({{gorev_where}}) AND g.ProjeID IN ({queries.GORUNUR_PROJELER})
+    UNION ALL
+    SELECT 'yorum', y.YorumID FROM YORUMLAR y JOIN GOREVLER g ON g.GorevID = y.GorevID
+    WHERE ({{yorum_where}}) AND g.ProjeID IN ({queries.GORUNUR_PROJELER})
+"""
+
+
+def _sentence(rnd, count):
+    return ' '.join(rnd.choice(WORDS) for _ in range(count))
+
+
+def _fill_text(conn, seed):
+    """populate'in ürettiği 'Görev N' metinlerini rastgele Türkçe kelimelerle değiştirir"""
+    rnd = random.Random(seed)
+    gorevler = [row[0] for row in conn.execute("SELECT GorevID FROM GOREVLER")]
+    conn.executemany("UPDATE GOREVLER SET GorevAdi = ?, Aciklama = ? WHERE GorevID = ?",
+                     ((_sentence(rnd, 3), _sentence(rnd, 12), g) for g in gorevler))
+    yorumlar = [row[0] for row in conn.execute("SELECT YorumID FROM YORUMLAR")]
+    conn.executemany("UPDATE YORUMLAR SET YorumMetni = ? WHERE YorumID = ?",
+                     ((_sentence(rnd, 8), y) for y in yorumlar))
+    conn.commit()
+
+
+def _time_like(conn, query, kullanici_id, repeat):
+    # LIKE büyük / küçük harf ve Türkçe karakterleri katlamaz; sadece tarama maliyeti ölçülür
+    terms = query.split()
+    gorev_where = ' AND '.join('(g.GorevAdi LIKE ? OR g.Aciklama LIKE ?)' for _ in terms)
+    yorum_where = ' AND '.join('y.YorumMetni LIKE ?' for _ in terms)
+    sql = LIKE_SQL.format(gorev_where=gorev_where, yorum_where=yorum_where)
+    visibility = list(queries.gorunur_projeler_params(kullanici_id))
+    params = ([f'%{t}%' for t in terms for _ in range(2)] + visibility
+              + [f'%{t}%' for t in terms] + visibility)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(samples), 3), 'rows': len(rows)}
+
+
+def _time_index(index, visible, query, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _, total = index.search(query, visible=visible, limit=20)
+        samples.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(samples), 3), 'rows': total}
+
+
+def run(users, projects, tasks, comments_per_task, user_id, repeat, updates, seed):
+    workdir = tempfile.mkdtemp(prefix='pgys-bench-')
+    try:
+        path = os.path.join(workdir, 'bench.db')
+        backend = SQLiteBackend(path)
+        backend.initialize(migrate=False)
+        counts = populate(backend, users=users, projects=projects, tasks=tasks,
+                          comments_per_task=comments_per_task, seed=seed)
+        apply_migrations(backend, log=None)
+
+        conn = backend.connect()
+        try:
+            _fill_text(conn, seed)
+
+            @contextmanager
+            def connection():
+                yield conn
+
+            index = SearchIndex(connection)
+            index.rebuild()
+            visible = {row[0] for row in conn.execute(
+                f"SELECT ProjeID FROM PROJELER WHERE ProjeID IN ({queries.GORUNUR_PROJELER})",
+                list(queries.gorunur_projeler_params(user_id)))}
+
+            results = {'dataset': counts, 'kullanici_id': user_id,
+                       'visible_projects': len(visible), 'index': {}, 'queries': {}}
+            for query in QUERIES:
+                results['queries'][query] = {
+                    'like': _time_like(conn, query, user_id, repeat),
+                    'indeks': _time_index(index, visible, query, repeat),
+                }
+
+            # Artımlı güncelleme: görev düzenlemesi başına indeks maliyeti
+            rnd = random.Random(seed)
+            started = time.perf_counter()
+            for _ in range(updates):
+                index.task_changed(rnd.randint(1, tasks), rnd.randint(1, projects),
+                                   _sentence(rnd, 3), _sentence(rnd, 12))
+            update_us = (time.perf_counter() - started) / max(updates, 1) * 1e6
+
+            results['index'] = {**index.stats(), 'update_avg_us': round(update_us, 1)}
+            return results
+        finally:
+            conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LIKE taraması ve arama indeksi karşılaştırması')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--tasks', type=int, default=50000)
+    parser.add_argument('--comments-per-task', type=float, default=1.0)
+    parser.add_argument('--user-id', type=int, default=1, help='Kapsamı kullanılacak kullanıcı')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--updates', type=int, default=2000, help='Ölçülecek artımlı güncelleme sayısı')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Sonucu JSON olarak yaz')
+    args = parser.parse_args()
+
+    results = run(args.users, args.projects, args.tasks, args.comments_per_task, args.user_id,
+                  args.repeat, args.updates, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Veri seti: {results['dataset']}")
+    print(f"Kullanıcı {results['kullanici_id']}: {results['visible_projects']} görünür proje")
+    print(f"{'sorgu':<20} {'LIKE ms':>10} {'satır':>7} {'indeks ms':>10} {'satır':>7}")
+    for query, r in results['queries'].items():
+        print(f"{query:<20} {r['like']['median_ms']:>10} {r['like']['rows']:>7} "
+              f"{r['indeks']['median_ms']:>10} {r['indeks']['rows']:>7}")
+    index = results['index']
+    print(f"İndeks: {index['documents']} kayıt, {index['terms']} terim, kurulum {index['build_ms']} ms, "
+          f"güncelleme ort. {index['update_avg_us']} µs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Satır -> JSON dönüşümü: handler'lardaki eski yol (satır başına öznitelik erişimi + koşullu
+dönüşümler + varsayılan JSON sağlayıcı) ile RowSerializer ve orjson sağlayıcının karşılaştırması.
+
+Kullanım (backend dizininde):
+    python -m benchmarks.serialization --tasks 50000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import queries
+from benchmarks.synthetic import populate
+from lookups import LookupCache
+from serializers import RowSerializer, OrjsonProvider, iso_date, or_empty, orjson
+from storage import SQLiteBackend
+
+
+def _legacy_gorev(lookup_cache):
+    # user-010 öncesi get_gorevler döngüsü
+    from datetime import datetime
+
+    def format_date(value):
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d')
+        return value
+
+    def convert(cursor, rows):
+        result = []
+        for row in rows:
+            result.append({
+                'GorevID': row.GorevID,
+                'GorevAdi': row.GorevAdi,
+                'Aciklama': row.Aciklama,
+                'TeslimTarihi': format_date(row.TeslimTarihi),
+                'ProjeID': row.ProjeID,
+                'ProjeAdi': row.ProjeAdi if row.ProjeAdi else '',
+                'DurumID': row.DurumID,
+                'DurumAdi': lookup_cache.durum_adi(row.DurumID),
+                'OncelikID': row.OncelikID,
+                'OncelikAdi': lookup_cache.oncelik_adi(row.OncelikID)
+            })
+        return result
+    return convert
+
+
+def _serializer_gorev(lookup_cache):
+    serializer = RowSerializer(
+        'GorevID', 'GorevAdi', 'Aciklama',
+        ('TeslimTarihi', iso_date),
+        'ProjeID',
+        ('ProjeAdi', or_empty),
+        'DurumID',
+        ('DurumAdi', lookup_cache.durum_adi, 'DurumID'),
+        'OncelikID',
+        ('OncelikAdi', lookup_cache.oncelik_adi, 'OncelikID')
+    )
+    return serializer.all
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 1)
+
+
+def run(tasks, repeat, seed):
+    workdir = tempfile.mkdtemp(prefix='pgys-bench-')
+    try:
+        backend = SQLiteBackend(os.path.join(workdir, 'bench.db'))
+        backend.initialize(migrate=False)
+        counts = populate(backend, users=max(10, tasks // 50), projects=max(10, tasks // 25),
+                          tasks=tasks, seed=seed)
+
+        conn = backend.connect()
+        lookup_cache = LookupCache(lambda: _borrowed(conn))
+        lookup_cache.load()
+        cursor = conn.cursor()
+        cursor.execute(queries.GOREVLER_SELECT + " ORDER BY g.TeslimTarihi, g.GorevID")
+        rows = cursor.fetchall()
+
+        app = Flask(__name__)
+        providers = {'std': DefaultJSONProvider(app)}
+        if orjson is not None:
+            providers['orjson'] = OrjsonProvider(app)
+
+        results = {'dataset': counts, 'rows': len(rows), 'timings': {}}
+        converters = {'eski': _legacy_gorev(lookup_cache), 'RowSerializer': _serializer_gorev(lookup_cache)}
+        for conv_name, convert in converters.items():
+            results['timings'][f'{conv_name} dönüşüm'] = _time(lambda: convert(cursor, rows), repeat)
+            for prov_name, provider in providers.items():
+                with app.app_context():
+                    results['timings'][f'{conv_name} + {prov_name} yanıt'] = _time(
+                        lambda: provider.response(convert(cursor, rows)).get_data(), repeat)
+        conn.close()
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+class _borrowed:
+    """LookupCache'in beklediği with bloğu için açık bağlantıyı ödünç verir"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, *exc):
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Satır serileştirme karşılaştırması')
+    parser.add_argument('--tasks', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Sonucu JSON olarak yaz')
+    args = parser.parse_args()
+
+    results = run(args.tasks, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Satır sayısı: {results['rows']}")
+    print(f"{'yol':<34} {'medyan ms':>10}")
+    for label, ms in results['timings'].items():
+        print(f"{label:<34} {ms:>10}")
+
+
+if __name__ == '__main__':
+    main()
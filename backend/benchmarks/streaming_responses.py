@@ -0,0 +1,95 @@
+"""
+Tam liste endpoint'leri: tek parça jsonify ile akışlı (?stream=1 / ndjson) yanıtların
+ilk bayt süresi, toplam süre ve en yüksek bellek kullanımı karşılaştırması.
+
+Kullanım (backend dizininde):
+    python -m benchmarks.streaming_responses --tasks 100000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import populate
+
+MODES = {
+    'jsonify': ('', {}),
+    'stream=json': ('?stream=1', {}),
+    'stream=ndjson': ('', {'Accept': 'application/x-ndjson'}),
+}
+
+
+def _measure(client, url, headers):
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    first_byte = None
+    size = 0
+    try:
+        for chunk in response.response:
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            size += len(chunk)
+    finally:
+        response.close()
+    total = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'ttfb_ms': round(first_byte * 1000, 1),
+        'total_ms': round(total * 1000, 1),
+        'peak_mb': round(peak / 1024 / 1024, 2),
+        'bytes': size,
+    }
+
+
+def run(users, projects, tasks, repeat, seed):
+    workdir = tempfile.mkdtemp(prefix='pgys-bench-')
+    try:
+        # app modülü içe aktarılırken bu ayarlarla SQLite motorunu kurar
+        os.environ['PGYS_DB_BACKEND'] = 'sqlite'
+        os.environ['PGYS_SQLITE_PATH'] = os.path.join(workdir, 'bench.db')
+        import app
+
+        counts = populate(app.db_backend, users=users, projects=projects, tasks=tasks, seed=seed)
+        client = app.app.test_client()
+
+        results = {'dataset': counts, 'timings': {}}
+        for endpoint in ('/api/gorevler', '/api/kullanicilar'):
+            for mode, (query, headers) in MODES.items():
+                samples = [_measure(client, endpoint + query, headers) for _ in range(repeat)]
+                best = min(samples, key=lambda s: s['total_ms'])
+                results['timings'].setdefault(endpoint, {})[mode] = best
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Akışlı JSON yanıt karşılaştırması')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Sonucu JSON olarak yaz')
+    args = parser.parse_args()
+
+    results = run(args.users, args.projects, args.tasks, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Veri seti: {results['dataset']}")
+    print(f"{'endpoint':<18} {'mod':<14} {'ilk bayt ms':>12} {'toplam ms':>10} {'bellek MB':>10}")
+    for endpoint, timings in results['timings'].items():
+        for mode, t in timings.items():
+            print(f"{endpoint:<18} {mode:<14} {t['ttfb_ms']:>12} {t['total_ms']:>10} {t['peak_mb']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Sentetik veri üreteci
+SQLite motorunda gerçekçi dağılımlı kullanıcı / proje / görev verisi oluşturur.
+Aynı tohum (seed) ve parametreler her zaman aynı veriyi üretir.
+
+Kullanım (backend dizininde):
+    python -m benchmarks.synthetic --path bench.db --users 2000 --projects 5000 --tasks 100000
+    python -m benchmarks.synthetic --path bench.db --preset large --password Sifre123!
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from storage import SQLiteBackend
+
+# Hazır ölçekler: (users, projects, tasks, comments_per_task)
+PRESETS = {
+    'small': (1000, 2000, 50000, 0.5),
+    'medium': (5000, 10000, 250000, 0.5),
+    'large': (10000, 50000, 1000000, 0.5),
+}
+
+# Yük testindeki kullanıcıların ortak şifresi (bkz. benchmarks.load_test)
+DEFAULT_PASSWORD = 'Sifre123!'
+
+
+def hash_password(password, scrypt_n=2 ** 14):
+    """Tüm sentetik kullanıcılara yazılacak tek hash (kullanıcı başına KDF çalıştırılmaz)"""
+    from passwords import PasswordHasher
+    hasher = PasswordHasher(scrypt_n=scrypt_n, workers=0).start()
+    try:
+        return hasher.hash(password)
+    finally:
+        hasher.close()
+
+
+def populate(backend, users=1000, projects=2000, tasks=50000, members_per_project=5,
+             assignments_per_task=1, comments_per_task=0.0, seed=42, batch_size=5000,
+             password_hash=None):
+    """
+    Boş bir veritabanını sentetik veriyle doldurur ve tablo başına satır sayılarını döndürür.
+    Üyelikler ve atamalar az sayıda "yoğun" kullanıcıda toplanacak şekilde çarpık dağıtılır.
+    password_hash verilirse (bkz. hash_password) kullanıcılar bu şifreyle giriş yapabilir.
+    Görev, atama ve yorumlar batch_size'lık parçalarla yazılır; milyonlarca görevde de
+    bellek kullanımı sabit kalır.
+    """
+    rnd = random.Random(seed)
+    conn = backend.connect()
+    started = time.perf_counter()
+
+    def skewed_user():
+        # Kullanıcıların ~%10'u, üyelik/atamaların ~%50'sini alır
+        if rnd.random() < 0.5:
+            return rnd.randint(1, max(1, users // 10))
+        return rnd.randint(1, users)
+
+    try:
+        cursor = conn.cursor()
+        # Dosya bir kez yazılıp ölçümde kullanılır; yükleme sırasında fsync gerekmez
+        cursor.execute("PRAGMA synchronous = OFF")
+
+        cursor.executemany(
+            "INSERT INTO KULLANICILAR (KullaniciID, Ad, Soyad, Eposta, SifreHash) VALUES (?, ?, ?, ?, ?)",
+            ((i, f'Ad{i}', f'Soyad{i}', f'kullanici{i}@pgys.test', password_hash or '0' * 64)
+             for i in range(1, users + 1))
+        )
+
+        base = date(2024, 1, 1)
+        cursor.executemany(
+            "INSERT INTO PROJELER (ProjeID, ProjeAdi, BaslangicTarihi, BitisTarihi, Butce, YoneticiID) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((i, f'Proje {i}', (base + timedelta(days=rnd.randint(0, 700))).isoformat(), None,
+              float(rnd.randint(1, 500) * 1000), skewed_user())
+             for i in range(1, projects + 1))
+        )
+
+        uyelikler = set()
+        for proje_id in range(1, projects + 1):
+            for _ in range(rnd.randint(1, members_per_project * 2 - 1)):
+                uyelikler.add((proje_id, skewed_user()))
+        cursor.executemany(
+            "INSERT INTO PROJE_UYE_ILISKISI (ProjeID, KullaniciID, RolID) VALUES (?, ?, ?)",
+            ((p, k, rnd.randint(1, 4)) for p, k in uyelikler)
+        )
+
+        atama_sayisi = 0
+        for start in range(1, tasks + 1, batch_size):
+            stop = min(start + batch_size, tasks + 1)
+            cursor.executemany(
+                "INSERT INTO GOREVLER (GorevID, GorevAdi, Aciklama, TeslimTarihi, ProjeID, DurumID, OncelikID) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((i, f'Görev {i}', f'Görev {i} açıklaması', (base + timedelta(days=rnd.randint(0, 900))).isoformat(),
+                  rnd.randint(1, projects), rnd.randint(1, 5), rnd.randint(1, 4))
+                 for i in range(start, stop))
+            )
+            # Aynı kullanıcı bir göreve iki kez atanamaz; tekillik görev içinde sağlanır
+            atamalar = []
+            for gorev_id in range(start, stop):
+                atamalar.extend((gorev_id, k) for k in {skewed_user() for _ in range(assignments_per_task)})
+            cursor.executemany("INSERT INTO GOREV_ATAMALARI (GorevID, KullaniciID) VALUES (?, ?)", atamalar)
+            atama_sayisi += len(atamalar)
+
+        yorum_sayisi = int(tasks * comments_per_task)
+        for start in range(0, yorum_sayisi, batch_size):
+            cursor.executemany(
+                "INSERT INTO YORUMLAR (GorevID, KullaniciID, YorumMetni, Tarih) VALUES (?, ?, ?, ?)",
+                ((rnd.randint(1, tasks), skewed_user(), f'Yorum {i}',
+                  f'2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} 12:00:00')
+                 for i in range(start, min(start + batch_size, yorum_sayisi)))
+            )
+
+        # V005 sonrası şemada profil sayaçları da doldurulur (bkz. counters.py)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'KULLANICI_SAYACLARI'")
+        if cursor.fetchone():
+            cursor.execute("""
+                INSERT INTO KULLANICI_SAYACLARI (KullaniciID, ProjeSayisi, GorevSayisi)
+                SELECT KullaniciID, SUM(Proje), SUM(Gorev) FROM (
+                    SELECT KullaniciID, COUNT(*) AS Proje, 0 AS Gorev FROM PROJE_UYE_ILISKISI GROUP BY KullaniciID
+                    UNION ALL
+                    SELECT KullaniciID, 0, COUNT(*) FROM GOREV_ATAMALARI GROUP BY KullaniciID
+                ) GROUP BY KullaniciID
+            """)
+
+        conn.commit()
+        cursor.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        'KULLANICILAR': users,
+        'PROJELER': projects,
+        'PROJE_UYE_ILISKISI': len(uyelikler),
+        'GOREVLER': tasks,
+        'GOREV_ATAMALARI': atama_sayisi,
+        'YORUMLAR': yorum_sayisi,
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PGYS sentetik veri üreteci')
+    parser.add_argument('--path', required=True, help='Oluşturulacak SQLite dosyası')
+    parser.add_argument('--preset', choices=PRESETS, help='Hazır ölçek; verilen sayılar ölçeği ezer')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--projects', type=int)
+    parser.add_argument('--tasks', type=int)
+    parser.add_argument('--members-per-project', type=int, default=5)
+    parser.add_argument('--assignments-per-task', type=int, default=1)
+    parser.add_argument('--comments-per-task', type=float)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--password', help='Kullanıcıların giriş şifresi (verilmezse giriş yapılamaz)')
+    parser.add_argument('--scrypt-n', type=int, default=14, help='Şifre hash maliyeti, 2^x (PGYS_SCRYPT_N ile aynı olmalı)')
+    args = parser.parse_args()
+
+    users, projects, tasks, comments = PRESETS.get(args.preset, (1000, 2000, 50000, 0.0))
+    backend = SQLiteBackend(args.path)
+    backend.initialize()
+    counts = populate(backend, args.users or users, args.projects or projects, args.tasks or tasks,
+                      args.members_per_project, args.assignments_per_task,
+                      args.comments_per_task if args.comments_per_task is not None else comments, args.seed,
+                      password_hash=hash_password(args.password, 2 ** args.scrypt_n) if args.password else None)
+    print(counts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""
+Görünürlük sorguları: eski (LEFT JOIN + OR + DISTINCT) ve yeni (UNION / IN) biçimlerin,
+V001 indeksleri olmadan ve uygulandıktan sonra karşılaştırılması. İndeksli aşamada
+görünürlük indeksinden (visibility.py) gelen sabit ProjeID listesiyle yazılmış sorgular
+da ölçülür; indeksin küme yükleme (yeniden kurma) maliyeti ayrıca raporlanır.
+
+Kullanım (backend dizininde):
+    python -m benchmarks.visibility_queries --users 2000 --projects 5000 --tasks 100000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+
+import queries
+from benchmarks.synthetic import populate
+from migrate import apply_migrations
+from storage import SQLiteBackend
+from visibility import VisibilityIndex
+
+# Yeniden yazım öncesi app.py sorguları (karşılaştırma için)
+LEGACY = {
+    'gorevler': ("""
+        SELECT DISTINCT g.GorevID, g.GorevAdi, g.Aciklama, g.TeslimTarihi,
+               g.ProjeID, p.ProjeAdi,
+               g.DurumID, d.DurumAdi,
+               g.OncelikID, o.OncelikAdi
+        FROM GOREVLER g
+        LEFT JOIN PROJELER p ON g.ProjeID = p.ProjeID
+        LEFT JOIN DURUMLAR d ON g.DurumID = d.DurumID
+        LEFT JOIN ONCELIKLER o ON g.OncelikID = o.OncelikID
+        LEFT JOIN GOREV_ATAMALARI ga ON g.GorevID = ga.GorevID
+        LEFT JOIN PROJE_UYE_ILISKISI pui ON g.ProjeID = pui.ProjeID
+        WHERE ga.KullaniciID = ? OR pui.KullaniciID = ? OR p.YoneticiID = ?
+        ORDER BY g.TeslimTarihi ASC
+    """, 3),
+    'projeler': ("""
+        SELECT DISTINCT p.ProjeID, p.ProjeAdi, p.BaslangicTarihi, p.BitisTarihi,
+               p.Butce, p.YoneticiID, k.Ad as YoneticiAd, k.Soyad as YoneticiSoyad
+        FROM PROJELER p
+        LEFT JOIN KULLANICILAR k ON p.YoneticiID = k.KullaniciID
+        LEFT JOIN PROJE_UYE_ILISKISI pui ON p.ProjeID = pui.ProjeID
+        WHERE p.YoneticiID = ? OR pui.KullaniciID = ?
+        ORDER BY p.BaslangicTarihi DESC
+    """, 2),
+    'ekip': ("""
+        SELECT DISTINCT k.KullaniciID, k.Ad, k.Soyad, k.Eposta, r.RolAdi
+        FROM KULLANICILAR k
+        LEFT JOIN PROJE_UYE_ILISKISI pui ON k.KullaniciID = pui.KullaniciID
+        LEFT JOIN ROLLER r ON pui.RolID = r.RolID
+        WHERE pui.ProjeID IN (
+            SELECT DISTINCT p.ProjeID
+            FROM PROJELER p
+            LEFT JOIN PROJE_UYE_ILISKISI pui2 ON p.ProjeID = pui2.ProjeID
+            WHERE p.YoneticiID = ? OR pui2.KullaniciID = ?
+        )
+        ORDER BY k.Ad, k.Soyad
+    """, 2),
+}
+
+CURRENT = {
+    'gorevler': (queries.GOREVLER_SELECT
+                 + f" WHERE g.GorevID IN ({queries.GORUNUR_GOREVLER})"
+                 + " ORDER BY g.TeslimTarihi ASC, g.GorevID ASC", 3),
+    'projeler': (queries.PROJELER_KULLANICI, 2),
+    'ekip': (queries.EKIP_KULLANICI, 2),
+}
+
+
+# Görünürlük indeksiyle: (kapsam sql'i, kapsam parametreleri, kullanici_id) -> (sql, params)
+INDEXED = {
+    'gorevler': lambda kapsam, ids, kullanici_id: (
+        queries.GOREVLER_SELECT
+        + f" WHERE g.GorevID IN ({queries.gorunur_gorevler(kapsam)})"
+        + " ORDER BY g.TeslimTarihi ASC, g.GorevID ASC", [kullanici_id] + ids),
+    'projeler': lambda kapsam, ids, kullanici_id: (queries.projeler_kullanici(kapsam), ids),
+    'ekip': lambda kapsam, ids, kullanici_id: (queries.ekip_kullanici(kapsam), ids),
+}
+
+
+def _time_indexed(conn, build, index, user_ids, repeat):
+    samples = []
+    rows = 0
+    for kullanici_id in user_ids:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            kapsam, ids = queries.id_list(index.projects(kullanici_id))
+            sql, params = build(kapsam, ids, kullanici_id)
+            result = conn.execute(sql, params).fetchall()
+            samples.append((time.perf_counter() - started) * 1000)
+        rows += len(result)
+    return {
+        'median_ms': round(statistics.median(samples), 2),
+        'max_ms': round(max(samples), 2),
+        'rows': rows,
+    }
+
+
+def _time_query(conn, sql, nparams, user_ids, repeat):
+    samples = []
+    rows = 0
+    for kullanici_id in user_ids:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = conn.execute(sql, (kullanici_id,) * nparams).fetchall()
+            samples.append((time.perf_counter() - started) * 1000)
+        rows += len(result)
+    return {
+        'median_ms': round(statistics.median(samples), 2),
+        'max_ms': round(max(samples), 2),
+        'rows': rows,
+    }
+
+
+def run(users, projects, tasks, sample_users, repeat, seed):
+    workdir = tempfile.mkdtemp(prefix='pgys-bench-')
+    try:
+        path = os.path.join(workdir, 'bench.db')
+        backend = SQLiteBackend(path)
+        backend.initialize(migrate=False)
+        counts = populate(backend, users=users, projects=projects, tasks=tasks, seed=seed)
+
+        # Yoğun (ilk %10) ve sıradan kullanıcılardan örnek al
+        user_ids = sorted({1, 2, max(1, users // 20), users // 2, users - 1, users})[:sample_users]
+
+        results = {'dataset': counts, 'users_sampled': user_ids, 'timings': {}}
+        for phase in ('indekssiz', 'V001_indeksli'):
+            if phase == 'V001_indeksli':
+                apply_migrations(backend, log=None)
+                conn = backend.connect()
+                conn.execute("ANALYZE")
+                conn.close()
+
+            conn = backend.connect()
+            try:
+                for endpoint in CURRENT:
+                    for label, sqls in (('eski', LEGACY), ('yeni', CURRENT)):
+                        sql, nparams = sqls[endpoint]
+                        results['timings'].setdefault(endpoint, {})[f'{label}/{phase}'] = \
+                            _time_query(conn, sql, nparams, user_ids, repeat)
+
+                if phase == 'V001_indeksli':
+                    @contextmanager
+                    def connection():
+                        yield conn
+
+                    index = VisibilityIndex(connection)
+                    for endpoint, build in INDEXED.items():
+                        results['timings'][endpoint][f'gorunurluk_indeksi/{phase}'] = \
+                            _time_indexed(conn, build, index, user_ids, repeat)
+                    results['visibility_index'] = index.stats()
+            finally:
+                conn.close()
+
+        # Eski ve yeni sorgular aynı satır sayısını döndürmeli
+        for endpoint, timings in results['timings'].items():
+            counts_seen = {t['rows'] for t in timings.values()}
+            if len(counts_seen) != 1:
+                raise AssertionError(f'{endpoint}: sorgular farklı sonuç döndürdü {timings}')
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Görünürlük sorgusu karşılaştırması')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--sample-users', type=int, default=6)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Sonucu JSON olarak yaz')
+    args = parser.parse_args()
+
+    results = run(args.users, args.projects, args.tasks, args.sample_users, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Veri seti: {results['dataset']}")
+    print(f"{'endpoint':<10} {'sorgu/indeks':<30} {'medyan ms':>10} {'max ms':>10} {'satır':>8}")
+    for endpoint, timings in results['timings'].items():
+        for label, t in timings.items():
+            print(f"{endpoint:<10} {label:<30} {t['median_ms']:>10} {t['max_ms']:>10} {t['rows']:>8}")
+    index = results['visibility_index']
+    print(f"Görünürlük indeksi: isabet oranı {index['hit_ratio']}, küme yükleme ort. "
+          f"{index['load_avg_ms']} ms / en çok {index['load_max_ms']} ms ({index['misses']} kullanıcı)")
+
+
+if __name__ == '__main__':
+    main()
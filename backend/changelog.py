@@ -0,0 +1,77 @@
+"""
+PGYS - Değişiklik Günlüğü (DEGISIKLIK_GUNLUGU)
+Yazma endpoint'leri değiştirdikleri PROJELER / GOREVLER / YORUMLAR kayıtlarını, aynı
+işlem (transaction) içinde bu tabloya yazar. /api/sync istemcinin son gördüğü konumdan
+(filigran) sonraki kayıtları okuyup sadece değişen satırları ve silinenlerin ID'lerini
+(tombstone) döndürür.
+
+Konum motor bazında farklıdır (bkz. storage.py changelog_*):
+- SQLite: DegisiklikID (tek yazıcı; kayıtlar commit sırasıyla numaralanır)
+- SQL Server: ROWVERSION; MIN_ACTIVE_ROWVERSION() altında kalanlar okunur, böylece
+  daha küçük numaralı ama henüz commit edilmemiş bir kayıt atlanmaz
+"""
+
+from collections import namedtuple
+
+# Islem kolonunun değerleri
+UPSERT = 'U'
+DELETE = 'D'
+# Kullanıcının görünür proje kümesi değişti (KayitID = KullaniciID); istemci baştan yükler
+VISIBILITY = 'V'
+
+GORUNURLUK = 'GORUNURLUK'
+
+Change = namedtuple('Change', 'position table kayit_id islem')
+
+
+def record(backend, cursor, table, changes):
+    """
+    Değişiklikleri günlüğe yazar; commit çağıranın sorumluluğundadır.
+    changes: (KayitID, Islem) demetleri
+    """
+    rows = [(table, kayit_id, islem) for kayit_id, islem in changes]
+    if rows:
+        backend.executemany(cursor, """
+            INSERT INTO DEGISIKLIK_GUNLUGU (Tablo, KayitID, Islem)
+            VALUES (?, ?, ?)
+        """, rows)
+
+
+def current_position(backend, cursor):
+    """Şu ana kadar okunabilir en son konum (kayıt yoksa 0)"""
+    sql = f"SELECT MAX({backend.changelog_position}) FROM DEGISIKLIK_GUNLUGU"
+    if backend.changelog_visible:
+        sql += f" WHERE {backend.changelog_visible}"
+    cursor.execute(sql)
+    row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+def read(backend, cursor, since, limit):
+    """
+    since'ten sonraki en fazla limit kaydı konum sırasıyla okur.
+    (değişiklikler, yeni filigran, devamı var mı) döndürür. Aynı kayda ait birden fazla
+    değişiklik sonuncusuna indirgenir.
+    """
+    filters = [backend.changelog_after]
+    if backend.changelog_visible:
+        filters.append(backend.changelog_visible)
+    cursor.execute(f"""
+        SELECT {backend.changelog_position} AS Konum, Tablo, KayitID, Islem
+        FROM DEGISIKLIK_GUNLUGU
+        WHERE {' AND '.join(filters)}
+        ORDER BY Konum
+        {backend.limit_clause}
+    """, (since, limit + 1))
+    rows = cursor.fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    watermark = int(rows[-1][0]) if rows else since
+
+    latest = {}
+    for row in rows:
+        change = Change(int(row[0]), row[1], row[2], row[3])
+        latest.pop((change.table, change.kayit_id), None)
+        latest[(change.table, change.kayit_id)] = change
+    return list(latest.values()), watermark, has_more
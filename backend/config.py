@@ -0,0 +1,24 @@
+"""
+PGYS - Veritabanı ve Bağlantı Havuzu Ayarları
+app.py ile komut satırı araçları (migrate.py, counters.py) aynı ayarları buradan okur;
+araçlar uygulamayı (havuz, önbellekler, arka plan thread'leri) kurmadan çalışır.
+"""
+
+import os
+
+DB_CONFIG = {
+    'server': 'localhost\\SQLEXPRESS',  #kendı server bılgınızı gıreceksınız
+    'database': 'PYTS',
+    'driver': '{ODBC Driver 17 for SQL Server}'
+}
+
+
+# Bağlantı havuzu ayarları (ortam değişkenleriyle değiştirilebilir)
+POOL_CONFIG = {
+    'min_size': int(os.environ.get('PGYS_POOL_MIN', 1)),
+    'max_size': int(os.environ.get('PGYS_POOL_MAX', 10)),
+    'timeout': float(os.environ.get('PGYS_POOL_TIMEOUT', 10)),
+    'max_idle': float(os.environ.get('PGYS_POOL_MAX_IDLE', 300)),
+    'max_lifetime': float(os.environ.get('PGYS_POOL_MAX_LIFETIME', 3600)),
+    'validate_after': float(os.environ.get('PGYS_POOL_VALIDATE_AFTER', 30)),
+}
@@ -0,0 +1,208 @@
+"""
+PGYS - Kullanıcı Sayaçları (KULLANICI_SAYACLARI)
+Kullanıcı başına proje üyeliği (PROJE_UYE_ILISKISI) ve görev ataması (GOREV_ATAMALARI)
+sayıları. Üyelik / atama yazmaları sayaçları aynı işlemde (transaction) günceller;
+/api/profil iki tabloyu JOIN + COUNT(DISTINCT) ile saymak yerine tek satır okur.
+
+Proje / görev silinince üyelikler ve atamalar CASCADE ile silinir. Çağıran etkilenen
+kullanıcıları silmeden ÖNCE okur (project_members / task_assignments), silmeden SONRA
+adjust ile düşürür.
+
+reconcile() sayaçları kaynak tablolarla karşılaştırır ve istenirse düzeltir.
+
+Kullanım (backend dizininde):
+    python -m counters           # sadece kontrol
+    python -m counters --fix     # farkları düzelt
+"""
+
+import argparse
+import time
+
+import queries
+
+PROJE = 'ProjeSayisi'
+GOREV = 'GorevSayisi'
+
+# Sayaç kolonu -> kaynak tablo
+_SOURCES = {PROJE: 'PROJE_UYE_ILISKISI', GOREV: 'GOREV_ATAMALARI'}
+
+_ACTUAL = {
+    column: f"(SELECT COUNT(*) FROM {table} src WHERE src.KullaniciID = {{alias}}.KullaniciID)"
+    for column, table in _SOURCES.items()
+}
+
+# Raporda listelenen en fazla hatalı kullanıcı
+REPORT_LIMIT = 100
+
+
+def _insert_missing(cursor, where, params):
+    """Satırı olmayan kullanıcıların sayaçlarını kaynak tablolardan sayarak ekler"""
+    cursor.execute(f"""
+        INSERT INTO KULLANICI_SAYACLARI (KullaniciID, ProjeSayisi, GorevSayisi)
+        SELECT k.KullaniciID, {_ACTUAL[PROJE].format(alias='k')}, {_ACTUAL[GOREV].format(alias='k')}
+        FROM KULLANICILAR k
+        WHERE {where}
+          AND NOT EXISTS (SELECT 1 FROM KULLANICI_SAYACLARI s WHERE s.KullaniciID = k.KullaniciID)
+    """, params)
+    return cursor.rowcount
+
+
+def adjust(backend, cursor, column, deltas):
+    """
+    Sayaçlara fark ekler; kaynak tabloya yazıldıktan SONRA, aynı işlemde çağrılır.
+    deltas: {KullaniciID: fark}. Satırı henüz olmayan kullanıcının satırı kaynak
+    tablolardan sayılarak eklenir (sayım bu işlemdeki yazmayı zaten içerir).
+    """
+    rows = [(delta, kullanici_id) for kullanici_id, delta in deltas.items() if delta]
+    if not rows:
+        return
+    backend.executemany(cursor, f"""
+        UPDATE KULLANICI_SAYACLARI SET {column} = {column} + ? WHERE KullaniciID = ?
+    """, rows)
+    id_sql, params = queries.id_list([kullanici_id for _, kullanici_id in rows])
+    _insert_missing(cursor, f"k.KullaniciID IN ({id_sql})", params)
+
+
+def project_members(cursor, proje_id):
+    """Projenin üyeleri için {KullaniciID: 1} (proje silinmeden önce okunur)"""
+    cursor.execute("SELECT KullaniciID FROM PROJE_UYE_ILISKISI WHERE ProjeID = ?", (proje_id,))
+    return {row[0]: 1 for row in cursor.fetchall()}
+
+
+def task_assignments(cursor, proje_id=None, gorev_ids=None):
+    """
+    Projedeki veya verilen görevlerdeki atamalar için {KullaniciID: atama sayısı}
+    (görevler silinmeden önce okunur)
+    """
+    if proje_id is not None:
+        where, params = "g.ProjeID = ?", [proje_id]
+    else:
+        id_sql, params = queries.id_list(gorev_ids)
+        where = f"ga.GorevID IN ({id_sql})"
+    cursor.execute(f"""
+        SELECT ga.KullaniciID, COUNT(*)
+        FROM GOREV_ATAMALARI ga
+        JOIN GOREVLER g ON g.GorevID = ga.GorevID
+        WHERE {where}
+        GROUP BY ga.KullaniciID
+    """, params)
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def negated(counts):
+    return {kullanici_id: -count for kullanici_id, count in counts.items()}
+
+
+def user_deleted(cursor, kullanici_id):
+    # SQLite'ta CASCADE de siler; yabancı anahtarı olmayan kurulumlar için açıkça silinir
+    cursor.execute("DELETE FROM KULLANICI_SAYACLARI WHERE KullaniciID = ?", (kullanici_id,))
+
+
+def read(cursor, kullanici_id):
+    """(ProjeSayisi, GorevSayisi); satır yoksa kaynak tablolardan sayılır"""
+    cursor.execute("""
+        SELECT ProjeSayisi, GorevSayisi FROM KULLANICI_SAYACLARI WHERE KullaniciID = ?
+    """, (kullanici_id,))
+    row = cursor.fetchone()
+    if row:
+        return row[0], row[1]
+    # Migration'dan sonra hiç üyeliği / ataması olmamış kullanıcı: iki indeksli sayım
+    cursor.execute(f"""
+        SELECT {_ACTUAL[PROJE].format(alias='k')}, {_ACTUAL[GOREV].format(alias='k')}
+        FROM KULLANICILAR k WHERE k.KullaniciID = ?
+    """, (kullanici_id,))
+    row = cursor.fetchone()
+    return (row[0], row[1]) if row else (0, 0)
+
+
+def reconcile(cursor, fix=False):
+    """
+    Sayaçları kaynak tablolarla karşılaştırır. fix=True ise hatalı satırları yeniden
+    sayar, eksik satırları ekler, silinmiş kullanıcılara ait satırları siler
+    (commit çağıranın sorumluluğundadır).
+    """
+    started = time.perf_counter()
+    cursor.execute(f"""
+        SELECT k.KullaniciID, s.KullaniciID AS SayacID, s.ProjeSayisi, s.GorevSayisi,
+               {_ACTUAL[PROJE].format(alias='k')} AS GercekProje,
+               {_ACTUAL[GOREV].format(alias='k')} AS GercekGorev
+        FROM KULLANICILAR k
+        LEFT JOIN KULLANICI_SAYACLARI s ON s.KullaniciID = k.KullaniciID
+    """)
+    checked = missing = 0
+    wrong = []
+    for row in cursor.fetchall():
+        checked += 1
+        if row[1] is None:
+            # Hiç üyeliği / ataması olmayan kullanıcının satırı olmayabilir (read 0 döner)
+            if row[4] or row[5]:
+                missing += 1
+        elif (row[2], row[3]) != (row[4], row[5]):
+            wrong.append({'KullaniciID': row[0],
+                          PROJE: row[2], 'GercekProjeSayisi': row[4],
+                          GOREV: row[3], 'GercekGorevSayisi': row[5]})
+
+    cursor.execute("""
+        SELECT COUNT(*) FROM KULLANICI_SAYACLARI s
+        WHERE NOT EXISTS (SELECT 1 FROM KULLANICILAR k WHERE k.KullaniciID = s.KullaniciID)
+    """)
+    orphaned = cursor.fetchone()[0]
+
+    if fix:
+        if wrong:
+            # Sayım UPDATE içinde tekrarlanır; kontrol ile düzeltme arasındaki yazmalar kaybolmaz
+            cursor.executemany(f"""
+                UPDATE KULLANICI_SAYACLARI
+                SET ProjeSayisi = {_ACTUAL[PROJE].format(alias='KULLANICI_SAYACLARI')},
+                    GorevSayisi = {_ACTUAL[GOREV].format(alias='KULLANICI_SAYACLARI')}
+                WHERE KullaniciID = ?
+            """, [(item['KullaniciID'],) for item in wrong])
+        if missing:
+            _insert_missing(cursor, f"({_ACTUAL[PROJE].format(alias='k')} > 0 "
+                                    f"OR {_ACTUAL[GOREV].format(alias='k')} > 0)", ())
+        if orphaned:
+            cursor.execute("""
+                DELETE FROM KULLANICI_SAYACLARI
+                WHERE NOT EXISTS (SELECT 1 FROM KULLANICILAR k
+                                  WHERE k.KullaniciID = KULLANICI_SAYACLARI.KullaniciID)
+            """)
+
+    return {
+        'kontrol_edilen': checked,
+        'hatali_sayisi': len(wrong),
+        'hatali': wrong[:REPORT_LIMIT],
+        'eksik': missing,
+        'sahipsiz': orphaned,
+        'duzeltildi': bool(fix and (wrong or missing or orphaned)),
+        'ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def main():
+    from config import DB_CONFIG
+    from storage import create_backend
+
+    parser = argparse.ArgumentParser(description='Kullanıcı sayaçlarını kaynak tablolarla karşılaştırır')
+    parser.add_argument('--fix', action='store_true', help='Farkları düzelt')
+    args = parser.parse_args()
+
+    backend = create_backend(DB_CONFIG)
+    backend.initialize()
+    conn = backend.connect()
+    try:
+        report = reconcile(conn.cursor(), fix=args.fix)
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"{report['kontrol_edilen']} kullanıcı kontrol edildi ({report['ms']} ms): "
+          f"{report['hatali_sayisi']} hatalı, {report['eksik']} eksik, {report['sahipsiz']} sahipsiz satır")
+    for item in report['hatali']:
+        print(f"  KullaniciID {item['KullaniciID']}: proje {item[PROJE]} -> {item['GercekProjeSayisi']}, "
+              f"görev {item[GOREV]} -> {item['GercekGorevSayisi']}")
+    if report['duzeltildi']:
+        print("✅ Sayaçlar düzeltildi")
+
+
+if __name__ == '__main__':
+    main()
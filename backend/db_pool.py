@@ -0,0 +1,289 @@
+"""
+PGYS - Veritabanı Bağlantı Havuzu
+Her istekte yeniden bağlanmak yerine bağlantıları tekrar kullanır
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolError(Exception):
+    """Havuzdan bağlantı alınamadığında fırlatılır"""
+
+
+class PoolTimeout(PoolError):
+    """Bekleme süresi içinde boş bağlantı bulunamadı"""
+
+
+class _PooledConnection:
+    """Havuzdaki bir bağlantı ve yaşam bilgileri"""
+
+    __slots__ = ('raw', 'created_at', 'last_used')
+
+    def __init__(self, raw):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    Thread-safe bağlantı havuzu.
+
+    connect_fn: yeni ham bağlantı döndüren fonksiyon
+    min_size / max_size: havuzda tutulacak en az / açılabilecek en çok bağlantı
+    timeout: boş bağlantı için en fazla bekleme süresi (saniye)
+    max_idle: bu süreden uzun boşta kalan bağlantılar kapatılır
+    max_lifetime: bu süreden eski bağlantılar yenilenir
+    validate_after: bu süreden uzun boşta kalan bağlantı verilmeden önce test edilir
+    wrap: verilirse connection() ham bağlantı yerine wrap(bağlantı) verir
+          (örn. metrics.Metrics.wrap; istek dışı işlerin ifadeleri de ölçülür)
+    """
+
+    def __init__(self, connect_fn, min_size=1, max_size=10, timeout=10.0,
+                 max_idle=300.0, max_lifetime=3600.0, validate_after=30.0,
+                 validate_query='SELECT 1', wrap=None):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError('Geçersiz havuz boyutu')
+
+        self._connect_fn = connect_fn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.validate_after = validate_after
+        self.validate_query = validate_query
+        self.wrap = wrap
+
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        # İstatistikler
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'validation_failures': 0,
+            'recycled': 0,
+        }
+
+    # ----------------------------------------
+    # Bağlantı yaşam döngüsü
+    # ----------------------------------------
+
+    def _open(self):
+        raw = self._connect_fn()
+        with self._cond:
+            self._stats['created'] += 1
+        return _PooledConnection(raw)
+
+    def _discard(self, pooled):
+        try:
+            pooled.raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats['closed'] += 1
+            self._cond.notify()
+
+    def _is_expired(self, pooled, now):
+        if self.max_lifetime and now - pooled.created_at > self.max_lifetime:
+            return True
+        return False
+
+    def _is_alive(self, pooled):
+        try:
+            cursor = pooled.raw.cursor()
+            cursor.execute(self.validate_query)
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _prune_idle(self, now):
+        """min_size üzerindeki uzun süre boşta kalmış bağlantıları ayırır (lock altında çağrılır)"""
+        stale = []
+        if not self.max_idle:
+            return stale
+        # En eski bağlantılar kuyruğun başında
+        while self._idle and self._size - len(stale) > self.min_size:
+            if now - self._idle[0].last_used <= self.max_idle:
+                break
+            stale.append(self._idle.popleft())
+        self._stats['recycled'] += len(stale)
+        return stale
+
+    def acquire(self):
+        """Havuzdan bir bağlantı alır; gerekirse yenisini açar veya bekler"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+
+        while True:
+            pooled = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise PoolError('Bağlantı havuzu kapatıldı')
+
+                stale = self._prune_idle(time.monotonic())
+                if self._idle:
+                    # En son kullanılan bağlantı (LIFO) - sıcak bağlantılar tercih edilir
+                    pooled = self._idle.pop()
+                    self._in_use += 1
+                elif self._size < self.max_size:
+                    self._size += 1
+                    self._in_use += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f'{self.timeout} saniye içinde boş bağlantı bulunamadı'
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+
+            for old in stale:
+                self._discard(old)
+
+            if create:
+                try:
+                    pooled = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._in_use -= 1
+                        self._cond.notify()
+                    raise
+            elif pooled is not None:
+                now = time.monotonic()
+                if self._is_expired(pooled, now):
+                    self._release_slot_and_discard(pooled, recycled=True)
+                    continue
+                if (self.validate_after is not None
+                        and now - pooled.last_used >= self.validate_after
+                        and not self._is_alive(pooled)):
+                    with self._cond:
+                        self._stats['validation_failures'] += 1
+                    self._release_slot_and_discard(pooled)
+                    continue
+            else:
+                continue
+
+            wait_time = time.monotonic() - started
+            with self._cond:
+                self._stats['checkouts'] += 1
+                if waited:
+                    self._stats['waits'] += 1
+                self._stats['wait_time_total'] += wait_time
+                self._stats['wait_time_max'] = max(self._stats['wait_time_max'], wait_time)
+            return pooled
+
+    def _release_slot_and_discard(self, pooled, recycled=False):
+        with self._cond:
+            self._in_use -= 1
+            if recycled:
+                self._stats['recycled'] += 1
+        self._discard(pooled)
+
+    def release(self, pooled, broken=False):
+        """Bağlantıyı havuza geri verir; açık işlem varsa geri alır"""
+        if not broken:
+            try:
+                pooled.raw.rollback()
+            except Exception:
+                broken = True
+
+        if broken or self._closed or self._is_expired(pooled, time.monotonic()):
+            self._release_slot_and_discard(pooled, recycled=not broken)
+            return
+
+        pooled.last_used = time.monotonic()
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, wrap=True):
+        """
+        Bağlantıyı with bloğu boyunca ödünç verir; blok nasıl biterse bitsin
+        bağlantı havuza geri döner. wrap=False ham bağlantıyı verir
+        """
+        pooled = self.acquire()
+        try:
+            yield self.wrap(pooled.raw) if wrap and self.wrap else pooled.raw
+        finally:
+            # Kopmuş bağlantılar release içindeki rollback sırasında ayıklanır
+            self.release(pooled)
+
+    def warm_up(self):
+        """min_size kadar bağlantıyı önceden açar"""
+        opened = []
+        try:
+            while True:
+                with self._cond:
+                    if self._size >= self.min_size:
+                        break
+                    self._size += 1
+                try:
+                    opened.append(self._open())
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                    raise
+        finally:
+            now = time.monotonic()
+            with self._cond:
+                for pooled in opened:
+                    pooled.last_used = now
+                    self._idle.append(pooled)
+                self._cond.notify_all()
+
+    def close(self):
+        """Tüm boştaki bağlantıları kapatır; kullanımdakiler iade edilince kapanır"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self):
+        """Havuz istatistiklerini döndürür"""
+        with self._cond:
+            checkouts = self._stats['checkouts']
+            return {
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': checkouts,
+                'waits': self._stats['waits'],
+                'timeouts': self._stats['timeouts'],
+                'wait_time_total_ms': round(self._stats['wait_time_total'] * 1000, 3),
+                'wait_time_avg_ms': round(self._stats['wait_time_total'] * 1000 / checkouts, 3)
+                if checkouts else 0.0,
+                'wait_time_max_ms': round(self._stats['wait_time_max'] * 1000, 3),
+                'created': self._stats['created'],
+                'closed': self._stats['closed'],
+                'recycled': self._stats['recycled'],
+                'validation_failures': self._stats['validation_failures'],
+            }
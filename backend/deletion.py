@@ -0,0 +1,264 @@
+"""
+PGYS - Arka Plan Silme İşleri (SILME_ISLERI)
+Proje / kullanıcı silme endpoint'leri kaydı tek bir DELETE ile CASCADE'e bırakmaz: büyük
+bir projede bu, GOREVLER / GOREV_ATAMALARI / YORUMLAR üzerinde kilitleri uzun süre tutup
+diğer istekleri bekletir. Bunun yerine:
+
+1. Endpoint kısa bir işlemde kaydı yumuşak siler (Silindi = 1; okumalar hemen gizler),
+   az sayıdaki üyelik satırını siler ve create_job ile iş kaydını yazar.
+2. DeletionJobs bağlı satırları batch_size'lık parçalarla, her parça ayrı ve kısa bir
+   işlemde siler; parçalar arasında pause kadar bekler. En son kaydın kendisi silinir.
+
+İlerleme (aşama, silinen / tahmini toplam satır) iş kaydında tutulur ve
+/api/silme-isleri/<id> ile okunur. Sunucu yeniden başlarsa yarım kalan işler start()
+ile kaldıkları yerden sürer; hata veren iş retry ile yeniden kuyruğa alınır (her parça
+bağımsızdır, tekrar çalıştırmak güvenlidir).
+"""
+
+import queue
+import threading
+import time
+from datetime import datetime
+
+import changelog
+import counters
+import queries
+
+PROJE = 'proje'
+KULLANICI = 'kullanici'
+
+BEKLIYOR = 'bekliyor'
+CALISIYOR = 'calisiyor'
+TAMAMLANDI = 'tamamlandi'
+HATA = 'hata'
+
+
+def _now():
+    return datetime.now().isoformat(sep=' ', timespec='seconds')
+
+
+def _select_ids(backend, cursor, sql, params, limit):
+    cursor.execute(f"{sql} {backend.limit_clause}", [*params, limit])
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _delete_ids(cursor, table, id_column, ids, where='', params=()):
+    id_sql, id_params = queries.id_list(ids)
+    cursor.execute(f"DELETE FROM {table} WHERE {id_column} IN ({id_sql}){where}", [*id_params, *params])
+
+
+# ========================================
+# Aşamalar: her çağrı bir parçayı siler ve (tablo, silinen ID'ler, sayaç farkları) döndürür
+# ========================================
+
+def _project_comments(backend, cursor, proje_id, limit):
+    ids = _select_ids(backend, cursor, """
+        SELECT y.YorumID FROM YORUMLAR y
+        JOIN GOREVLER g ON g.GorevID = y.GorevID
+        WHERE g.ProjeID = ? ORDER BY y.YorumID
+    """, (proje_id,), limit)
+    if ids:
+        _delete_ids(cursor, 'YORUMLAR', 'YorumID', ids)
+    return 'YORUMLAR', ids, {}
+
+
+def _project_tasks(backend, cursor, proje_id, limit):
+    ids = _select_ids(backend, cursor, """
+        SELECT GorevID FROM GOREVLER WHERE ProjeID = ? ORDER BY GorevID
+    """, (proje_id,), limit)
+    atamalar = {}
+    if ids:
+        atamalar = counters.task_assignments(cursor, gorev_ids=ids)
+        _delete_ids(cursor, 'GOREV_ATAMALARI', 'GorevID', ids)
+        # Bu arada eklenmiş yorumlar varsa CASCADE ile gider (parça başına az sayıda)
+        _delete_ids(cursor, 'GOREVLER', 'GorevID', ids)
+        counters.adjust(backend, cursor, counters.GOREV, counters.negated(atamalar))
+        changelog.record(backend, cursor, 'GOREVLER', [(g, changelog.DELETE) for g in ids])
+    return 'GOREVLER', ids, atamalar
+
+
+def _project_row(backend, cursor, proje_id, limit):
+    cursor.execute("DELETE FROM PROJELER WHERE ProjeID = ? AND Silindi = 1", (proje_id,))
+    return 'PROJELER', [proje_id] if cursor.rowcount else [], {}
+
+
+def _user_comments(backend, cursor, kullanici_id, limit):
+    ids = _select_ids(backend, cursor, """
+        SELECT YorumID FROM YORUMLAR WHERE KullaniciID = ? ORDER BY YorumID
+    """, (kullanici_id,), limit)
+    if ids:
+        _delete_ids(cursor, 'YORUMLAR', 'YorumID', ids)
+    return 'YORUMLAR', ids, {}
+
+
+def _user_assignments(backend, cursor, kullanici_id, limit):
+    # Kullanıcının sayaç satırı en son silinir; ara farklar yazılmaz
+    ids = _select_ids(backend, cursor, """
+        SELECT GorevID FROM GOREV_ATAMALARI WHERE KullaniciID = ? ORDER BY GorevID
+    """, (kullanici_id,), limit)
+    if ids:
+        _delete_ids(cursor, 'GOREV_ATAMALARI', 'GorevID', ids, " AND KullaniciID = ?", (kullanici_id,))
+    return 'GOREV_ATAMALARI', ids, {}
+
+
+def _user_row(backend, cursor, kullanici_id, limit):
+    counters.user_deleted(cursor, kullanici_id)
+    cursor.execute("DELETE FROM KULLANICILAR WHERE KullaniciID = ? AND Silindi = 1", (kullanici_id,))
+    return 'KULLANICILAR', [kullanici_id] if cursor.rowcount else [], {}
+
+
+STEPS = {
+    PROJE: (('yorumlar', _project_comments), ('gorevler', _project_tasks), ('proje', _project_row)),
+    KULLANICI: (('yorumlar', _user_comments), ('atamalar', _user_assignments), ('kullanici', _user_row)),
+}
+
+# Tahmini toplam satır (ilerleme yüzdesi için); kaydın kendisi +1
+_TOTALS = {
+    PROJE: """
+        SELECT (SELECT COUNT(*) FROM YORUMLAR y JOIN GOREVLER g ON g.GorevID = y.GorevID WHERE g.ProjeID = ?)
+             + (SELECT COUNT(*) FROM GOREVLER WHERE ProjeID = ?) + 1
+    """,
+    KULLANICI: """
+        SELECT (SELECT COUNT(*) FROM YORUMLAR WHERE KullaniciID = ?)
+             + (SELECT COUNT(*) FROM GOREV_ATAMALARI WHERE KullaniciID = ?) + 1
+    """,
+}
+
+
+def create_job(backend, cursor, tur, hedef_id):
+    """Yumuşak silmeyle aynı işlemde iş kaydını yazar ve IsID döndürür (commit çağıranda)"""
+    cursor.execute("""
+        INSERT INTO SILME_ISLERI (Tur, HedefID, Durum, Olusturma) VALUES (?, ?, ?, ?)
+    """, (tur, hedef_id, BEKLIYOR, _now()))
+    return backend.last_insert_id(cursor)
+
+
+JOB_SELECT = """
+    SELECT IsID, Tur, HedefID, Durum, Asama, Toplam, Silinen, Hata, Olusturma, Guncelleme, Bitis
+    FROM SILME_ISLERI
+"""
+
+
+class DeletionJobs:
+    """
+    Silme işlerini tek bir arka plan thread'inde sırayla çalıştırır.
+
+    connection_fn: havuzdan bağlantı ödünç veren context manager (her parça ayrı alır)
+    batch_size: bir işlemde silinecek en çok satır
+    pause: parçalar arası bekleme (sn)
+    on_batch: her parçanın commit'inden sonra on_batch(tablo, ids, sayaç farkları)
+    """
+
+    def __init__(self, backend, connection_fn, batch_size=500, pause=0.05, on_batch=None):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.pause = pause
+        self.on_batch = on_batch
+        self._connection_fn = connection_fn
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'batches': 0, 'rows': 0}
+
+    def start(self):
+        """Yarım kalmış işleri kuyruğa alır"""
+        with self._connection_fn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT IsID FROM SILME_ISLERI WHERE Durum IN (?, ?) ORDER BY IsID",
+                           (BEKLIYOR, CALISIYOR))
+            pending = [row[0] for row in cursor.fetchall()]
+        for is_id in pending:
+            self.submit(is_id)
+        return len(pending)
+
+    def submit(self, is_id):
+        """İşi kuyruğa alır (commit'ten SONRA çağrılır)"""
+        with self._lock:
+            self._stats['submitted'] += 1
+            self._queue.put(is_id)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name='pgys-deletion', daemon=True)
+                self._thread.start()
+
+    def retry(self, is_id):
+        """Hata vermiş işi yeniden kuyruğa alır; iş hata durumunda değilse False"""
+        with self._connection_fn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE SILME_ISLERI SET Durum = ?, Guncelleme = ? WHERE IsID = ? AND Durum = ?",
+                           (BEKLIYOR, _now(), is_id, HATA))
+            updated = cursor.rowcount
+            conn.commit()
+        if updated:
+            self.submit(is_id)
+        return bool(updated)
+
+    def _worker(self):
+        while True:
+            is_id = self._queue.get()
+            try:
+                self.run(is_id)
+            except Exception as e:
+                # run() hataları kendisi yazar; buraya düşen hata thread'i durdurmasın
+                print(f"❌ Silme işi {is_id} çalıştırılamadı: {str(e)}")
+
+    def _update(self, is_id, **fields):
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._connection_fn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"UPDATE SILME_ISLERI SET {assignments}, Guncelleme = ? WHERE IsID = ?",
+                           [*fields.values(), _now(), is_id])
+            conn.commit()
+
+    def run(self, is_id):
+        """İşi bitene (veya hata verene) kadar bu thread'de çalıştırır"""
+        try:
+            with self._connection_fn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(JOB_SELECT + " WHERE IsID = ?", (is_id,))
+                job = cursor.fetchone()
+                if job is None or job.Durum == TAMAMLANDI:
+                    return
+                toplam = job.Toplam
+                if toplam is None:
+                    cursor.execute(_TOTALS[job.Tur], (job.HedefID, job.HedefID))
+                    toplam = cursor.fetchone()[0]
+                conn.rollback()
+
+            self._update(is_id, Durum=CALISIYOR, Toplam=toplam, Hata=None)
+            for asama, step in STEPS[job.Tur]:
+                self._update(is_id, Asama=asama)
+                while True:
+                    with self._connection_fn() as conn:
+                        cursor = conn.cursor()
+                        table, ids, deltas = step(self.backend, cursor, job.HedefID, self.batch_size)
+                        if ids:
+                            cursor.execute("""
+                                UPDATE SILME_ISLERI SET Silinen = Silinen + ?, Guncelleme = ? WHERE IsID = ?
+                            """, (len(ids), _now(), is_id))
+                        conn.commit()
+                    if ids:
+                        with self._lock:
+                            self._stats['batches'] += 1
+                            self._stats['rows'] += len(ids)
+                        if self.on_batch:
+                            self.on_batch(table, ids, deltas)
+                    if len(ids) < self.batch_size:
+                        break
+                    # Bekleyen isteklere kilitleri alma fırsatı
+                    time.sleep(self.pause)
+            self._update(is_id, Durum=TAMAMLANDI, Asama=None, Bitis=_now())
+            with self._lock:
+                self._stats['completed'] += 1
+        except Exception as e:
+            with self._lock:
+                self._stats['failed'] += 1
+            print(f"❌ Silme işi {is_id} başarısız: {str(e)}")
+            try:
+                self._update(is_id, Durum=HATA, Hata=str(e)[:1000])
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {'pending': self._queue.qsize(), 'batch_size': self.batch_size, **self._stats}
+
@@ -0,0 +1,292 @@
+"""
+PGYS - Detay Önbelleği (read-through)
+Tekil kayıt endpoint'leri (proje, görev, kullanıcı, profil) yanıtlarını varlık + ID
+anahtarıyla önbellekten verir; ıska durumunda handler veritabanından okuyup put eder.
+
+- Süreç içi depo LRU + TTL ile sınırlıdır. PGYS_DETAIL_CACHE_REDIS_URL verilirse
+  depo Redis olur; birden fazla süreç aynı önbelleği görür ve geçersizlemeler
+  hepsine yansır. Redis'te sınır TTL ve sunucunun maxmemory politikasıdır.
+- Kayıtlar bağlı oldukları başka varlıklarla etiketlenir (örn. görev -> projesi, çünkü
+  yanıtta ProjeAdi var). invalidate(PROJE, 5) hem 'proje:5' kaydını hem de 'proje:5'
+  etiketli görevleri düşürür.
+- Geçersizleme kısa ömürlü bir mezar taşı (lease) bırakır: yazmadan önce veritabanını
+  okuyup yazmadan sonra put etmeye çalışan istek eski veriyi önbelleğe koyamaz.
+
+Yazma endpoint'leri commit'ten SONRA geçersizler (versioning.py ile aynı kural).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # redis isteğe bağlı
+    redis = None
+
+KULLANICI = 'kullanici'
+PROJE = 'proje'
+GOREV = 'gorev'
+PROFIL = 'profil'
+# DURUMLAR / ONCELIKLER adları görev yanıtlarında (bkz. lookups.py)
+TANIMLAR = 'tanimlar'
+
+
+def tag(entity, id_value):
+    return f'{entity}:{id_value}'
+
+
+# ========================================
+# Depolar
+# ========================================
+
+class LocalBackend:
+    """Süreç içi, thread-safe LRU + TTL depo"""
+
+    name = 'local'
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        # anahtar -> (değer, bitiş, etiketler); sıra = son kullanım
+        self._entries = OrderedDict()
+        self._tagged = {}
+        # anahtar / etiket -> mezar taşı bitişi
+        self._tombstones = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for name in entry[2]:
+                keys = self._tagged.get(name)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tagged[name]
+
+    def _blocked(self, names, now):
+        for name in names:
+            until = self._tombstones.get(name)
+            if until is not None:
+                if until > now:
+                    return True
+                del self._tombstones[name]
+        return False
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def add(self, key, value, ttl, tags, lease):
+        if self.max_entries <= 0:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if self._blocked((key, *tags), now):
+                return False
+            self._remove(key)
+            self._entries[key] = (value, now + ttl, tuple(tags))
+            for name in tags:
+                self._tagged.setdefault(name, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def delete(self, keys, tags, lease):
+        with self._lock:
+            now = time.monotonic()
+            if len(self._tombstones) > 4096:
+                self._tombstones = {name: until for name, until in self._tombstones.items() if until > now}
+            keys = set(keys)
+            for name in tags:
+                keys.update(self._tagged.get(name, ()))
+                self._tombstones[name] = now + lease
+            for key in keys:
+                self._remove(key)
+                self._tombstones[key] = now + lease
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tagged.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'max_entries': self.max_entries,
+                    'evictions': self.evictions}
+
+
+class RedisBackend:
+    """Süreçler arası ortak depo; değerler JSON olarak saklanır"""
+
+    name = 'redis'
+    TOMBSTONE = b'\x00'
+
+    def __init__(self, url, prefix='pgys:detay:'):
+        if redis is None:
+            raise RuntimeError('PGYS_DETAIL_CACHE_REDIS_URL için redis paketi gerekli (pip install redis)')
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, key):
+        return f'{self.prefix}k:{key}'
+
+    def _tag(self, name):
+        return f'{self.prefix}e:{name}'
+
+    def _tomb(self, name):
+        return f'{self.prefix}m:{name}'
+
+    def get(self, key):
+        raw = self._client.get(self._key(key))
+        if raw is None or raw == self.TOMBSTONE:
+            return None
+        return json.loads(raw)
+
+    def add(self, key, value, ttl, tags, lease):
+        if tags and self._client.exists(*[self._tomb(name) for name in tags]):
+            return False
+        ttl_ms = int(ttl * 1000)
+        # NX: geçersizlemenin bıraktığı mezar taşının üzerine yazılmaz
+        if not self._client.set(self._key(key), json.dumps(value, default=str), px=ttl_ms, nx=True):
+            return False
+        if tags:
+            pipe = self._client.pipeline()
+            for name in tags:
+                pipe.sadd(self._tag(name), key)
+                pipe.pexpire(self._tag(name), ttl_ms)
+            pipe.execute()
+        return True
+
+    def delete(self, keys, tags, lease):
+        keys = set(keys)
+        if tags:
+            pipe = self._client.pipeline()
+            for name in tags:
+                pipe.smembers(self._tag(name))
+            for members in pipe.execute():
+                keys.update(member.decode() for member in members)
+        lease_ms = int(lease * 1000)
+        pipe = self._client.pipeline()
+        for key in keys:
+            pipe.set(self._key(key), self.TOMBSTONE, px=lease_ms)
+        for name in tags:
+            pipe.delete(self._tag(name))
+            pipe.set(self._tomb(name), 1, px=lease_ms)
+        pipe.execute()
+        return len(keys)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=f'{self.prefix}*', count=1000):
+            self._client.delete(key)
+
+    def stats(self):
+        return {}
+
+
+# ========================================
+# Önbellek
+# ========================================
+
+class DetailCache:
+    """
+    Varlık + ID anahtarlı read-through önbellek.
+
+    ttl: kaydın en uzun ömrü (sn); geçersizleme kaçırılsa bile veri en fazla bu kadar eskir
+    lease: geçersizlemeden sonra aynı anahtara put edilemeyen süre (sn)
+    Depo hatalarında önbellek atlanır (istek veritabanından yanıtlanır).
+    """
+
+    def __init__(self, backend=None, ttl=300.0, lease=10.0, enabled=True):
+        self.backend = backend if backend is not None else LocalBackend()
+        self.ttl = ttl
+        self.lease = lease
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stored': 0, 'rejected': 0,
+                       'invalidated': 0, 'errors': 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def get(self, entity, id_value):
+        """Önbellekteki yanıt; yoksa None (çağıran veritabanından okuyup put eder)"""
+        if not self.enabled:
+            return None
+        try:
+            value = self.backend.get(tag(entity, id_value))
+        except Exception as e:
+            self._count('errors')
+            print(f"⚠️ Detay önbelleği okunamadı: {str(e)}")
+            return None
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def put(self, entity, id_value, value, tags=()):
+        """
+        Yanıtı saklar. tags: yanıtın içerdiği başka varlıklar, örn. tag(PROJE, 5).
+        Saklanan değer değiştirilmemelidir (süreç içi depoda istekler aynı nesneyi paylaşır).
+        """
+        if not self.enabled:
+            return
+        try:
+            stored = self.backend.add(tag(entity, id_value), value, self.ttl, tags, self.lease)
+        except Exception as e:
+            self._count('errors')
+            print(f"⚠️ Detay önbelleğine yazılamadı: {str(e)}")
+            return
+        self._count('stored' if stored else 'rejected')
+
+    def invalidate(self, entity, *ids):
+        """Varlığın kayıtlarını ve bu varlıkla etiketlenmiş kayıtları düşürür"""
+        self.invalidate_tags(*[tag(entity, id_value) for id_value in ids if id_value is not None])
+
+    def invalidate_tags(self, *names):
+        if not self.enabled or not names:
+            return
+        try:
+            self._count('invalidated', self.backend.delete(names, names, self.lease))
+        except Exception as e:
+            self._count('errors')
+            print(f"⚠️ Detay önbelleği geçersizlenemedi: {str(e)}")
+
+    def clear(self):
+        if self.enabled:
+            self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._stats)
+        lookups = counts['hits'] + counts['misses']
+        return {
+            'enabled': self.enabled,
+            'backend': self.backend.name,
+            'ttl': self.ttl,
+            'hit_ratio': round(counts['hits'] / lookups, 3) if lookups else None,
+            **counts,
+            **self.backend.stats(),
+        }
+
+
+def cache_from_env():
+    """PGYS_DETAIL_CACHE_* ortam değişkenlerinden DetailCache kurar"""
+    url = os.environ.get('PGYS_DETAIL_CACHE_REDIS_URL')
+    backend = (RedisBackend(url) if url
+               else LocalBackend(max_entries=int(os.environ.get('PGYS_DETAIL_CACHE_MAX', 10000))))
+    return DetailCache(backend,
+                       ttl=float(os.environ.get('PGYS_DETAIL_CACHE_TTL', 300)),
+                       lease=float(os.environ.get('PGYS_DETAIL_CACHE_LEASE', 10)),
+                       enabled=os.environ.get('PGYS_DETAIL_CACHE', '1') != '0')
@@ -0,0 +1,256 @@
+"""
+PGYS - Olay Yayını (Server-Sent Events)
+Yazma endpoint'leri commit'ten sonra proje / görev / yorum değişikliklerini EventHub'a
+yayınlar; hub olayı, projeyi görebilen abonelere (bkz. visibility.py) dağıtır.
+İstemci olayı alınca /api/sync ile sadece değişen kayıtları indirir.
+
+Her olay bir kez SSE metnine çevrilir ve tüm abonelerde aynı bytes nesnesi paylaşılır.
+Abone başına en fazla max_pending olay bekler; aşılırsa (yavaş tüketici) abonelik
+kapatılır, istemci yeniden bağlanıp /api/sync ile eksiğini tamamlar.
+
+İki abone türü vardır:
+- ThreadSubscriber: WSGI (thread başına bağlantı) yanıt üreteci için
+- AsyncSubscriber: ASGI modunda olay döngüsünde tutulan bağlantılar için; binlerce
+  boşta bağlantı thread tutmaz
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class HubFull(Exception):
+    """Abone sınırına ulaşıldı"""
+
+
+def format_event(event_id, name, payload):
+    """SSE çerçevesi (bytes)"""
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return f"id: {event_id}\nevent: {name}\ndata: {data}\n\n".encode()
+
+
+HEARTBEAT = b': ping\n\n'
+
+
+class Subscriber:
+    """Sınırlı olay kuyruğu; alt sınıflar bekleme / uyandırma yöntemini belirler"""
+
+    def __init__(self, kullanici_id, max_pending):
+        self.kullanici_id = kullanici_id
+        self.max_pending = max_pending
+        self.closed = False
+        self.dropped = False
+        self._pending = deque()
+        self._lock = threading.Lock()
+
+    def deliver(self, frame):
+        """Olayı kuyruğa ekler (yayıncı thread'inde çalışır); kuyruk doluysa aboneyi düşürür"""
+        with self._lock:
+            if self.closed:
+                return False
+            if len(self._pending) >= self.max_pending:
+                self.closed = self.dropped = True
+                self._pending.clear()
+            else:
+                self._pending.append(frame)
+        self._wake()
+        return not self.dropped
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            self._pending.clear()
+        self._wake()
+
+    def _drain(self):
+        with self._lock:
+            frames = list(self._pending)
+            self._pending.clear()
+            return frames
+
+    def _wake(self):
+        raise NotImplementedError
+
+
+class ThreadSubscriber(Subscriber):
+    def __init__(self, kullanici_id, max_pending):
+        super().__init__(kullanici_id, max_pending)
+        self._event = threading.Event()
+
+    def _wake(self):
+        self._event.set()
+
+    def wait(self, timeout):
+        """Yeni olayları bekler; zaman aşımında boş liste döner"""
+        self._event.wait(timeout)
+        self._event.clear()
+        return self._drain()
+
+
+class AsyncSubscriber(Subscriber):
+    def __init__(self, kullanici_id, max_pending, loop):
+        super().__init__(kullanici_id, max_pending)
+        self._loop = loop
+        self._event = asyncio.Event()
+
+    def _wake(self):
+        # Yayıncı bir handler thread'idir; olay döngüsüne güvenli biçimde haber verilir
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # Olay döngüsü kapanmış
+            pass
+
+    async def wait(self, timeout):
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._event.clear()
+        return self._drain()
+
+
+class EventHub:
+    """
+    Süreç içi olay dağıtıcısı.
+
+    visible_fn: kullanici_id -> görünür ProjeID kümesi veya bilinmiyorsa None; veritabanına
+    gitmemeli (yayın handler thread'inde yapılır)
+    load_fn: kullanici_id -> kümeyi veritabanından yükler. Kümesi bilinmeyen (indeksten
+    çıkarılmış / temizlenmiş) abonelere proje olayı gönderilmez; küme arka planda yüklenir
+    ve aboneye 'gorunurluk' olayı gider, istemci listelerini /api/sync ile tamamlar
+    max_subscribers: aynı anda açık olabilecek en çok abonelik
+    max_pending: abone başına bekleyebilecek en çok olay
+    heartbeat: bu kadar saniye olay yoksa yorum satırı gönderilir (ölü bağlantı tespiti, proxy)
+    """
+
+    def __init__(self, visible_fn, load_fn=None, max_subscribers=10000, max_pending=256,
+                 heartbeat=15.0):
+        self.visible_fn = visible_fn
+        self.load_fn = load_fn
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self.heartbeat = heartbeat
+        self._subscribers = set()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._loading = set()
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pgys-events')
+        self._stats = {'published': 0, 'delivered': 0, 'dropped_slow': 0, 'rejected': 0,
+                       'skipped_unknown': 0, 'reloads': 0, 'reload_failures': 0}
+
+    def _add(self, subscriber):
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self._stats['rejected'] += 1
+                raise HubFull('Olay aboneliği sınırına ulaşıldı')
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def subscribe(self, kullanici_id):
+        return self._add(ThreadSubscriber(kullanici_id, self.max_pending))
+
+    def subscribe_async(self, kullanici_id, loop):
+        return self._add(AsyncSubscriber(kullanici_id, self.max_pending, loop))
+
+    def unsubscribe(self, subscriber):
+        subscriber.close()
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, name, payload, proje_id=None, kullanici_id=None):
+        """
+        Olayı ilgili abonelere dağıtır (commit'ten SONRA çağrılmalı).
+        kullanici_id verilirse sadece o kullanıcının aboneliklerine, aksi halde
+        proje_id'yi görebilen abonelere gider.
+        """
+        frame = format_event(next(self._ids), name, payload)
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._stats['published'] += 1
+
+        delivered = dropped = skipped = 0
+        unknown = set()
+        for subscriber in subscribers:
+            if kullanici_id is not None:
+                if subscriber.kullanici_id != kullanici_id:
+                    continue
+            elif subscriber.kullanici_id is None:
+                continue
+            else:
+                visible = self.visible_fn(subscriber.kullanici_id)
+                if visible is None:
+                    # Görebildiği doğrulanmadan proje olayı gönderilmez
+                    skipped += 1
+                    unknown.add(subscriber.kullanici_id)
+                    continue
+                if proje_id not in visible:
+                    continue
+            if subscriber.deliver(frame):
+                delivered += 1
+            elif subscriber.dropped:
+                dropped += 1
+                with self._lock:
+                    self._subscribers.discard(subscriber)
+
+        with self._lock:
+            self._stats['delivered'] += delivered
+            self._stats['dropped_slow'] += dropped
+            self._stats['skipped_unknown'] += skipped
+        for uid in unknown:
+            self._schedule_reload(uid)
+        return delivered
+
+    def _schedule_reload(self, kullanici_id):
+        """Kümeyi yayın thread'ini bekletmeden yükler; kullanıcı başına tek yükleme"""
+        if self.load_fn is None:
+            return
+        with self._lock:
+            if kullanici_id in self._loading:
+                return
+            self._loading.add(kullanici_id)
+        try:
+            self._loader.submit(self._reload, kullanici_id)
+        except RuntimeError:
+            # Kapatılmış
+            with self._lock:
+                self._loading.discard(kullanici_id)
+
+    def _reload(self, kullanici_id):
+        try:
+            self.load_fn(kullanici_id)
+        except Exception as e:
+            with self._lock:
+                self._stats['reload_failures'] += 1
+            print(f"⚠️ Olay abonesinin görünürlük kümesi yüklenemedi ({kullanici_id}): {str(e)}")
+            return
+        finally:
+            with self._lock:
+                self._loading.discard(kullanici_id)
+        with self._lock:
+            self._stats['reloads'] += 1
+        # Kaçırılmış olaylar olabilir; istemci listelerini yeniden yükler
+        self.publish('gorunurluk', {'KullaniciID': kullanici_id}, kullanici_id=kullanici_id)
+
+    def stream(self, subscriber):
+        """WSGI yanıt üreteci: olayları ve heartbeat'leri yazar, bitince aboneliği kapatır"""
+        try:
+            yield b'retry: 3000\n\n'
+            while not subscriber.closed:
+                frames = subscriber.wait(self.heartbeat)
+                yield b''.join(frames) if frames else HEARTBEAT
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'reloading': len(self._loading),
+                'max_subscribers': self.max_subscribers,
+                'max_pending': self.max_pending,
+                **self._stats,
+            }
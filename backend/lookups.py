@@ -0,0 +1,149 @@
+"""
+PGYS - Tanım Tabloları Önbelleği
+DURUMLAR, ONCELIKLER ve ROLLER çok küçük ve nadiren değişen tablolardır.
+Açılışta belleğe yüklenir; handler'lar sadece ID'leri çeker ve adları buradan çözer.
+
+Adlar serileştirme sırasında, istek havuzdan bağlantı tutarken çözülür. Bu yüzden süresi
+dolan önbellek istek içinde değil arka plan thread'inde yenilenir; yenileme sürerken
+(veya başarısız olursa) eski değerler sunulmaya devam eder.
+"""
+
+import threading
+import time
+
+# ad -> (tablo, ID kolonu, ad kolonu)
+LOOKUP_TABLES = {
+    'durumlar': ('DURUMLAR', 'DurumID', 'DurumAdi'),
+    'oncelikler': ('ONCELIKLER', 'OncelikID', 'OncelikAdi'),
+    'roller': ('ROLLER', 'RolID', 'RolAdi'),
+}
+
+
+class LookupCache:
+    """
+    TTL'li, elle yenilenebilen tanım tablosu önbelleği.
+
+    connection_fn: with bloğunda bağlantı veren fonksiyon (örn. ConnectionPool.connection)
+    ttl: bu süre (saniye) dolunca bir sonraki erişimde arka planda yeniden yüklenir
+    miss_refresh_interval: bilinmeyen ID görülünce en fazla bu sıklıkla yeniden yüklenir
+    retry_interval: başarısız yüklemeden sonra yeni deneme için beklenecek süre (saniye)
+    on_change: yeniden yüklemede içerik değiştiyse çağrılır
+    """
+
+    def __init__(self, connection_fn, ttl=600.0, miss_refresh_interval=5.0, retry_interval=30.0,
+                 on_change=None):
+        self._connection_fn = connection_fn
+        self.ttl = ttl
+        self.miss_refresh_interval = miss_refresh_interval
+        self.retry_interval = retry_interval
+        self.on_change = on_change
+
+        self._tables = None
+        self._loaded_at = 0.0
+        self._retry_at = 0.0
+        self._reloading = False
+        # _lock yüklemeleri sıralar; okuyucular sadece hiç yüklenmemişse bekler
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._stats = {'loads': 0, 'load_failures': 0, 'hits': 0, 'misses': 0}
+
+    def load(self):
+        """Tüm tanım tablolarını veritabanından okuyup önbelleği atomik olarak değiştirir"""
+        tables = {}
+        try:
+            with self._connection_fn() as conn:
+                cursor = conn.cursor()
+                for name, (table, id_col, name_col) in LOOKUP_TABLES.items():
+                    cursor.execute(f"SELECT {id_col}, {name_col} FROM {table} ORDER BY {id_col}")
+                    tables[name] = {row[0]: row[1] for row in cursor.fetchall()}
+        except Exception:
+            self._stats['load_failures'] += 1
+            self._retry_at = time.monotonic() + self.retry_interval
+            raise
+
+        changed = self._tables is not None and tables != self._tables
+        self._tables = tables
+        self._loaded_at = time.monotonic()
+        self._stats['loads'] += 1
+        if changed and self.on_change:
+            self.on_change()
+        return tables
+
+    def refresh(self):
+        """Önbelleği hemen yeniden yükler"""
+        with self._lock:
+            return self.load()
+
+    def _reload_async(self):
+        """Arka planda tek bir yenileme başlatır; sürüyorsa veya bekleme süresindeyse bir şey yapmaz"""
+        with self._state_lock:
+            if self._reloading or time.monotonic() < self._retry_at:
+                return
+            self._reloading = True
+        threading.Thread(target=self._background_load, name='pgys-lookups', daemon=True).start()
+
+    def _background_load(self):
+        try:
+            with self._lock:
+                self.load()
+        except Exception as e:
+            # Eski değerlerle devam edilir; retry_interval sonra yeniden denenir
+            print(f"⚠️ Tanım tabloları yenilenemedi: {str(e)}")
+        finally:
+            with self._state_lock:
+                self._reloading = False
+
+    def _current(self):
+        tables = self._tables
+        if tables is not None:
+            if time.monotonic() - self._loaded_at >= self.ttl:
+                self._reload_async()
+            return tables
+
+        # Hiç yüklenmemiş (açılışta veritabanına ulaşılamadı): tek bir thread yükler
+        with self._lock:
+            if self._tables is not None:
+                return self._tables
+            if time.monotonic() < self._retry_at:
+                raise RuntimeError('Tanım tabloları yüklenemedi')
+            return self.load()
+
+    def name(self, table, id_value, default=''):
+        """Tanım tablosundaki ID'nin adını döndürür"""
+        if id_value is None:
+            return default
+        names = self._current()[table]
+        value = names.get(id_value)
+        if value is not None:
+            self._stats['hits'] += 1
+            return value
+
+        # Yeni eklenmiş bir tanım olabilir; sık olmamak kaydıyla arka planda yeniden yükle
+        self._stats['misses'] += 1
+        if time.monotonic() - self._loaded_at >= self.miss_refresh_interval:
+            self._reload_async()
+        return default
+
+    def durum_adi(self, durum_id):
+        return self.name('durumlar', durum_id)
+
+    def oncelik_adi(self, oncelik_id):
+        return self.name('oncelikler', oncelik_id)
+
+    def rol_adi(self, rol_id, default='Ekip Üyesi'):
+        return self.name('roller', rol_id, default)
+
+    def as_dict(self):
+        """Tanım tablolarını API yanıtı biçiminde döndürür"""
+        result = {}
+        for name, (_, id_col, name_col) in LOOKUP_TABLES.items():
+            result[name] = [{id_col: k, name_col: v} for k, v in self._current()[name].items()]
+        return result
+
+    def stats(self):
+        return {
+            **self._stats,
+            'age_seconds': round(time.monotonic() - self._loaded_at, 1) if self._tables else None,
+            'ttl_seconds': self.ttl,
+            'reloading': self._reloading,
+        }
@@ -0,0 +1,397 @@
+"""
+PGYS - İstek Metrikleri (Prometheus metin biçimi)
+Her istek için route (URL kuralı) ve method bazında şunlar tutulur:
+- toplam süre ve aşama süreleri (connect / execute / fetch / serialize / other) histogramları
+- durum koduna göre istek sayısı, 5xx hata sayısı
+- dönen satır, çalışan sorgu ve yanıt bayt sayıları
+
+Aşama süreleri istek thread'ine ait bir listede toplanır (kilit yok); istek bitince
+tek bir kilitle route'un histogramlarına işlenir. Veritabanı süreleri db_connection'ın
+verdiği bağlantıyı saran TimedConnection / TimedCursor ile ölçülür; istek dışında
+(arka plan işleri) bağlantı sadece sorgu profili (profiling.py) açıksa sarılır.
+
+Not: Akışlı yanıtlarda (streaming.py, SSE) gövde handler döndükten sonra yazıldığı için
+süreye dahil değildir. Paralel çalışan bölümlerin (bkz. /api/bootstrap) veritabanı
+süreleri toplanır; toplam duvar saatinden büyük olabilir, 'other' sıfırın altına inmez.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import request
+
+# Saniye cinsinden histogram sınırları (+Inf ayrıca eklenir)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PHASES = ('connect', 'execute', 'fetch', 'serialize')
+
+# İstek durumu listesindeki alanlar
+CONNECT, EXECUTE, FETCH, SERIALIZE, ROWS, QUERIES, STARTED = range(7)
+
+
+def _new_state(started=0.0):
+    return [0.0, 0.0, 0.0, 0.0, 0, 0, started]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class Histogram:
+    """Kümülatif olmayan kova sayıları; dışa aktarılırken kümülatife çevrilir"""
+
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size):
+        self.counts = [0] * (size + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, buckets, value):
+        self.counts[bisect_left(buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _RouteStats:
+    __slots__ = ('duration', 'phases', 'statuses', 'errors', 'rows', 'queries', 'bytes')
+
+    def __init__(self, size):
+        self.duration = Histogram(size)
+        self.phases = {phase: Histogram(size) for phase in PHASES + ('other',)}
+        self.statuses = {}
+        self.errors = 0
+        self.rows = 0
+        self.queries = 0
+        self.bytes = 0
+
+
+class TimedCursor:
+    """
+    execute / fetch sürelerini ve dönen satır sayısını istek durumuna (state) ekler;
+    profiler verilmişse her ifadeyi ona da kaydeder (bkz. profiling.py). İkisi de None olabilir.
+    """
+
+    __slots__ = ('_cursor', '_state', '_profiler', '_entry')
+
+    def __init__(self, cursor, state, profiler=None):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_state', state)
+        object.__setattr__(self, '_profiler', profiler)
+        object.__setattr__(self, '_entry', None)
+
+    def _executed(self, args, elapsed, many):
+        state = self._state
+        if state is not None:
+            state[EXECUTE] += elapsed
+            state[QUERIES] += 1
+        if self._profiler is not None:
+            params = args[1] if len(args) == 2 else args[1:]
+            if many:
+                params = params[0] if params else ()
+            rowcount = getattr(self._cursor, 'rowcount', None)
+            object.__setattr__(self, '_entry', self._profiler.record(args[0], params, elapsed, rowcount))
+
+    def _fetched(self, elapsed, count):
+        state = self._state
+        if state is not None:
+            state[FETCH] += elapsed
+            state[ROWS] += count
+        if self._entry is not None:
+            self._profiler.add_rows(self._entry, count)
+
+    def execute(self, *args):
+        started = time.perf_counter()
+        try:
+            self._cursor.execute(*args)
+        finally:
+            self._executed(args, time.perf_counter() - started, False)
+        return self
+
+    def executemany(self, *args):
+        started = time.perf_counter()
+        try:
+            self._cursor.executemany(*args)
+        finally:
+            self._executed(args, time.perf_counter() - started, True)
+        return self
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(time.perf_counter() - started, 0 if row is None else 1)
+        return row
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(time.perf_counter() - started, len(rows))
+        return rows
+
+    def fetchmany(self, *args):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(*args)
+        self._fetched(time.perf_counter() - started, len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # örn. pyodbc fast_executemany
+        setattr(self._cursor, name, value)
+
+
+class TimedConnection:
+    """cursor() TimedCursor döndürür; commit süresi execute aşamasına eklenir"""
+
+    __slots__ = ('_conn', '_state', '_profiler')
+
+    def __init__(self, conn, state, profiler=None):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_state', state)
+        object.__setattr__(self, '_profiler', profiler)
+
+    def cursor(self):
+        return TimedCursor(self._conn.cursor(), self._state, self._profiler)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            self._conn.commit()
+        finally:
+            if self._state is not None:
+                self._state[EXECUTE] += time.perf_counter() - started
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
+class Metrics:
+    """
+    Route bazında istek metrikleri.
+
+    buckets: histogram sınırları (saniye)
+    enabled: False ise install() kanca kurmaz; istek süreleri ölçülmez
+    profiler: verilirse sarılan bağlantılardaki her ifade ona da kaydedilir (profiling.QueryProfiler)
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, enabled=True, profiler=None):
+        self.buckets = tuple(sorted(buckets))
+        self.enabled = enabled
+        self.profiler = profiler
+        self._routes = {}
+        self._collectors = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # ---------- istek durumu ----------
+
+    def state(self):
+        """Bu thread'de ölçülen isteğin durum listesi (yoksa None)"""
+        return getattr(self._local, 'state', None)
+
+    def begin(self):
+        self._local.state = _new_state(time.perf_counter())
+
+    def clear(self):
+        self._local.state = None
+
+    def add(self, index, seconds):
+        state = self.state()
+        if state is not None:
+            state[index] += seconds
+
+    @contextmanager
+    def child(self):
+        """
+        Başka bir thread'de istek adına yapılan iş için with bloğu boyunca yeni durum
+        başlatır; iş bitince isteğin thread'i merge() ile durumu kendi durumuna ekler.
+        """
+        state = _new_state()
+        self._local.state = state
+        try:
+            yield state
+        finally:
+            self._local.state = None
+
+    def merge(self, child):
+        state = self.state()
+        if state is not None and child is not None:
+            for index in (CONNECT, EXECUTE, FETCH, SERIALIZE, ROWS, QUERIES):
+                state[index] += child[index]
+
+    def wrap(self, conn):
+        """
+        Bağlantıyı ölçülen isteğe ve sorgu profiline bağlar; ikisi de yoksa
+        (istek dışı ve profil kapalı) bağlantı olduğu gibi döner
+        """
+        state = self.state()
+        if conn is None or (state is None and self.profiler is None):
+            return conn
+        return TimedConnection(conn, state, self.profiler)
+
+    def end(self, route, method, status, response_bytes):
+        """İsteği route'un metriklerine işler"""
+        state = self.state()
+        if state is None:
+            return
+        self._local.state = None
+        total = time.perf_counter() - state[STARTED]
+        other = max(total - state[CONNECT] - state[EXECUTE] - state[FETCH] - state[SERIALIZE], 0.0)
+        buckets = self.buckets
+        key = (route, method)
+
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = _RouteStats(len(buckets))
+            stats.duration.observe(buckets, total)
+            phases = stats.phases
+            phases['connect'].observe(buckets, state[CONNECT])
+            phases['execute'].observe(buckets, state[EXECUTE])
+            phases['fetch'].observe(buckets, state[FETCH])
+            phases['serialize'].observe(buckets, state[SERIALIZE])
+            phases['other'].observe(buckets, other)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if status >= 500:
+                stats.errors += 1
+            stats.rows += state[ROWS]
+            stats.queries += state[QUERIES]
+            if response_bytes:
+                stats.bytes += response_bytes
+
+    # ---------- Flask entegrasyonu ----------
+
+    def install(self, app):
+        """İstek kancalarını kurar ve JSON yanıt üretimini serialize aşaması olarak ölçer"""
+        if not self.enabled:
+            return
+
+        @app.before_request
+        def _metrics_begin():
+            self.begin()
+
+        @app.after_request
+        def _metrics_end(response):
+            rule = request.url_rule.rule if request.url_rule is not None else 'eslesmeyen'
+            self.end(rule, request.method, response.status_code,
+                     None if response.is_streamed else response.content_length)
+            return response
+
+        @app.teardown_request
+        def _metrics_clear(exc):
+            self.clear()
+
+        response = app.json.response
+
+        def timed_response(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return response(*args, **kwargs)
+            finally:
+                self.add(SERIALIZE, time.perf_counter() - started)
+
+        app.json.response = timed_response
+
+    def register_collector(self, fn):
+        """
+        Dışa aktarma anında çağrılan ek metrik kaynağı (havuz, olaylar...).
+        fn: [(ad, tür, açıklama, [(etiketler, değer), ...]), ...] döndürür
+        """
+        self._collectors.append(fn)
+
+    # ---------- dışa aktarma ----------
+
+    def render(self):
+        """Prometheus metin biçimi (text/plain; version=0.0.4)"""
+        with self._lock:
+            routes = [(key, self._snapshot(stats)) for key, stats in sorted(self._routes.items())]
+
+        lines = []
+
+        def header(name, kind, text):
+            lines.append(f'# HELP {name} {text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def histogram(name, labels, hist):
+            counts, total, count = hist
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{_labels(labels + [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_bucket{_labels(labels + [("le", "+Inf")])} {count}')
+            lines.append(f'{name}_sum{_labels(labels)} {_number(total)}')
+            lines.append(f'{name}_count{_labels(labels)} {count}')
+
+        header('pgys_http_request_duration_seconds', 'histogram', 'İstek süresi (handler + serileştirme)')
+        for (route, method), snap in routes:
+            histogram('pgys_http_request_duration_seconds', [('route', route), ('method', method)],
+                      snap['duration'])
+
+        header('pgys_http_request_phase_seconds', 'histogram',
+               'İstek başına aşama süresi: connect, execute, fetch, serialize, other')
+        for (route, method), snap in routes:
+            for phase, hist in snap['phases'].items():
+                histogram('pgys_http_request_phase_seconds',
+                          [('route', route), ('method', method), ('phase', phase)], hist)
+
+        header('pgys_http_requests_total', 'counter', 'Durum koduna göre istek sayısı')
+        for (route, method), snap in routes:
+            for status, n in sorted(snap['statuses'].items()):
+                lines.append(f'pgys_http_requests_total'
+                             f'{_labels([("route", route), ("method", method), ("status", status)])} {n}')
+
+        for name, field, text in (
+            ('pgys_http_request_errors_total', 'errors', '5xx ile biten istek sayısı'),
+            ('pgys_db_queries_total', 'queries', 'Çalışan sorgu sayısı'),
+            ('pgys_db_rows_total', 'rows', 'Veritabanından okunan satır sayısı'),
+            ('pgys_http_response_bytes_total', 'bytes', 'Yanıt gövdesi bayt sayısı (akışlı yanıtlar hariç)'),
+        ):
+            header(name, 'counter', text)
+            for (route, method), snap in routes:
+                lines.append(f'{name}{_labels([("route", route), ("method", method)])} {snap[field]}')
+
+        for collector in self._collectors:
+            for name, kind, text, samples in collector():
+                header(name, kind, text)
+                for labels, value in samples:
+                    lines.append(f'{name}{_labels(labels) if labels else ""} {_number(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _snapshot(stats):
+        def copy(hist):
+            return list(hist.counts), hist.sum, hist.count
+
+        return {
+            'duration': copy(stats.duration),
+            'phases': {phase: copy(hist) for phase, hist in stats.phases.items()},
+            'statuses': dict(stats.statuses),
+            'errors': stats.errors,
+            'rows': stats.rows,
+            'queries': stats.queries,
+            'bytes': stats.bytes,
+        }
@@ -0,0 +1,123 @@
+"""
+PGYS - Şema Migration Aracı
+migrations/<motor>/V<sürüm>__<ad>.sql dosyalarını sırayla uygular ve
+uygulananları SCHEMA_MIGRATIONS tablosunda tutar.
+
+Kullanım (backend dizininde):
+    python migrate.py            # bekleyen migration'ları uygular
+    python migrate.py --status   # durum listesi
+"""
+
+import argparse
+import os
+import re
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+_FILE_RE = re.compile(r'^V(\d+)__(\w+)\.sql$')
+_GO_RE = re.compile(r'^\s*GO\s*$', re.IGNORECASE | re.MULTILINE)
+
+_TRACKING_TABLE = {
+    'mssql': """
+        IF OBJECT_ID('SCHEMA_MIGRATIONS', 'U') IS NULL
+            CREATE TABLE SCHEMA_MIGRATIONS (
+                Surum INT PRIMARY KEY,
+                Ad NVARCHAR(200) NOT NULL,
+                UygulanmaTarihi DATETIME NOT NULL DEFAULT GETDATE()
+            )
+    """,
+    'sqlite': """
+        CREATE TABLE IF NOT EXISTS SCHEMA_MIGRATIONS (
+            Surum INTEGER PRIMARY KEY,
+            Ad TEXT NOT NULL,
+            UygulanmaTarihi TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+}
+
+
+def available_migrations(dialect):
+    """Motor için tanımlı migration'ları (sürüm, ad, dosya yolu) olarak sürüm sırasıyla döndürür"""
+    directory = os.path.join(MIGRATIONS_DIR, dialect)
+    found = []
+    for filename in os.listdir(directory):
+        match = _FILE_RE.match(filename)
+        if match:
+            found.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    return sorted(found)
+
+
+def _split_statements(dialect, script):
+    if dialect == 'mssql':
+        # SQL Server betikleri GO satırlarıyla ayrılır
+        return [part.strip() for part in _GO_RE.split(script) if part.strip()]
+    return [script]
+
+
+def applied_versions(conn, dialect):
+    cursor = conn.cursor()
+    cursor.execute(_TRACKING_TABLE[dialect])
+    conn.commit()
+    cursor.execute("SELECT Surum FROM SCHEMA_MIGRATIONS")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_migrations(backend, log=print):
+    """Bekleyen migration'ları uygular; uygulanan sürüm listesini döndürür"""
+    dialect = backend.name
+    conn = backend.connect()
+    applied = []
+    try:
+        done = applied_versions(conn, dialect)
+        for version, name, path in available_migrations(dialect):
+            if version in done:
+                continue
+            with open(path, encoding='utf-8') as f:
+                script = f.read()
+
+            cursor = conn.cursor()
+            if dialect == 'sqlite':
+                conn.executescript(script)
+            else:
+                for statement in _split_statements(dialect, script):
+                    cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO SCHEMA_MIGRATIONS (Surum, Ad) VALUES (?, ?)", (version, name)
+            )
+            conn.commit()
+            applied.append(version)
+            if log:
+                log(f"✅ Migration uygulandı: V{version:03d} {name}")
+    finally:
+        conn.close()
+    return applied
+
+
+def main():
+    from config import DB_CONFIG
+    from storage import create_backend
+
+    parser = argparse.ArgumentParser(description='PGYS şema migration aracı')
+    parser.add_argument('--status', action='store_true', help='Sadece durumu göster')
+    args = parser.parse_args()
+
+    backend = create_backend(DB_CONFIG)
+    # Gömülü motorda temel şema yoksa kurulur; migration'lar aşağıda, günlükle uygulanır
+    backend.initialize(migrate=False)
+    if args.status:
+        conn = backend.connect()
+        try:
+            done = applied_versions(conn, backend.name)
+        finally:
+            conn.close()
+        for version, name, _ in available_migrations(backend.name):
+            state = 'uygulandı' if version in done else 'bekliyor'
+            print(f"V{version:03d} {name}: {state}")
+        return
+
+    if not apply_migrations(backend):
+        print("ℹ️ Bekleyen migration yok")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+-- V001: Kullanıcı bazlı görünürlük sorguları için indeksler
+-- (bkz. queries.py: GORUNUR_PROJELER / GORUNUR_GOREVLER)
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_GOREV_ATAMALARI_KullaniciID')
+    CREATE INDEX IX_GOREV_ATAMALARI_KullaniciID
+        ON GOREV_ATAMALARI (KullaniciID) INCLUDE (GorevID);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PROJE_UYE_ILISKISI_KullaniciID_ProjeID')
+    CREATE INDEX IX_PROJE_UYE_ILISKISI_KullaniciID_ProjeID
+        ON PROJE_UYE_ILISKISI (KullaniciID, ProjeID) INCLUDE (RolID);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PROJELER_YoneticiID')
+    CREATE INDEX IX_PROJELER_YoneticiID
+        ON PROJELER (YoneticiID);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_GOREVLER_ProjeID_TeslimTarihi')
+    CREATE INDEX IX_GOREVLER_ProjeID_TeslimTarihi
+        ON GOREVLER (ProjeID, TeslimTarihi);
+GO
+
+-- GET /api/gorevler keyset sayfalaması (TeslimTarihi, GorevID) için
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_GOREVLER_TeslimTarihi_GorevID')
+    CREATE INDEX IX_GOREVLER_TeslimTarihi_GorevID
+        ON GOREVLER (TeslimTarihi, GorevID);
+GO
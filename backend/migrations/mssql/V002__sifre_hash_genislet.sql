@@ -0,0 +1,8 @@
+-- V002: SifreHash kolonunu tuzlu KDF biçimleri için genişlet
+-- (bkz. passwords.py: "scrypt$n$r$p$tuz$özet", "pbkdf2_sha256$tur$tuz$özet")
+-- Eski 64 karakterlik SHA-256 değerleri olduğu gibi kalır; girişte yeni biçime yükseltilir.
+
+-- COL_LENGTH NVARCHAR(MAX) için -1 döner; o kolon zaten yeterince geniş, kısaltılmamalı
+IF COL_LENGTH('KULLANICILAR', 'SifreHash') BETWEEN 0 AND 509
+    ALTER TABLE KULLANICILAR ALTER COLUMN SifreHash NVARCHAR(255) NOT NULL;
+GO
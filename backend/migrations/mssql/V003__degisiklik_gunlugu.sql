@@ -0,0 +1,19 @@
+-- V003: Delta senkronizasyonu için değişiklik günlüğü (bkz. changelog.py, /api/sync)
+-- Islem: 'U' ekleme / güncelleme, 'D' silme, 'V' kullanıcının görünürlüğü değişti
+-- Filigran Surum (ROWVERSION) kolonudur; okuma MIN_ACTIVE_ROWVERSION() ile sınırlanır.
+
+IF OBJECT_ID('DEGISIKLIK_GUNLUGU', 'U') IS NULL
+    CREATE TABLE DEGISIKLIK_GUNLUGU (
+        DegisiklikID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        Tablo NVARCHAR(30) NOT NULL,
+        KayitID INT NOT NULL,
+        Islem CHAR(1) NOT NULL,
+        Tarih DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+        Surum ROWVERSION NOT NULL
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_DEGISIKLIK_GUNLUGU_Surum')
+    CREATE UNIQUE INDEX IX_DEGISIKLIK_GUNLUGU_Surum
+        ON DEGISIKLIK_GUNLUGU (Surum) INCLUDE (Tablo, KayitID, Islem);
+GO
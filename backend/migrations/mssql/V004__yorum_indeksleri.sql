@@ -0,0 +1,8 @@
+-- V004: Yorum listesi keyset sayfalaması ve yorum özetleri için indeks
+-- GET /api/yorumlar/gorev/<id>: WHERE GorevID = ? ORDER BY Tarih DESC, YorumID DESC
+-- GET /api/yorumlar/ozet: GorevID bazında COUNT(*) / MAX(Tarih) sadece indeksten okunur
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_YORUMLAR_GorevID_Tarih_YorumID')
+    CREATE INDEX IX_YORUMLAR_GorevID_Tarih_YorumID
+        ON YORUMLAR (GorevID, Tarih DESC, YorumID DESC) INCLUDE (KullaniciID);
+GO
@@ -0,0 +1,20 @@
+-- V005: Kullanıcı başına proje üyeliği / görev ataması sayaçları (bkz. counters.py)
+-- Üyelik ve atama yazmaları sayaçları aynı işlemde günceller; /api/profil buradan okur.
+-- Mevcut kullanıcıların sayaçları kaynak tablolardan doldurulur.
+
+IF OBJECT_ID('KULLANICI_SAYACLARI', 'U') IS NULL
+    CREATE TABLE KULLANICI_SAYACLARI (
+        KullaniciID INT NOT NULL PRIMARY KEY
+            REFERENCES KULLANICILAR(KullaniciID) ON DELETE CASCADE,
+        ProjeSayisi INT NOT NULL DEFAULT 0,
+        GorevSayisi INT NOT NULL DEFAULT 0
+    );
+GO
+
+INSERT INTO KULLANICI_SAYACLARI (KullaniciID, ProjeSayisi, GorevSayisi)
+SELECT k.KullaniciID,
+       (SELECT COUNT(*) FROM PROJE_UYE_ILISKISI pui WHERE pui.KullaniciID = k.KullaniciID),
+       (SELECT COUNT(*) FROM GOREV_ATAMALARI ga WHERE ga.KullaniciID = k.KullaniciID)
+FROM KULLANICILAR k
+WHERE NOT EXISTS (SELECT 1 FROM KULLANICI_SAYACLARI s WHERE s.KullaniciID = k.KullaniciID);
+GO
@@ -0,0 +1,31 @@
+-- V006: Büyük proje / kullanıcı silmeleri için yumuşak silme ve arka plan işleri (bkz. deletion.py)
+-- Silindi = 1 olan kayıt okumalarda hemen gizlenir; bağlı satırlar SILME_ISLERI'ndeki
+-- iş tarafından kısa işlemlerle parça parça silinir, en son kaydın kendisi silinir.
+
+IF COL_LENGTH('PROJELER', 'Silindi') IS NULL
+    ALTER TABLE PROJELER ADD Silindi BIT NOT NULL CONSTRAINT DF_PROJELER_Silindi DEFAULT 0;
+GO
+
+IF COL_LENGTH('KULLANICILAR', 'Silindi') IS NULL
+    ALTER TABLE KULLANICILAR ADD Silindi BIT NOT NULL CONSTRAINT DF_KULLANICILAR_Silindi DEFAULT 0;
+GO
+
+IF OBJECT_ID('SILME_ISLERI', 'U') IS NULL
+    CREATE TABLE SILME_ISLERI (
+        IsID INT IDENTITY(1,1) PRIMARY KEY,
+        Tur NVARCHAR(20) NOT NULL,
+        HedefID INT NOT NULL,
+        Durum NVARCHAR(20) NOT NULL DEFAULT 'bekliyor',
+        Asama NVARCHAR(30) NULL,
+        Toplam INT NULL,
+        Silinen INT NOT NULL DEFAULT 0,
+        Hata NVARCHAR(1000) NULL,
+        Olusturma DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+        Guncelleme DATETIME2 NULL,
+        Bitis DATETIME2 NULL
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SILME_ISLERI_Durum')
+    CREATE INDEX IX_SILME_ISLERI_Durum ON SILME_ISLERI (Durum);
+GO
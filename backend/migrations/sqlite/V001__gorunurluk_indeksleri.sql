@@ -0,0 +1,18 @@
+-- V001: Kullanıcı bazlı görünürlük sorguları için indeksler
+-- (bkz. queries.py: GORUNUR_PROJELER / GORUNUR_GOREVLER)
+
+CREATE INDEX IF NOT EXISTS IX_GOREV_ATAMALARI_KullaniciID
+    ON GOREV_ATAMALARI (KullaniciID, GorevID);
+
+CREATE INDEX IF NOT EXISTS IX_PROJE_UYE_ILISKISI_KullaniciID_ProjeID
+    ON PROJE_UYE_ILISKISI (KullaniciID, ProjeID);
+
+CREATE INDEX IF NOT EXISTS IX_PROJELER_YoneticiID
+    ON PROJELER (YoneticiID);
+
+CREATE INDEX IF NOT EXISTS IX_GOREVLER_ProjeID_TeslimTarihi
+    ON GOREVLER (ProjeID, TeslimTarihi);
+
+-- GET /api/gorevler keyset sayfalaması (TeslimTarihi, GorevID) için
+CREATE INDEX IF NOT EXISTS IX_GOREVLER_TeslimTarihi_GorevID
+    ON GOREVLER (TeslimTarihi, GorevID);
@@ -0,0 +1,4 @@
+-- V002: SifreHash kolonunu tuzlu KDF biçimleri için genişlet
+-- SQLite'ta TEXT kolonların uzunluk sınırı yok; sürüm numaraları motorlar arasında
+-- aynı kalsın diye boş migration.
+SELECT 1;
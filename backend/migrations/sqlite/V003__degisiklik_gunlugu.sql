@@ -0,0 +1,10 @@
+-- V003: Delta senkronizasyonu için değişiklik günlüğü (bkz. changelog.py, /api/sync)
+-- Islem: 'U' ekleme / güncelleme, 'D' silme, 'V' kullanıcının görünürlüğü değişti
+
+CREATE TABLE IF NOT EXISTS DEGISIKLIK_GUNLUGU (
+    DegisiklikID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Tablo TEXT NOT NULL,
+    KayitID INTEGER NOT NULL,
+    Islem TEXT NOT NULL,
+    Tarih TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,16 @@
+-- V005: Kullanıcı başına proje üyeliği / görev ataması sayaçları (bkz. counters.py)
+-- Üyelik ve atama yazmaları sayaçları aynı işlemde günceller; /api/profil buradan okur.
+-- Mevcut kullanıcıların sayaçları kaynak tablolardan doldurulur.
+
+CREATE TABLE IF NOT EXISTS KULLANICI_SAYACLARI (
+    KullaniciID INTEGER PRIMARY KEY REFERENCES KULLANICILAR(KullaniciID) ON DELETE CASCADE,
+    ProjeSayisi INTEGER NOT NULL DEFAULT 0,
+    GorevSayisi INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO KULLANICI_SAYACLARI (KullaniciID, ProjeSayisi, GorevSayisi)
+SELECT k.KullaniciID,
+       (SELECT COUNT(*) FROM PROJE_UYE_ILISKISI pui WHERE pui.KullaniciID = k.KullaniciID),
+       (SELECT COUNT(*) FROM GOREV_ATAMALARI ga WHERE ga.KullaniciID = k.KullaniciID)
+FROM KULLANICILAR k
+WHERE NOT EXISTS (SELECT 1 FROM KULLANICI_SAYACLARI s WHERE s.KullaniciID = k.KullaniciID);
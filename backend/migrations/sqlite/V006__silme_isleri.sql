@@ -0,0 +1,22 @@
+-- V006: Büyük proje / kullanıcı silmeleri için yumuşak silme ve arka plan işleri (bkz. deletion.py)
+-- Silindi = 1 olan kayıt okumalarda hemen gizlenir; bağlı satırlar SILME_ISLERI'ndeki
+-- iş tarafından kısa işlemlerle parça parça silinir, en son kaydın kendisi silinir.
+
+ALTER TABLE PROJELER ADD COLUMN Silindi INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE KULLANICILAR ADD COLUMN Silindi INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS SILME_ISLERI (
+    IsID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Tur TEXT NOT NULL,
+    HedefID INTEGER NOT NULL,
+    Durum TEXT NOT NULL DEFAULT 'bekliyor',
+    Asama TEXT,
+    Toplam INTEGER,
+    Silinen INTEGER NOT NULL DEFAULT 0,
+    Hata TEXT,
+    Olusturma TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    Guncelleme TEXT,
+    Bitis TEXT
+);
+
+CREATE INDEX IF NOT EXISTS IX_SILME_ISLERI_Durum ON SILME_ISLERI (Durum);
@@ -0,0 +1,245 @@
+"""
+PGYS - Şifre hash'leme
+Tuzlu ve maliyeti ayarlanabilir KDF'ler (scrypt, PBKDF2-SHA256) ile eski tuzsuz
+SHA-256 değerleri yan yana desteklenir. Saklanan değer biçimi kendini tanımlar:
+
+    scrypt$<n>$<r>$<p>$<tuz>$<özet>
+    pbkdf2_sha256$<tur>$<tuz>$<özet>
+    <64 hex karakter>                  (eski SHA-256)
+
+Hash hesabı istek thread'lerini bloklamasın diye sınırlı bir süreç havuzunda yapılır;
+kuyruk doluysa PasswordHasherBusy fırlatılır (handler 503 döner). Başarılı girişte
+eski biçimli veya maliyet ayarı değişmiş değerler yeniden hash'lenir (needs_rehash).
+"""
+
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+_LEGACY_RE = re.compile(r'^[0-9a-f]{64}$')
+
+SCHEMES = ('scrypt', 'pbkdf2_sha256')
+
+
+class PasswordHasherBusy(Exception):
+    """Hash kuyruğu dolu; istek daha sonra tekrar denenmeli"""
+
+
+# ========================================
+# Biçimler (süreç havuzunda çalışan saf fonksiyonlar)
+# ========================================
+
+def _b64(raw):
+    return base64.b64encode(raw).decode().rstrip('=')
+
+
+def _unb64(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def _scrypt(password, salt, n, r, p):
+    # OpenSSL'in varsayılan 32 MB sınırı n=2^15 ve üzeri için yetmez
+    maxmem = 128 * n * r * 2
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=32)
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+
+
+def compute_hash(password, scheme, params):
+    """Yeni tuzla hash üretir ve saklanacak metni döndürür"""
+    salt = os.urandom(16)
+    if scheme == 'scrypt':
+        n, r, p = params['n'], params['r'], params['p']
+        return f"scrypt${n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+    if scheme == 'pbkdf2_sha256':
+        iterations = params['iterations']
+        return f"pbkdf2_sha256${iterations}${_b64(salt)}${_b64(_pbkdf2(password, salt, iterations))}"
+    raise ValueError(f'Bilinmeyen şifre şeması: {scheme}')
+
+
+def check_hash(password, stored):
+    """Şifre saklanan değerle eşleşiyor mu (sabit zamanlı karşılaştırma)"""
+    if not stored:
+        return False
+    if _LEGACY_RE.match(stored):
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(candidate, stored)
+
+    parts = stored.split('$')
+    try:
+        if parts[0] == 'scrypt' and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            candidate = _scrypt(password, _unb64(parts[4]), n, r, p)
+            return hmac.compare_digest(candidate, _unb64(parts[5]))
+        if parts[0] == 'pbkdf2_sha256' and len(parts) == 4:
+            candidate = _pbkdf2(password, _unb64(parts[2]), int(parts[1]))
+            return hmac.compare_digest(candidate, _unb64(parts[3]))
+    except (ValueError, TypeError):
+        return False
+    return False
+
+
+def identify(stored):
+    """Saklanan değerin şemasını döndürür ('legacy_sha256', 'scrypt', 'pbkdf2_sha256' veya None)"""
+    if stored and _LEGACY_RE.match(stored):
+        return 'legacy_sha256'
+    scheme = (stored or '').split('$', 1)[0]
+    return scheme if scheme in SCHEMES else None
+
+
+def _noop():
+    return os.getpid()
+
+
+# ========================================
+# PasswordHasher
+# ========================================
+
+class PasswordHasher:
+    """
+    scheme: yeni hash'lerde kullanılacak şema ('scrypt' veya 'pbkdf2_sha256')
+    scrypt_n / scrypt_r / scrypt_p, pbkdf2_iterations: maliyet parametreleri
+    workers: süreç sayısı (0: çağıran thread'de hesapla)
+    max_pending: aynı anda kuyrukta / işlemde olabilecek en çok hash
+    queue_timeout: kuyruk doluyken en fazla bekleme (saniye)
+    executor: 'process' veya 'thread'. Süreç havuzu fork destekleyen sistemlerde
+    kullanılır; aksi halde (Windows) thread havuzu seçilir. hashlib'in scrypt ve
+    pbkdf2_hmac'ı hesap sırasında GIL'i bıraktığından thread'ler de paralel çalışır.
+    """
+
+    def __init__(self, scheme='scrypt', scrypt_n=2 ** 14, scrypt_r=8, scrypt_p=1,
+                 pbkdf2_iterations=600000, workers=None, max_pending=64,
+                 queue_timeout=5.0, executor=None):
+        if scheme not in SCHEMES:
+            raise ValueError(f'Bilinmeyen şifre şeması: {scheme}')
+        self.scheme = scheme
+        self.params = {
+            'scrypt': {'n': scrypt_n, 'r': scrypt_r, 'p': scrypt_p},
+            'pbkdf2_sha256': {'iterations': pbkdf2_iterations},
+        }
+        self.workers = (os.cpu_count() or 2) if workers is None else workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+
+        if executor is None:
+            executor = 'process' if 'fork' in multiprocessing.get_all_start_methods() else 'thread'
+        self.executor_kind = executor if self.workers else 'inline'
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._stats = {'hashes': 0, 'verifies': 0, 'failures': 0, 'rehashes_needed': 0,
+                       'busy': 0, 'time_total': 0.0, 'time_max': 0.0}
+
+    def start(self):
+        """
+        Havuzu hemen başlatır. Süreç havuzunda tüm çocuk süreçler burada fork edilir;
+        çocuklar soket ve kilit devralmasın diye veritabanı bağlantıları ile arka plan /
+        istek thread'leri açılmadan önce çağrılmalıdır.
+        """
+        if not self.workers or self._executor is not None:
+            return self
+        with self._lock:
+            if self._executor is None:
+                if self.executor_kind == 'process':
+                    executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                   mp_context=multiprocessing.get_context('fork'))
+                    for future in [executor.submit(_noop) for _ in range(self.workers)]:
+                        future.result()
+                else:
+                    executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                  thread_name_prefix='pgys-hash')
+                self._executor = executor
+        return self
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._stats['busy'] += 1
+            raise PasswordHasherBusy('Şifre doğrulama kuyruğu dolu')
+        started = time.perf_counter()
+        try:
+            if not self.workers:
+                return fn(*args)
+            return self.start()._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._stats['time_total'] += elapsed
+                self._stats['time_max'] = max(self._stats['time_max'], elapsed)
+
+    def hash(self, password):
+        """Şifreyi geçerli şema ve maliyetle hash'ler"""
+        result = self._run(compute_hash, password, self.scheme, self.params[self.scheme])
+        with self._lock:
+            self._stats['hashes'] += 1
+        return result
+
+    def needs_rehash(self, stored):
+        """Saklanan değer eski biçimdeyse veya maliyet parametreleri geçerli ayardan farklıysa True"""
+        if identify(stored) != self.scheme:
+            return True
+        parts = stored.split('$')
+        current = self.params[self.scheme]
+        if self.scheme == 'scrypt':
+            return (int(parts[1]), int(parts[2]), int(parts[3])) != \
+                (current['n'], current['r'], current['p'])
+        return int(parts[1]) != current['iterations']
+
+    def verify(self, password, stored):
+        """(eşleşti mi, yeniden hash'lenmeli mi) döndürür"""
+        ok = self._run(check_hash, password, stored) if password else False
+        rehash = ok and self.needs_rehash(stored)
+        with self._lock:
+            self._stats['verifies'] += 1
+            self._stats['failures'] += 0 if ok else 1
+            self._stats['rehashes_needed'] += 1 if rehash else 0
+        return ok, rehash
+
+    def stats(self):
+        with self._lock:
+            count = self._stats['hashes'] + self._stats['verifies']
+            return {
+                'scheme': self.scheme,
+                'params': self.params[self.scheme],
+                'executor': self.executor_kind,
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'hashes': self._stats['hashes'],
+                'verifies': self._stats['verifies'],
+                'failures': self._stats['failures'],
+                'rehashes_needed': self._stats['rehashes_needed'],
+                'busy': self._stats['busy'],
+                'time_avg_ms': round(self._stats['time_total'] / count * 1000, 2) if count else 0.0,
+                'time_max_ms': round(self._stats['time_max'] * 1000, 2),
+            }
+
+
+def hasher_from_env():
+    """PGYS_PASSWORD_* / PGYS_HASH_* ortam değişkenlerinden PasswordHasher kurar"""
+    workers = os.environ.get('PGYS_HASH_WORKERS')
+    return PasswordHasher(
+        scheme=os.environ.get('PGYS_PASSWORD_SCHEME', 'scrypt'),
+        scrypt_n=int(os.environ.get('PGYS_SCRYPT_N', 2 ** 14)),
+        scrypt_r=int(os.environ.get('PGYS_SCRYPT_R', 8)),
+        scrypt_p=int(os.environ.get('PGYS_SCRYPT_P', 1)),
+        pbkdf2_iterations=int(os.environ.get('PGYS_PBKDF2_ITERATIONS', 600000)),
+        workers=int(workers) if workers is not None else None,
+        max_pending=int(os.environ.get('PGYS_HASH_MAX_PENDING', 64)),
+        queue_timeout=float(os.environ.get('PGYS_HASH_QUEUE_TIMEOUT', 5)),
+        executor=os.environ.get('PGYS_HASH_EXECUTOR') or None,
+    )
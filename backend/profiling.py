@@ -0,0 +1,297 @@
+"""
+PGYS - Sorgu Profili ve Yavaş Sorgu Günlüğü
+metrics.TimedCursor her execute'tan sonra QueryProfiler.record'u çağırır. Her ifade,
+SQL metninden türetilen sabit bir adla (endpoint:FİİL TABLO#özet) gruplanır; sayı,
+toplam / en uzun süre ve okunan satırlar tutulur.
+
+- Eşiği (slow_ms) aşan ifadeler parametreleri gizlenerek (sadece tip / uzunluk)
+  günlüğe yazılır ve son yavaş sorgular listesinde tutulur.
+- plan_sample oranında yavaş SELECT'in çalıştırma planı arka plan thread'inde, havuzdan
+  alınan AYRI bir bağlantıyla yakalanır (istek beklemez; plan motorun explain'i ile alınır).
+- İstatistikler kayan pencerede tutulur: her window saniyede bir güncel pencere öncekinin
+  yerine geçer; sıralama son iki pencereyi birlikte gösterir.
+
+ID listeleri (bkz. queries.id_list) farklı uzunlukta olsa da aynı ifade sayılır.
+"""
+
+import queue
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_PLACEHOLDER_LIST_RE = re.compile(r'\?(?:\s*,\s*\?)+')
+_VERB_RE = re.compile(r'^\s*(\w+)')
+_TABLE_RE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+([A-Za-z_][A-Za-z0-9_]*)', re.IGNORECASE)
+
+# Plan sadece çalıştırmayan / okuyan ifadeler için istenir
+_PLAN_VERBS = ('SELECT', 'WITH')
+
+SORT_KEYS = ('toplam', 'ortalama', 'en_uzun', 'sayi')
+
+
+def normalize(sql):
+    """Boşlukları sadeleştirir, ? listelerini tek yer tutucuya indirger"""
+    sql = _WHITESPACE_RE.sub(' ', sql).strip()
+    return _PLACEHOLDER_LIST_RE.sub('?, ...', sql)
+
+
+def redact(params):
+    """Parametre değerlerini gizler; tip ve uzunluk kalır"""
+    if params is None:
+        return []
+    if not isinstance(params, (list, tuple)):
+        params = [params]
+    redacted = []
+    for value in params:
+        if value is None:
+            redacted.append('NULL')
+        elif isinstance(value, (str, bytes)):
+            redacted.append(f'<{type(value).__name__}:{len(value)}>')
+        elif isinstance(value, (date, datetime)):
+            redacted.append('<tarih>')
+        else:
+            redacted.append(f'<{type(value).__name__}>')
+    return redacted
+
+
+class _Statement:
+    __slots__ = ('name', 'context', 'sql', 'count', 'total', 'max', 'rows', 'slow')
+
+    def __init__(self, name, context, sql):
+        self.name = name
+        self.context = context
+        self.sql = sql
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+
+
+class QueryProfiler:
+    """
+    İfade bazında sorgu istatistikleri.
+
+    context_fn: ifadeyi çalıştıran kodun adı (örn. Flask endpoint'i); None ise 'arka_plan'
+    slow_ms: bu süreyi aşan ifadeler yavaş sayılır ve günlüğe yazılır
+    window: istatistik penceresi (sn)
+    plan_sample: yavaş SELECT'lerden planı yakalanacak oran (0: kapalı)
+    connection_fn / explain_fn: plan için bağlantı ve motorun explain(cursor, sql, params)'ı
+    plan_ttl: aynı ifadenin planı en fazla bu sıklıkla yeniden yakalanır (sn)
+    max_statements: pencere başına en çok ayrı ifade; aşılınca yenileri sayılmaz
+    log: yavaş sorgu satırını yazan fonksiyon
+    """
+
+    def __init__(self, context_fn=None, slow_ms=200.0, window=3600.0, plan_sample=0.0,
+                 connection_fn=None, explain_fn=None, plan_ttl=600.0, max_statements=2000,
+                 recent=100, log=print):
+        self.context_fn = context_fn
+        self.slow_ms = slow_ms
+        self.window = window
+        self.plan_sample = plan_sample if connection_fn and explain_fn else 0.0
+        self.plan_ttl = plan_ttl
+        self.max_statements = max_statements
+        self.log = log
+        self._connection_fn = connection_fn
+        self._explain_fn = explain_fn
+
+        # Ham SQL -> (normalize SQL, fiil, tablo, özet); SQL metinleri koddaki sabitlerdir
+        self._shapes = {}
+        self._current = {}
+        self._previous = {}
+        self._window_started = time.monotonic()
+        self._recent = deque(maxlen=recent)
+        # (bağlam, özet) -> (plan metni, yakalanma zamanı)
+        self._plans = {}
+        self._plan_queue = queue.Queue(maxsize=32)
+        self._plan_thread = None
+        self._sample_credit = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {'recorded': 0, 'slow': 0, 'untracked': 0, 'plans_captured': 0,
+                       'plans_failed': 0, 'plans_dropped': 0}
+
+    # ---------- kayıt ----------
+
+    @contextmanager
+    def tag(self, context):
+        """with bloğunda bu thread'deki ifadeler context_fn yerine bu adla gruplanır"""
+        previous = getattr(self._local, 'context', None)
+        self._local.context = context
+        try:
+            yield
+        finally:
+            self._local.context = previous
+
+    def _shape(self, sql):
+        shape = self._shapes.get(sql)
+        if shape is None:
+            normalized = normalize(sql)
+            verb = _VERB_RE.match(normalized)
+            table = _TABLE_RE.search(normalized)
+            digest = format(zlib.crc32(normalized.encode()), '08x')[:6]
+            shape = (normalized, verb.group(1).upper() if verb else '?',
+                     table.group(1).upper() if table else '-', digest)
+            if len(self._shapes) >= 4096:
+                self._shapes.clear()
+            self._shapes[sql] = shape
+        return shape
+
+    def record(self, sql, params, seconds, rowcount=None):
+        """
+        execute sonrası çağrılır; dönen kayıt add_rows ile satır sayısını alır.
+        rowcount: DML'de etkilenen satırlar (SELECT'te -1 / None)
+        """
+        normalized, verb, table, digest = self._shape(sql)
+        context = (getattr(self._local, 'context', None)
+                   or (self.context_fn() if self.context_fn else None) or 'arka_plan')
+        key = (context, digest)
+        ms = seconds * 1000
+        slow = ms >= self.slow_ms
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_started >= self.window:
+                self._previous = self._current
+                self._current = {}
+                self._window_started = now
+            entry = self._current.get(key)
+            if entry is None:
+                if len(self._current) >= self.max_statements:
+                    self._stats['untracked'] += 1
+                    return None
+                entry = self._current[key] = _Statement(f'{context}:{verb} {table}#{digest}',
+                                                        context, normalized)
+            entry.count += 1
+            entry.total += seconds
+            if seconds > entry.max:
+                entry.max = seconds
+            if rowcount is not None and rowcount > 0:
+                entry.rows += rowcount
+            self._stats['recorded'] += 1
+            if slow:
+                entry.slow += 1
+                self._stats['slow'] += 1
+                self._recent.append({
+                    'zaman': datetime.now().isoformat(timespec='seconds'),
+                    'ad': entry.name,
+                    'ms': round(ms, 2),
+                    'sql': normalized,
+                    'parametreler': redact(params),
+                })
+                capture = verb in _PLAN_VERBS and self._should_capture(key, now)
+
+        if slow:
+            self.log(f"🐢 Yavaş sorgu {ms:.1f} ms [{entry.name}] {normalized[:300]} "
+                     f"parametreler={redact(params)}")
+            if capture:
+                self._queue_plan(key, sql, params)
+        return entry
+
+    def add_rows(self, entry, count):
+        if entry is not None and count:
+            with self._lock:
+                entry.rows += count
+
+    # ---------- plan yakalama ----------
+
+    def _should_capture(self, key, now):
+        if not self.plan_sample:
+            return False
+        plan = self._plans.get(key)
+        if plan is not None and now - plan[1] < self.plan_ttl:
+            return False
+        # Rastgele yerine birikimli örnekleme: oran 0.25 ise her 4 adaydan biri
+        self._sample_credit += self.plan_sample
+        if self._sample_credit >= 1:
+            self._sample_credit -= 1
+            return True
+        return False
+
+    def _queue_plan(self, key, sql, params):
+        try:
+            self._plan_queue.put_nowait((key, sql, params))
+        except queue.Full:
+            with self._lock:
+                self._stats['plans_dropped'] += 1
+            return
+        with self._lock:
+            if self._plan_thread is None:
+                self._plan_thread = threading.Thread(target=self._plan_worker,
+                                                     name='pgys-query-plans', daemon=True)
+                self._plan_thread.start()
+
+    def _plan_worker(self):
+        while True:
+            key, sql, params = self._plan_queue.get()
+            try:
+                with self._connection_fn() as conn:
+                    cursor = conn.cursor()
+                    try:
+                        plan = self._explain_fn(cursor, sql, params)
+                    finally:
+                        # Explain ayarları / okuma işlemi bağlantıda kalmasın
+                        conn.rollback()
+                captured = 'plans_captured'
+            except Exception as e:
+                plan = f'Plan alınamadı: {str(e)}'
+                captured = 'plans_failed'
+            with self._lock:
+                self._plans[key] = (plan, time.monotonic())
+                self._stats[captured] += 1
+
+    # ---------- okuma ----------
+
+    def top(self, limit=20, sort='toplam'):
+        """Son iki penceredeki en pahalı ifadeler"""
+        with self._lock:
+            merged = {}
+            for window in (self._previous, self._current):
+                for key, entry in window.items():
+                    item = merged.get(key)
+                    if item is None:
+                        merged[key] = item = {'ad': entry.name, 'baglam': entry.context, 'sql': entry.sql,
+                                              'sayi': 0, 'toplam': 0.0, 'en_uzun': 0.0,
+                                              'satir': 0, 'yavas': 0}
+                    item['sayi'] += entry.count
+                    item['toplam'] += entry.total
+                    item['en_uzun'] = max(item['en_uzun'], entry.max)
+                    item['satir'] += entry.rows
+                    item['yavas'] += entry.slow
+            plans = {key: plan[0] for key, plan in self._plans.items() if key in merged}
+
+        for key, item in merged.items():
+            item['ortalama'] = item['toplam'] / item['sayi'] if item['sayi'] else 0.0
+            item['plan'] = plans.get(key)
+        ranked = sorted(merged.values(), key=lambda item: item[sort], reverse=True)[:limit]
+        for item in ranked:
+            for field in ('toplam', 'ortalama', 'en_uzun'):
+                item[f'{field}_ms'] = round(item.pop(field) * 1000, 3)
+        return ranked
+
+    def recent_slow(self):
+        with self._lock:
+            return list(reversed(self._recent))
+
+    def reset(self):
+        with self._lock:
+            self._current = {}
+            self._previous = {}
+            self._window_started = time.monotonic()
+            self._recent.clear()
+            self._plans.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'statements': len(self._current),
+                'slow_ms': self.slow_ms,
+                'window_s': self.window,
+                'plan_sample': self.plan_sample,
+                **self._stats,
+            }
@@ -0,0 +1,113 @@
+"""
+PGYS - Ortak SQL parçaları
+Kullanıcı bazlı görünürlük sorguları birden fazla endpoint (ve benchmark) tarafından kullanılır.
+
+Görünürlük kuralları:
+- Proje: kullanıcı projenin yöneticisi veya üyesiyse görünür
+- Görev: kullanıcı göreve atanmışsa veya görevin projesi görünürse görünür
+
+Eski sorgular bu kuralları GOREV_ATAMALARI ve PROJE_UYE_ILISKISI üzerinde LEFT JOIN +
+OR + DISTINCT ile uyguluyordu; satırlar atama x üye kadar çoğalıp sonra tekilleştiriliyordu.
+Aşağıdaki UNION/IN biçimleri her kolu ayrı indeksle (bkz. migrations/*/V001) çözer.
+"""
+
+# Parametreler: (kullanici_id, kullanici_id)
+# Silinmekte olan (Silindi = 1) projenin üyelikleri silme anında kaldırılır; sadece
+# yönetici kolu bayrağa bakar (bkz. deletion.py)
+GORUNUR_PROJELER = """
+    SELECT pui_v.ProjeID FROM PROJE_UYE_ILISKISI pui_v WHERE pui_v.KullaniciID = ?
+    UNION
+    SELECT p_v.ProjeID FROM PROJELER p_v WHERE p_v.YoneticiID = ? AND p_v.Silindi = 0
+"""
+
+
+def gorunur_gorevler(proje_kapsami):
+    """
+    Görünür görevler; proje kolu verilen kapsamla (GORUNUR_PROJELER veya id_list
+    ile üretilmiş sabit ID listesi) çözülür. Parametreler: (kullanici_id,) + kapsam parametreleri
+    """
+    return f"""
+    SELECT ga_v.GorevID FROM GOREV_ATAMALARI ga_v WHERE ga_v.KullaniciID = ?
+    UNION
+    SELECT g_v.GorevID FROM GOREVLER g_v WHERE g_v.ProjeID IN ({proje_kapsami})
+"""
+
+
+# Parametreler: (kullanici_id, kullanici_id, kullanici_id)
+GORUNUR_GOREVLER = gorunur_gorevler(GORUNUR_PROJELER)
+
+
+def gorunur_projeler_params(kullanici_id):
+    return (kullanici_id, kullanici_id)
+
+
+def gorunur_gorevler_params(kullanici_id):
+    return (kullanici_id, kullanici_id, kullanici_id)
+
+
+def id_list(ids):
+    """
+    IN (...) içine yazılacak sabit ID listesi: (sql, params).
+    Yer tutucu sayısı 2'nin kuvvetine yuvarlanıp NULL ile doldurulur; böylece farklı
+    uzunluktaki listeler az sayıda sorgu metni (ve plan önbelleği kaydı) üretir.
+    Boş listede hiçbir satırla eşleşmeyen tek NULL döner.
+    """
+    ids = sorted(ids)
+    size = 1
+    while size < len(ids):
+        size *= 2
+    return ', '.join('?' * size), ids + [None] * (size - len(ids))
+
+
+# Silinmekte olan kayıtlar okumalarda görünmez (Silindi = 1, bkz. deletion.py):
+# silinen yöneticinin adı boş döner
+PROJELER_SELECT = """
+    SELECT p.ProjeID, p.ProjeAdi, p.BaslangicTarihi, p.BitisTarihi,
+           p.Butce, p.YoneticiID, k.Ad as YoneticiAd, k.Soyad as YoneticiSoyad
+    FROM PROJELER p
+    LEFT JOIN KULLANICILAR k ON p.YoneticiID = k.KullaniciID AND k.Silindi = 0
+"""
+
+# DurumAdi / OncelikAdi tanım önbelleğinden çözülür (bkz. lookups.py).
+# ProjeID zorunlu; silinmekte olan projenin görevleri JOIN koşuluyla gizlenir
+GOREVLER_SELECT = """
+    SELECT g.GorevID, g.GorevAdi, g.Aciklama, g.TeslimTarihi,
+           g.ProjeID, p.ProjeAdi, g.DurumID, g.OncelikID
+    FROM GOREVLER g
+    JOIN PROJELER p ON g.ProjeID = p.ProjeID AND p.Silindi = 0
+"""
+
+
+# Kullanıcının projelerindeki ekip üyeleri; üyelik tablosundan başlar,
+# böylece DISTINCT sadece birden fazla projede aynı rolle bulunan üyeleri tekilleştirir.
+# RolAdi tanım önbelleğinden çözülür.
+def ekip_kullanici(proje_kapsami):
+    return f"""
+    SELECT DISTINCT k.KullaniciID, k.Ad, k.Soyad, k.Eposta, pui.RolID
+    FROM PROJE_UYE_ILISKISI pui
+    JOIN KULLANICILAR k ON k.KullaniciID = pui.KullaniciID
+    WHERE pui.ProjeID IN ({proje_kapsami})
+    ORDER BY k.Ad, k.Soyad
+"""
+
+
+def projeler_kullanici(proje_kapsami):
+    return f"""
+    {PROJELER_SELECT}
+    WHERE p.ProjeID IN ({proje_kapsami}) AND p.Silindi = 0
+    ORDER BY p.BaslangicTarihi DESC
+"""
+
+
+EKIP_KULLANICI = ekip_kullanici(GORUNUR_PROJELER)
+PROJELER_KULLANICI = projeler_kullanici(GORUNUR_PROJELER)
+
+# Dashboard: proje ve durum bazında görev sayıları ile geciken görevler.
+# Parametreler: (bugun, tamamlandi_durum_id) + isteğe bağlı görünürlük parametreleri
+DASHBOARD_GOREV_OZETI = """
+    SELECT g.ProjeID, g.DurumID, COUNT(*) AS GorevSayisi,
+           SUM(CASE WHEN g.TeslimTarihi < ? AND g.DurumID <> ? THEN 1 ELSE 0 END) AS GecikenSayisi
+    FROM GOREVLER g
+    JOIN PROJELER p_d ON p_d.ProjeID = g.ProjeID AND p_d.Silindi = 0
+"""
+DASHBOARD_GROUP_BY = " GROUP BY g.ProjeID, g.DurumID"
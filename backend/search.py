@@ -0,0 +1,337 @@
+"""
+PGYS - Arama İndeksi
+Görev adı / açıklaması ve yorum metinleri için süreç içi ters indeks (terim -> kayıtlar).
+Açılışta veritabanından bir kez kurulur; sonra görev / yorum yazmalarında artımlı
+güncellenir. Sorgu LIKE '%x%' tablo taraması yerine sadece sorgu terimlerinin
+kayıt listelerini dolaşır.
+
+Normalizasyon Türkçe'ye göre yapılır: I / İ / ı hepsi i'ye, ş ğ ü ö ç aksansız
+karşılıklarına indirgenir ("IŞIK", "ışık", "isik" aynı terimdir). Türkçe eklerle
+çekimlenen kelimeler için her sorgu terimi önek olarak da eşleşir ("gorev" ->
+"gorevler", "gorevi"); tam eşleşme önek eşleşmesinden yüksek puan alır.
+
+Not: İndeks süreç içindedir (versioning.py ile aynı varsayım). Yazma kancaları
+commit'ten SONRA çağrılmalıdır.
+"""
+
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+
+GOREV = 'gorev'
+YORUM = 'yorum'
+
+# Alan ağırlıkları: görev adındaki kelime açıklamadakinden daha belirleyicidir
+WEIGHTS = {'GorevAdi': 3, 'Aciklama': 1, 'YorumMetni': 1}
+
+# Önek eşleşmesinin tam eşleşmeye göre puan katsayısı
+PREFIX_FACTOR = 0.6
+# Önek olarak genişletilecek en kısa terim ve terim başına en çok genişleme
+PREFIX_MIN_LENGTH = 3
+PREFIX_MAX_TERMS = 64
+
+MAX_TERM_LENGTH = 40
+
+# Türkçe harfler doğrudan çevrilir (I -> i, İ -> i); kalan aksanlı harfler NFKD ile ayrıştırılır
+_TR_FOLD = str.maketrans('IİıÇçĞğÖöŞşÜüÂâÎîÛû', 'iiiccggoossuuaaiiuu')
+_WORD = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Metni küçük harfe ve aksansız biçime indirger (Türkçe I / İ kuralıyla)"""
+    text = (text or '').translate(_TR_FOLD)
+    if not text.isascii():
+        text = ''.join(ch for ch in unicodedata.normalize('NFKD', text)
+                       if not unicodedata.combining(ch))
+    return text.casefold()
+
+
+def tokenize(text):
+    """Normalize edilmiş terimler (tek harfli kelimeler atlanır)"""
+    return [word[:MAX_TERM_LENGTH] for word in _WORD.findall(normalize(text))
+            if len(word) > 1 or word.isdigit()]
+
+
+def _discard(mapping, key, value):
+    """mapping[key] kümesinden / sözlüğünden value'yu çıkarır, boşalırsa anahtarı siler"""
+    values = mapping.get(key)
+    if values is not None:
+        if isinstance(values, dict):
+            values.pop(value, None)
+        else:
+            values.discard(value)
+        if not values:
+            del mapping[key]
+
+
+class SearchIndex:
+    """
+    Görev ve yorumlar için ters indeks.
+
+    connection_fn: with bloğunda bağlantı veren fonksiyon (örn. ConnectionPool.connection)
+    """
+
+    def __init__(self, connection_fn):
+        self._connection_fn = connection_fn
+        self._lock = threading.Lock()
+        self._reset_state()
+        self.loaded = False
+        # Yeniden kurulum sürerken gelen yazmalar kurulum bitince yeni indekse de uygulanır
+        self._replay = None
+        self._stats = {'builds': 0, 'build_ms': 0.0, 'queries': 0,
+                       'query_time_total': 0.0, 'query_time_max': 0.0}
+
+    def _reset_state(self):
+        # (tür, ID) -> (ProjeID, terim ağırlıkları)
+        self._docs = {}
+        # terim -> ProjeID -> {(tür, ID): ağırlık}; kapsamlı arama sadece görünür
+        # projelerin listelerini dolaşır
+        self._postings = {}
+        # terim -> içeren kayıt sayısı (idf için)
+        self._df = {}
+        # Önek araması için sıralı terim listesi; toplu kurulumda (rebuild) sonda bir kez
+        # sıralanır, artımlı yazmalarda insort ile sıralı tutulur
+        self._terms = []
+        self._bulk = False
+        self._task_project = {}
+        self._task_comments = {}
+        self._comment_task = {}
+        self._user_comments = {}
+
+    # ---------- kurulum ----------
+
+    def rebuild(self, chunk_size=5000):
+        """İndeksi veritabanından baştan kurar ve mevcut indeksin yerine koyar"""
+        started = time.perf_counter()
+        with self._lock:
+            self._replay = []
+
+        fresh = SearchIndex(None)
+        # Her yeni terim için insort kurulumu terim sayısında karesel yapar
+        fresh._bulk = True
+        try:
+            with self._connection_fn() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT GorevID, ProjeID, GorevAdi, Aciklama FROM GOREVLER")
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        fresh._set_task(row[0], row[1], row[2], row[3])
+                cursor.execute("SELECT YorumID, GorevID, KullaniciID, YorumMetni FROM YORUMLAR")
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        fresh._set_comment(row[0], row[1], row[2], row[3])
+            fresh._terms = sorted(fresh._postings)
+            fresh._bulk = False
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+
+        with self._lock:
+            for method, args in self._replay:
+                getattr(fresh, method)(*args)
+            self._replay = None
+            (self._docs, self._postings, self._df, self._terms, self._task_project,
+             self._task_comments, self._comment_task, self._user_comments) = (
+                fresh._docs, fresh._postings, fresh._df, fresh._terms, fresh._task_project,
+                fresh._task_comments, fresh._comment_task, fresh._user_comments)
+            self.loaded = True
+            self._stats['builds'] += 1
+            self._stats['build_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.rebuild()
+
+    # ---------- indeks yapısı (kilit çağıranda) ----------
+
+    def _index(self, key, proje_id, weights):
+        self._unindex(key)
+        if not weights:
+            return
+        self._docs[key] = (proje_id, weights)
+        for term, weight in weights.items():
+            buckets = self._postings.get(term)
+            if buckets is None:
+                buckets = self._postings[term] = {}
+                self._df[term] = 0
+                if not self._bulk:
+                    insort(self._terms, term)
+            buckets.setdefault(proje_id, {})[key] = weight
+            self._df[term] += 1
+
+    def _unindex(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        proje_id, weights = doc
+        for term in weights:
+            buckets = self._postings[term]
+            _discard(buckets, proje_id, key)
+            self._df[term] -= 1
+            if not buckets:
+                del self._postings[term]
+                del self._df[term]
+                if not self._bulk:
+                    del self._terms[bisect_left(self._terms, term)]
+
+    def _set_task(self, gorev_id, proje_id, gorev_adi, aciklama):
+        moved = self._task_project.get(gorev_id, proje_id) != proje_id
+        self._task_project[gorev_id] = proje_id
+        weights = Counter()
+        for field, text in (('GorevAdi', gorev_adi), ('Aciklama', aciklama)):
+            for term in tokenize(text):
+                weights[term] += WEIGHTS[field]
+        self._index((GOREV, gorev_id), proje_id, weights)
+        if moved:
+            # Yorumlar görevin projesinin listelerinde durur; görevle birlikte taşınır
+            for yorum_id in self._task_comments.get(gorev_id, ()):
+                doc = self._docs.get((YORUM, yorum_id))
+                if doc is not None:
+                    self._index((YORUM, yorum_id), proje_id, doc[1])
+
+    def _remove_task(self, gorev_id):
+        self._unindex((GOREV, gorev_id))
+        self._task_project.pop(gorev_id, None)
+        for yorum_id in self._task_comments.pop(gorev_id, ()):
+            self._remove_comment(yorum_id, from_task=False)
+
+    def _set_comment(self, yorum_id, gorev_id, kullanici_id, metin):
+        self._comment_task[yorum_id] = (gorev_id, kullanici_id)
+        self._task_comments.setdefault(gorev_id, set()).add(yorum_id)
+        self._user_comments.setdefault(kullanici_id, set()).add(yorum_id)
+        weights = {term: count * WEIGHTS['YorumMetni'] for term, count in Counter(tokenize(metin)).items()}
+        self._index((YORUM, yorum_id), self._task_project.get(gorev_id), weights)
+
+    def _remove_comment(self, yorum_id, from_task=True):
+        self._unindex((YORUM, yorum_id))
+        owner = self._comment_task.pop(yorum_id, None)
+        if owner is None:
+            return
+        gorev_id, kullanici_id = owner
+        if from_task:
+            _discard(self._task_comments, gorev_id, yorum_id)
+        _discard(self._user_comments, kullanici_id, yorum_id)
+
+    def _remove_user(self, kullanici_id):
+        for yorum_id in list(self._user_comments.get(kullanici_id, ())):
+            self._remove_comment(yorum_id)
+
+    # ---------- yazma kancaları ----------
+
+    def _apply(self, method, *args):
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((method, args))
+            getattr(self, method)(*args)
+
+    def task_changed(self, gorev_id, proje_id, gorev_adi, aciklama):
+        """Görev eklendi veya güncellendi (başka projeye taşınma dahil)"""
+        self._apply('_set_task', gorev_id, proje_id, gorev_adi, aciklama)
+
+    def tasks_removed(self, gorev_ids):
+        """Görevler (ve CASCADE ile yorumları) silindi"""
+        for gorev_id in gorev_ids:
+            self._apply('_remove_task', gorev_id)
+
+    def comment_added(self, yorum_id, gorev_id, kullanici_id, metin):
+        self._apply('_set_comment', yorum_id, gorev_id, kullanici_id, metin)
+
+    def user_deleted(self, kullanici_id):
+        """Kullanıcı silinince yorumları da (CASCADE) silinir"""
+        self._apply('_remove_user', kullanici_id)
+
+    # ---------- sorgu ----------
+
+    def _matches(self, term):
+        """Terimle tam veya önek olarak eşleşen indeks terimleri: [(terim, katsayı)]"""
+        matches = [(term, 1.0)] if term in self._postings else []
+        if len(term) >= PREFIX_MIN_LENGTH:
+            start = bisect_left(self._terms, term)
+            for candidate in self._terms[start:start + PREFIX_MAX_TERMS + 1]:
+                if not candidate.startswith(term):
+                    break
+                if candidate != term:
+                    matches.append((candidate, PREFIX_FACTOR))
+        return matches
+
+    def _postings_in(self, term, visible):
+        """Terimin kayıt listeleri; visible verilirse sadece görünür projelerinkiler"""
+        buckets = self._postings[term]
+        if visible is None:
+            return buckets.values()
+        if len(visible) < len(buckets):
+            return [buckets[p] for p in visible if p in buckets]
+        return [postings for p, postings in buckets.items() if p in visible]
+
+    def search(self, query, visible=None, kinds=(GOREV, YORUM), limit=20):
+        """
+        Tüm sorgu terimlerini içeren kayıtları puana göre döndürür.
+        visible: görünür ProjeID kümesi (None: tümü)
+        Sonuç: ([(tür, ID, GorevID, ProjeID, puan)], toplam eşleşme)
+        """
+        started = time.perf_counter()
+        terms = list(dict.fromkeys(tokenize(query)))
+        results = []
+        with self._lock:
+            total = len(self._docs) or 1
+            scores = None
+            # En seçici terimden başlanır; aday kümesi hızla küçülür
+            expanded = sorted((self._matches(term) for term in terms),
+                              key=lambda matches: sum(self._df[t] for t, _ in matches))
+            for matches in expanded:
+                term_scores = {}
+                for matched, factor in matches:
+                    idf = math.log(1 + total / self._df[matched])
+                    for postings in self._postings_in(matched, visible):
+                        for key, weight in postings.items():
+                            if scores is not None and key not in scores:
+                                continue
+                            score = (1 + math.log(weight)) * idf * factor
+                            if score > term_scores.get(key, 0.0):
+                                term_scores[key] = score
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {key: scores[key] + score for key, score in term_scores.items()}
+                if not scores:
+                    break
+
+            for key, score in (scores or {}).items():
+                kind, kayit_id = key
+                if kind not in kinds:
+                    continue
+                gorev_id = kayit_id if kind == GOREV else self._comment_task[kayit_id][0]
+                results.append((kind, kayit_id, gorev_id, self._docs[key][0], round(score, 4)))
+
+        results.sort(key=lambda r: (-r[4], r[0], -r[1]))
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats['queries'] += 1
+            self._stats['query_time_total'] += elapsed
+            self._stats['query_time_max'] = max(self._stats['query_time_max'], elapsed)
+        return results[:limit], len(results)
+
+    def stats(self):
+        with self._lock:
+            queries = self._stats['queries']
+            return {
+                'loaded': self.loaded,
+                'documents': len(self._docs),
+                'terms': len(self._postings),
+                'builds': self._stats['builds'],
+                'build_ms': self._stats['build_ms'],
+                'queries': queries,
+                'query_avg_ms': round(self._stats['query_time_total'] / queries * 1000, 3) if queries else 0.0,
+                'query_max_ms': round(self._stats['query_time_max'] * 1000, 3),
+            }
@@ -0,0 +1,156 @@
+"""
+PGYS - Satır serileştirme
+Her sorgu biçimi için bir RowSerializer tanımlanır: çıktı anahtarı, kaynak kolon ve
+dönüştürücü bir kez verilir; kolon konumları imlecin description'ından bir kez çözülür
+ve satır başına sadece indeksle erişen derlenmiş bir fonksiyon çalışır.
+
+İsteğe bağlı olarak Flask'ın JSON sağlayıcısı orjson ile değiştirilir (bkz. install_json_provider).
+"""
+
+import os
+import threading
+from datetime import datetime
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson isteğe bağlı
+    orjson = None
+
+
+# ========================================
+# Dönüştürücüler
+# ========================================
+
+def iso_date(value):
+    """
+    datetime -> 'YYYY-MM-DD'; diğer değerler (None, metin, date) olduğu gibi. date
+    (MSSQL DATE kolonları) eskisi gibi JSON sağlayıcısının biçimine bırakılır
+    """
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    return value
+
+
+def float_or_none(value):
+    """Decimal / sayı -> float; boş veya sıfır -> None"""
+    return float(value) if value else None
+
+
+def or_empty(value):
+    """Boş değer -> ''"""
+    return value if value else ''
+
+
+# ========================================
+# RowSerializer
+# ========================================
+
+class RowSerializer:
+    """
+    Sorgu satırlarını API nesnelerine çevirir.
+
+    fields: her biri 'Anahtar', ('Anahtar', dönüştürücü) veya
+    ('Anahtar', dönüştürücü, 'KaynakKolon') olabilir. Dönüştürücü None ise değer
+    olduğu gibi kopyalanır; kaynak kolon verilmezse anahtarla aynı adı taşır.
+    """
+
+    def __init__(self, *fields):
+        self.fields = []
+        for field in fields:
+            if isinstance(field, str):
+                field = (field,)
+            key = field[0]
+            converter = field[1] if len(field) > 1 else None
+            column = field[2] if len(field) > 2 else key
+            self.fields.append((key, converter, column))
+        self._bound = {}
+        self._lock = threading.Lock()
+
+    def bind(self, description):
+        """İmlecin kolon düzenine göre derlenmiş row -> dict fonksiyonunu döndürür"""
+        columns = tuple(d[0] for d in description)
+        fn = self._bound.get(columns)
+        if fn is None:
+            with self._lock:
+                fn = self._bound.get(columns)
+                if fn is None:
+                    fn = self._bound[columns] = self._compile(columns)
+        return fn
+
+    def _compile(self, columns):
+        positions = {name: i for i, name in enumerate(columns)}
+        namespace = {}
+        items = []
+        for n, (key, converter, column) in enumerate(self.fields):
+            if column not in positions:
+                raise ValueError(f"Sorgu sonucunda '{column}' kolonu yok")
+            if converter is None:
+                items.append(f"{key!r}: row[{positions[column]}]")
+            else:
+                namespace[f'_c{n}'] = converter
+                items.append(f"{key!r}: _c{n}(row[{positions[column]}])")
+        # Anahtarlar ve indeksler koda gömülür; satır başına sözlük araması yapılmaz
+        return eval(f"lambda row: {{{', '.join(items)}}}", namespace)
+
+    def one(self, cursor, row):
+        return self.bind(cursor.description)(row)
+
+    def all(self, cursor, rows):
+        to_dict = self.bind(cursor.description)
+        return [to_dict(row) for row in rows]
+
+
+# ========================================
+# JSON sağlayıcı
+# ========================================
+
+def _orjson_default(value):
+    # orjson'un bilmediği tipler; tarih biçimi Flask'ın varsayılanıyla aynı kalsın diye
+    # datetime'lar da buraya bırakılır (OPT_PASSTHROUGH_DATETIME)
+    if isinstance(value, Decimal):
+        return float(value)
+    return DefaultJSONProvider.default(value)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider ile aynı çıktı anlamına sahip, orjson tabanlı sağlayıcı"""
+
+    def _options(self, indent=False):
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # json.dumps'a özgü argümanlar (indent, separators...) istenirse standart yol
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_orjson_default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_orjson_default, option=self._options(indent))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def install_json_provider(app):
+    """
+    PGYS_JSON=orjson (varsayılan: yüklüyse) veya std.
+    Seçilen sağlayıcının adını döndürür.
+    """
+    choice = os.environ.get('PGYS_JSON', 'orjson').lower()
+    if choice == 'orjson' and orjson is not None:
+        app.json = OrjsonProvider(app)
+        return 'orjson'
+    return 'std'
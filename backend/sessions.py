@@ -0,0 +1,156 @@
+"""
+PGYS - Oturum Deposu
+Giriş başarılı olunca imzalı bir oturum token'ı üretilir. Token sadece rastgele bir
+oturum ID'si taşır; kullanıcının kimliği süreç içindeki bu depoda tutulur. Böylece her
+istekte KULLANICILAR okunmadan yetki kontrolü yapılır (görünür projeler için bkz.
+visibility.py).
+
+Depo LRU + TTL ile sınırlıdır; şifre değişikliğinde kullanıcının tüm oturumları
+tek çağrıyla (revoke_user) düşürülür.
+
+Not: Depo süreç içindedir (versioning.py ile aynı varsayım); sunucu yeniden
+başlatılınca veya birden fazla süreçte çalışırken kullanıcılar yeniden giriş yapar.
+"""
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+
+class Session:
+    """Tek bir oturum"""
+
+    __slots__ = ('sid', 'kullanici_id', 'user', 'created', 'expires', 'last_seen')
+
+    def __init__(self, sid, user, ttl):
+        now = time.time()
+        self.sid = sid
+        self.kullanici_id = user['KullaniciID']
+        self.user = user
+        self.created = now
+        self.expires = now + ttl
+        self.last_seen = now
+
+
+class SessionStore:
+    """
+    İmzalı token'larla erişilen, thread-safe oturum deposu.
+
+    secret: token imza anahtarı (PGYS_SECRET_KEY)
+    ttl: oturum ömrü (saniye); son kullanımdan değil girişten itibaren sayılır
+    max_sessions: depodaki en çok oturum; aşılınca en uzun süredir kullanılmayan düşer
+    """
+
+    def __init__(self, secret, ttl=8 * 3600.0, max_sessions=10000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._signer = URLSafeTimedSerializer(secret, salt='pgys-oturum')
+        self._sessions = OrderedDict()
+        self._by_user = {}
+        self._lock = threading.Lock()
+        self._stats = {'created': 0, 'hits': 0, 'misses': 0, 'expired': 0,
+                       'evicted': 0, 'revoked': 0, 'bad_tokens': 0}
+
+    def _drop(self, sid):
+        session = self._sessions.pop(sid, None)
+        if session is not None:
+            sids = self._by_user.get(session.kullanici_id)
+            if sids is not None:
+                sids.discard(sid)
+                if not sids:
+                    del self._by_user[session.kullanici_id]
+        return session
+
+    def create(self, user):
+        """Kullanıcı için yeni oturum açar; (token, session) döndürür"""
+        sid = secrets.token_urlsafe(24)
+        session = Session(sid, dict(user), self.ttl)
+        with self._lock:
+            self._sessions[sid] = session
+            self._by_user.setdefault(session.kullanici_id, set()).add(sid)
+            self._stats['created'] += 1
+            while len(self._sessions) > self.max_sessions:
+                self._drop(next(iter(self._sessions)))
+                self._stats['evicted'] += 1
+        return self._signer.dumps({'sid': sid}), session
+
+    def _sid(self, token):
+        try:
+            return self._signer.loads(token, max_age=self.ttl)['sid']
+        except (BadSignature, KeyError, TypeError):
+            return None
+
+    def resolve(self, token):
+        """Token'ın oturumunu döndürür; imza hatalı, süresi dolmuş veya düşürülmüşse None"""
+        sid = self._sid(token)
+        with self._lock:
+            if sid is None:
+                self._stats['bad_tokens'] += 1
+                return None
+            session = self._sessions.get(sid)
+            if session is None:
+                self._stats['misses'] += 1
+                return None
+            now = time.time()
+            if session.expires <= now:
+                self._drop(sid)
+                self._stats['expired'] += 1
+                return None
+            session.last_seen = now
+            self._sessions.move_to_end(sid)
+            self._stats['hits'] += 1
+            return session
+
+    def revoke(self, token):
+        """Tek oturumu kapatır (çıkış); oturum bulunduysa True"""
+        sid = self._sid(token)
+        with self._lock:
+            if sid is not None and self._drop(sid) is not None:
+                self._stats['revoked'] += 1
+                return True
+        return False
+
+    def revoke_user(self, kullanici_id, keep=None):
+        """
+        Kullanıcının tüm oturumlarını kapatır (şifre değişikliği, kullanıcı silme).
+        keep: açık kalacak oturum ID'si (örn. şifreyi değiştiren oturum)
+        """
+        with self._lock:
+            sids = [sid for sid in self._by_user.get(kullanici_id, ()) if sid != keep]
+            for sid in sids:
+                self._drop(sid)
+            self._stats['revoked'] += len(sids)
+        return len(sids)
+
+    def update_user(self, kullanici_id, **fields):
+        """Profil güncellenince açık oturumlardaki kimlik bilgisini tazeler"""
+        with self._lock:
+            for sid in self._by_user.get(kullanici_id, ()):
+                self._sessions[sid].user.update(fields)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses'] + self._stats['expired']
+            return {
+                'sessions': len(self._sessions),
+                'users': len(self._by_user),
+                'max_sessions': self.max_sessions,
+                'ttl': self.ttl,
+                **self._stats,
+                'hit_ratio': round(self._stats['hits'] / lookups, 3) if lookups else None,
+            }
+
+
+def store_from_env():
+    """PGYS_SECRET_KEY / PGYS_SESSION_* ortam değişkenlerinden SessionStore kurar"""
+    # Anahtar verilmezse süreç başına rastgele üretilir (yeniden başlatınca oturumlar düşer)
+    secret = os.environ.get('PGYS_SECRET_KEY') or secrets.token_hex(32)
+    return SessionStore(
+        secret,
+        ttl=float(os.environ.get('PGYS_SESSION_TTL', 8 * 3600)),
+        max_sessions=int(os.environ.get('PGYS_SESSION_MAX', 10000)),
+    )
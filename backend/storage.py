@@ -0,0 +1,310 @@
+"""
+PGYS - Depolama Katmanı
+Route'ların kullandığı veritabanı motorunu soyutlar:
+- MSSQLBackend: SQL Server (ODBC, pyodbc)
+- SQLiteBackend: Gömülü SQLite (yerel çalışma, test ve benchmark için)
+"""
+
+import os
+import sqlite3
+from collections import namedtuple
+
+
+class StorageBackend:
+    """Veritabanı motorları için ortak arayüz"""
+
+    name = None
+    validate_query = 'SELECT 1'
+    # ORDER BY sonrasına eklenen, tek parametre (satır sayısı) alan sınırlama ifadesi
+    limit_clause = 'LIMIT ?'
+    # Değişiklik günlüğü (bkz. changelog.py): filigran olarak kullanılan konum,
+    # "konumdan sonra" koşulu (tek parametre) ve sadece commit edilmişleri bırakan koşul
+    changelog_position = 'DegisiklikID'
+    changelog_after = 'DegisiklikID > ?'
+    changelog_visible = None
+
+    def connect(self):
+        """Yeni bir DB-API bağlantısı döndürür"""
+        raise NotImplementedError
+
+    def initialize(self, migrate=True):
+        """Motorun ihtiyaç duyduğu şema/başlangıç işlemlerini yapar (migrate: bekleyen migration'lar da)"""
+
+    def last_insert_id(self, cursor):
+        """Aynı bağlantıda son eklenen satırın kimliğini döndürür"""
+        raise NotImplementedError
+
+    def executemany(self, cursor, sql, rows):
+        """Aynı ifadeyi birden fazla parametre satırıyla toplu çalıştırır"""
+        cursor.executemany(sql, rows)
+
+    def bulk_insert(self, cursor, table, columns, rows, id_column):
+        """
+        Satırları toplu ekler ve oluşan kimlikleri satırlarla AYNI SIRADA döndürür.
+        Commit çağıranın sorumluluğundadır.
+        """
+        raise NotImplementedError
+
+    def explain(self, cursor, sql, params):
+        """İfadeyi çalıştırmadan çalıştırma planını metin olarak döndürür"""
+        raise NotImplementedError
+
+    def describe(self):
+        """Sağlık kontrolü için motor bilgisi"""
+        return {'backend': self.name}
+
+
+# ========================================
+# SQL Server
+# ========================================
+
+class MSSQLBackend(StorageBackend):
+    """SQL Server bağlantıları (pyodbc üzerinden)"""
+
+    name = 'mssql'
+    limit_clause = 'OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY'
+    # IDENTITY commit sırasını garanti etmez; ROWVERSION + MIN_ACTIVE_ROWVERSION() eder
+    changelog_position = 'CAST(Surum AS BIGINT)'
+    changelog_after = 'Surum > CAST(CAST(? AS BIGINT) AS BINARY(8))'
+    changelog_visible = 'Surum < MIN_ACTIVE_ROWVERSION()'
+
+    def __init__(self, config, login_timeout=10):
+        self.config = config
+        self.login_timeout = login_timeout
+
+    def connection_string(self):
+        return (
+            f"DRIVER={self.config['driver']};"
+            f"SERVER={self.config['server']};"
+            f"DATABASE={self.config['database']};"
+            f"Trusted_Connection=yes;"
+        )
+
+    def connect(self):
+        # pyodbc sadece SQL Server kullanılırken gerekli
+        import pyodbc
+        return pyodbc.connect(self.connection_string(), timeout=self.login_timeout)
+
+    def last_insert_id(self, cursor):
+        cursor.execute("SELECT @@IDENTITY")
+        return cursor.fetchone()[0]
+
+    def executemany(self, cursor, sql, rows):
+        # Parametreleri satır satır değil, dizi olarak tek seferde gönderir
+        cursor.fast_executemany = True
+        cursor.executemany(sql, rows)
+
+    def bulk_insert(self, cursor, table, columns, rows, id_column):
+        if not rows:
+            return []
+        cols = ', '.join(columns)
+        temp = '#pgys_bulk'
+
+        # Hedef tabloyla aynı kolon tiplerinde, sıra numaralı geçici tablo
+        cursor.execute(f"IF OBJECT_ID('tempdb..{temp}') IS NOT NULL DROP TABLE {temp}")
+        cursor.execute(f"SELECT TOP 0 CAST(0 AS INT) AS Sira, {cols} INTO {temp} FROM {table}")
+        try:
+            placeholders = ', '.join('?' * (len(columns) + 1))
+            self.executemany(
+                cursor,
+                f"INSERT INTO {temp} (Sira, {cols}) VALUES ({placeholders})",
+                [(i,) + tuple(row) for i, row in enumerate(rows)]
+            )
+            # INSERT ... OUTPUT kaynak kolonu döndüremez; MERGE ile Sira -> yeni ID eşlenir
+            cursor.execute(f"""
+                MERGE INTO {table} AS t
+                USING {temp} AS s ON 1 = 0
+                WHEN NOT MATCHED THEN
+                    INSERT ({cols}) VALUES ({', '.join('s.' + c for c in columns)})
+                OUTPUT s.Sira, INSERTED.{id_column};
+            """)
+            ids = {sira: new_id for sira, new_id in cursor.fetchall()}
+        finally:
+            cursor.execute(f"DROP TABLE {temp}")
+        return [ids[i] for i in range(len(rows))]
+
+    def explain(self, cursor, sql, params):
+        # SHOWPLAN açıkken ifade çalışmaz, sadece tahmini plan satırları döner
+        cursor.execute("SET SHOWPLAN_TEXT ON")
+        try:
+            cursor.execute(sql, params)
+            lines = []
+            while True:
+                if cursor.description:
+                    lines.extend(str(row[0]) for row in cursor.fetchall())
+                if not cursor.nextset():
+                    break
+        finally:
+            cursor.execute("SET SHOWPLAN_TEXT OFF")
+        return '\n'.join(lines)
+
+    def describe(self):
+        return {
+            'backend': self.name,
+            'server': self.config['server'],
+            'database': self.config['database']
+        }
+
+
+# ========================================
+# SQLite
+# ========================================
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ROLLER (
+    RolID INTEGER PRIMARY KEY,
+    RolAdi TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS DURUMLAR (
+    DurumID INTEGER PRIMARY KEY,
+    DurumAdi TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ONCELIKLER (
+    OncelikID INTEGER PRIMARY KEY,
+    OncelikAdi TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS KULLANICILAR (
+    KullaniciID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Ad TEXT NOT NULL,
+    Soyad TEXT NOT NULL,
+    Eposta TEXT NOT NULL UNIQUE,
+    SifreHash TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS PROJELER (
+    ProjeID INTEGER PRIMARY KEY AUTOINCREMENT,
+    ProjeAdi TEXT NOT NULL,
+    BaslangicTarihi TEXT NOT NULL,
+    BitisTarihi TEXT,
+    Butce REAL,
+    YoneticiID INTEGER REFERENCES KULLANICILAR(KullaniciID) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS GOREVLER (
+    GorevID INTEGER PRIMARY KEY AUTOINCREMENT,
+    GorevAdi TEXT NOT NULL,
+    Aciklama TEXT,
+    TeslimTarihi TEXT NOT NULL,
+    ProjeID INTEGER NOT NULL REFERENCES PROJELER(ProjeID) ON DELETE CASCADE,
+    DurumID INTEGER NOT NULL DEFAULT 1 REFERENCES DURUMLAR(DurumID),
+    OncelikID INTEGER NOT NULL DEFAULT 3 REFERENCES ONCELIKLER(OncelikID)
+);
+
+CREATE TABLE IF NOT EXISTS GOREV_ATAMALARI (
+    GorevID INTEGER NOT NULL REFERENCES GOREVLER(GorevID) ON DELETE CASCADE,
+    KullaniciID INTEGER NOT NULL REFERENCES KULLANICILAR(KullaniciID) ON DELETE CASCADE,
+    PRIMARY KEY (GorevID, KullaniciID)
+);
+
+CREATE TABLE IF NOT EXISTS PROJE_UYE_ILISKISI (
+    ProjeID INTEGER NOT NULL REFERENCES PROJELER(ProjeID) ON DELETE CASCADE,
+    KullaniciID INTEGER NOT NULL REFERENCES KULLANICILAR(KullaniciID) ON DELETE CASCADE,
+    RolID INTEGER REFERENCES ROLLER(RolID),
+    PRIMARY KEY (ProjeID, KullaniciID)
+);
+
+CREATE TABLE IF NOT EXISTS YORUMLAR (
+    YorumID INTEGER PRIMARY KEY AUTOINCREMENT,
+    GorevID INTEGER NOT NULL REFERENCES GOREVLER(GorevID) ON DELETE CASCADE,
+    KullaniciID INTEGER NOT NULL REFERENCES KULLANICILAR(KullaniciID) ON DELETE CASCADE,
+    YorumMetni TEXT NOT NULL,
+    Tarih TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+SQLITE_SEED = {
+    'ROLLER': [(1, 'Proje Yöneticisi'), (2, 'Geliştirici'), (3, 'Test Uzmanı'), (4, 'Ekip Üyesi')],
+    'DURUMLAR': [(1, 'Yeni'), (2, 'Devam Ediyor'), (3, 'Test Ediliyor'),
+                 (4, 'Tamamlandı'), (5, 'Askıya Alındı')],
+    'ONCELIKLER': [(1, 'Kritik'), (2, 'Yüksek'), (3, 'Orta'), (4, 'Düşük')],
+}
+
+_ROW_TYPES = {}
+
+
+def _row_factory(cursor, values):
+    """pyodbc.Row gibi hem indeks hem de kolon adıyla (row.Ad) erişim sağlar"""
+    fields = tuple(d[0] for d in cursor.description)
+    row_type = _ROW_TYPES.get(fields)
+    if row_type is None:
+        row_type = _ROW_TYPES[fields] = namedtuple('Row', fields, rename=True)
+    return row_type._make(values)
+
+
+class SQLiteBackend(StorageBackend):
+    """Gömülü SQLite veritabanı; SQL Server şemasının aynısını oluşturur"""
+
+    name = 'sqlite'
+
+    def __init__(self, path, busy_timeout=10):
+        self.path = path
+        self.busy_timeout = busy_timeout
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+        conn.row_factory = _row_factory
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def initialize(self, migrate=True):
+        conn = self.connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SQLITE_SCHEMA)
+            for table, rows in SQLITE_SEED.items():
+                conn.executemany(f"INSERT OR IGNORE INTO {table} VALUES (?, ?)", rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+        if migrate:
+            # Yerel veritabanı her açılışta güncel şemaya getirilir
+            from migrate import apply_migrations
+            apply_migrations(self, log=None)
+
+    def last_insert_id(self, cursor):
+        return cursor.lastrowid
+
+    def bulk_insert(self, cursor, table, columns, rows, id_column):
+        # Gömülü motorda ağ gidiş-dönüşü yok; satır başına execute + lastrowid yeterli
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        ids = []
+        for row in rows:
+            cursor.execute(sql, row)
+            ids.append(cursor.lastrowid)
+        return ids
+
+    def explain(self, cursor, sql, params):
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        # (id, parent, notused, detail); alt adımlar ebeveynlerinin altına girintilenir
+        depth = {0: -1}
+        lines = []
+        for row in cursor.fetchall():
+            depth[row[0]] = depth.get(row[1], -1) + 1
+            lines.append('  ' * depth[row[0]] + row[3])
+        return '\n'.join(lines)
+
+    def describe(self):
+        return {'backend': self.name, 'path': self.path}
+
+
+# ========================================
+# Motor seçimi
+# ========================================
+
+def create_backend(mssql_config):
+    """PGYS_DB_BACKEND ortam değişkenine göre motoru oluşturur (varsayılan: mssql)"""
+    kind = os.environ.get('PGYS_DB_BACKEND', 'mssql').lower()
+    if kind == 'sqlite':
+        path = os.environ.get(
+            'PGYS_SQLITE_PATH',
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pgys.db')
+        )
+        return SQLiteBackend(path)
+    if kind == 'mssql':
+        return MSSQLBackend(mssql_config)
+    raise ValueError(f'Bilinmeyen veritabanı motoru: {kind}')
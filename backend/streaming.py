@@ -0,0 +1,111 @@
+"""
+PGYS - Akışlı (streaming) JSON yanıtları
+Büyük listelerde sonuç kümesi fetchall ile belleğe alınmaz; imleç fetchmany ile
+parça parça okunur ve her parça serileştirilip hemen istemciye yazılır.
+Bellek kullanımı satır sayısından bağımsız kalır, ilk bayt ilk parçayla gider.
+
+İstemci akışı iki yolla ister:
+- ?stream=1 (JSON dizisi) veya ?stream=ndjson (satır başına bir JSON nesnesi)
+- Accept: application/x-ndjson başlığı
+"""
+
+from flask import Response, current_app, request
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# fetchmany ile bir seferde okunan satır sayısı
+DEFAULT_CHUNK_SIZE = 500
+
+
+def stream_format():
+    """İstenen akış biçimini ('json' / 'ndjson') döndürür; akış istenmediyse None"""
+    value = request.args.get('stream', '').lower()
+    if value == 'ndjson':
+        return 'ndjson'
+    if value in ('1', 'true', 'json'):
+        return 'json'
+    # */* gibi joker değerler NDJSON isteği sayılmaz
+    if any(mimetype == NDJSON_MIMETYPE and quality > 0
+           for mimetype, quality in request.accept_mimetypes):
+        return 'ndjson'
+    return None
+
+
+def _chunks(cursor, to_dict, dumps, fmt, chunk_size):
+    if fmt == 'json':
+        yield '['
+    first = True
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        items = [to_dict(row) for row in rows]
+        if fmt == 'ndjson':
+            yield '\n'.join(dumps(item) for item in items) + '\n'
+        else:
+            # Parça tek seferde dizi olarak kodlanır, köşeli parantezler atılır
+            yield ('' if first else ',') + dumps(items)[1:-1]
+        first = False
+    if fmt == 'json':
+        yield ']'
+
+
+def stream_query(pool, sql, params, serializer, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Sorguyu çalıştırır ve sonucu akışlı bir Response olarak döndürür.
+    serializer: satırları çevirecek serializers.RowSerializer
+
+    Bağlantı havuzdan burada alınır ve yanıt kapanana kadar (istemci bağlantıyı
+    kesse bile) yanıta aittir; handler'ın with bloğu bağlantıyı tutmaz.
+    Sorgu hatası veya havuz zaman aşımı henüz hiçbir şey gönderilmeden
+    istisna olarak fırlar; çağıran her zamanki gibi 500 üretir.
+    """
+    pooled = pool.acquire()
+    cursor = None
+    released = False
+
+    def release():
+        nonlocal released
+        if released:
+            return
+        released = True
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        pool.release(pooled)
+
+    try:
+        # Havuzun sarmalayıcısı (metrikler / sorgu profili) varsa akışlı sorgu da ölçülür
+        cursor = (pool.wrap(pooled.raw) if pool.wrap else pooled.raw).cursor()
+        cursor.execute(sql, params)
+        to_dict = serializer.bind(cursor.description)
+    except Exception:
+        release()
+        raise
+
+    # Provider'ın dumps'ı (tarih / Decimal desteğiyle) yanıt üretilirken
+    # uygulama bağlamı olmadan da kullanılabilsin diye burada alınır
+    dumps = current_app.json.dumps
+
+    def generate():
+        try:
+            yield from _chunks(cursor, to_dict, dumps, fmt, chunk_size)
+        except Exception as e:
+            # Durum kodu çoktan gönderildi; NDJSON'da hatayı son satır olarak bildir,
+            # JSON dizisi ise yarım kalır ve istemci tarafında ayrıştırılamaz
+            print(f"❌ Akışlı yanıt yarıda kesildi: {str(e)}")
+            if fmt == 'ndjson':
+                yield dumps({'error': str(e)}) + '\n'
+        finally:
+            release()
+
+    mimetype = NDJSON_MIMETYPE if fmt == 'ndjson' else 'application/json'
+    response = Response(generate(), mimetype=mimetype)
+    # Üretici hiç başlatılmadan yanıt kapanırsa bağlantı yine iade edilsin
+    response.call_on_close(release)
+    response.headers['Vary'] = 'Accept'
+    # Ters vekil sunucular (nginx) yanıtı tamponlamasın
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
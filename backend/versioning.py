@@ -0,0 +1,81 @@
+"""
+PGYS - Tablo Sürümleri ve Koşullu GET (ETag / If-None-Match)
+Yazma endpoint'leri değiştirdikleri tabloların sürümünü artırır. Okuma endpoint'leri
+bağlı oldukları tabloların sürümlerinden güçlü bir ETag üretir; istemcinin etiketi
+güncelse veritabanına hiç gitmeden 304 Not Modified döner.
+
+Not: Sayaçlar süreç içindedir; tek süreçli (çok thread'li) sunucu için doğrudur.
+"""
+
+import hashlib
+import os
+import threading
+from functools import wraps
+
+from flask import make_response, request
+
+
+class TableVersions:
+    """
+    Tablo başına artan sürüm sayaçları.
+
+    scope_fn: etikete her istekte eklenecek değeri döndüren fonksiyon (örn. oturumdaki
+    kullanıcı); aynı yolu farklı kapsamla isteyenler birbirinin etiketini almaz
+    """
+
+    def __init__(self, scope_fn=None):
+        self.scope_fn = scope_fn
+        self._versions = {}
+        self._lock = threading.Lock()
+        # Sunucu yeniden başlatılınca eski etiketler geçersiz olsun
+        self.epoch = os.urandom(8).hex()
+
+    def bump(self, *tables):
+        """
+        Tabloların sürümünü artırır.
+        commit'ten SONRA çağrılmalı; aksi halde eski veri yeni etiketle önbelleğe alınabilir.
+        """
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def snapshot(self, tables):
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def etag(self, tables, scope):
+        """Tablo sürümleri ve istek kapsamından (yol + sorgu) etiket üretir"""
+        key = f"{self.epoch}|{scope}|{','.join(tables)}|{self.snapshot(tables)}"
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def conditional(self, *tables, vary=None):
+        """
+        GET handler'ı için dekoratör: etiket eşleşirse handler çalıştırılmadan 304 döner,
+        aksi halde 200 yanıtına ETag eklenir.
+        vary: yanıt tablolar dışında bir şeye de bağlıysa (örn. bugünün tarihi)
+        etikete eklenecek değeri döndüren fonksiyon
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                scope = request.full_path
+                if self.scope_fn is not None:
+                    scope = f"{scope}|{self.scope_fn()}"
+                if vary is not None:
+                    scope = f"{scope}|{vary()}"
+                # Sürümler handler'dan ÖNCE okunur: araya giren bir yazma, etiketi
+                # içerikten eski yapar (sonraki istekte yeniden çekilir), tersi olmaz
+                tag = self.etag(tables, scope)
+                if request.if_none_match.contains(tag):
+                    response = make_response('', 304)
+                    response.set_etag(tag)
+                    return response
+
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code == 200:
+                    response.set_etag(tag)
+                    # Tarayıcı her seferinde doğrulasın (If-None-Match gönderir)
+                    response.headers['Cache-Control'] = 'no-cache'
+                return response
+            return wrapper
+        return decorator
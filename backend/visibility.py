@@ -0,0 +1,237 @@
+"""
+PGYS - Proje Görünürlük İndeksi
+"Bu kullanıcı hangi projeleri görebilir" (yönetici veya üye olduğu projeler) kümesi
+kullanıcı başına bellekte tutulur. Küme ilk istekte veritabanından bir kez yüklenir,
+sonra proje / üyelik yazmalarında artımlı güncellenir; liste sorguları görünürlük alt
+sorgusu yerine sabit ProjeID listesi kullanır (bkz. queries.id_list).
+
+Not: İndeks süreç içindedir (versioning.py ile aynı varsayım). Yazma kancaları
+commit'ten SONRA çağrılmalıdır.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Entry:
+    """Bir kullanıcının yönettiği ve üyesi olduğu projeler"""
+
+    __slots__ = ('managed', 'member', 'visible')
+
+    def __init__(self, managed, member):
+        self.managed = set(managed)
+        self.member = set(member)
+        self.visible = frozenset(self.managed | self.member)
+
+    def refresh(self):
+        self.visible = frozenset(self.managed | self.member)
+
+
+class _Load:
+    """Süren bir yükleme; sırasında kullanıcıyı etkileyen yazmalar işaretlenir"""
+
+    __slots__ = ('kullanici_id', 'stale', 'projects')
+
+    def __init__(self, kullanici_id):
+        self.kullanici_id = kullanici_id
+        self.stale = False
+        # Yükleme sürerken yöneticisi değişen / silinen projeler
+        self.projects = set()
+
+
+class VisibilityIndex:
+    """
+    Kullanıcı başına görünür ProjeID kümeleri.
+
+    connection_fn: with bloğunda bağlantı veren fonksiyon (örn. ConnectionPool.connection)
+    max_users: bellekte tutulan en çok kullanıcı; aşılınca en uzun süredir
+    kullanılmayanın kümesi düşer (gerekirse yeniden yüklenir)
+    """
+
+    def __init__(self, connection_fn, max_users=50000):
+        self._connection_fn = connection_fn
+        self.max_users = max_users
+
+        self._users = OrderedDict()
+        # ProjeID -> kümesinde bu proje bulunan (yüklü) kullanıcılar
+        self._project_users = {}
+        # Süren yüklemeler; sadece yüklenen kullanıcıyı (veya yüklenen kümedeki bir
+        # projeyi) etkileyen yazmalar sonucu geçersiz kılar, ilgisiz yazmalar kılmaz
+        self._loads = set()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'loads_discarded': 0, 'updates': 0,
+                       'evicted': 0, 'load_time_total': 0.0, 'load_time_max': 0.0}
+
+    # ---------- okuma ----------
+
+    def _load(self, kullanici_id):
+        with self._connection_fn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT ProjeID FROM PROJELER WHERE YoneticiID = ? AND Silindi = 0", (kullanici_id,))
+            managed = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT ProjeID FROM PROJE_UYE_ILISKISI WHERE KullaniciID = ?",
+                           (kullanici_id,))
+            member = [row[0] for row in cursor.fetchall()]
+        return _Entry(managed, member)
+
+    def projects(self, kullanici_id):
+        """Kullanıcının görebildiği ProjeID'ler (frozenset)"""
+        with self._lock:
+            entry = self._users.get(kullanici_id)
+            if entry is not None:
+                self._users.move_to_end(kullanici_id)
+                self._stats['hits'] += 1
+                return entry.visible
+            self._stats['misses'] += 1
+            load = _Load(kullanici_id)
+            self._loads.add(load)
+
+        started = time.perf_counter()
+        try:
+            entry = self._load(kullanici_id)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._loads.discard(load)
+
+        with self._lock:
+            self._stats['load_time_total'] += elapsed
+            self._stats['load_time_max'] = max(self._stats['load_time_max'], elapsed)
+            if load.stale or not load.projects.isdisjoint(entry.visible):
+                # Yükleme sürerken bu kullanıcıyı etkileyen yazma oldu; sonuç doğru
+                # olabilir ama saklamak güvenli değil
+                self._stats['loads_discarded'] += 1
+            elif kullanici_id not in self._users:
+                self._store(kullanici_id, entry)
+        return entry.visible
+
+    def peek(self, kullanici_id):
+        """Kullanıcının kümesi bellekteyse döndürür, değilse None (veritabanına gitmez)"""
+        with self._lock:
+            entry = self._users.get(kullanici_id)
+            return entry.visible if entry is not None else None
+
+    def _store(self, kullanici_id, entry):
+        self._users[kullanici_id] = entry
+        for proje_id in entry.visible:
+            self._project_users.setdefault(proje_id, set()).add(kullanici_id)
+        while len(self._users) > self.max_users:
+            self._drop(next(iter(self._users)))
+            self._stats['evicted'] += 1
+
+    def _drop(self, kullanici_id):
+        entry = self._users.pop(kullanici_id, None)
+        if entry is None:
+            return
+        for proje_id in entry.visible:
+            self._unlink(proje_id, kullanici_id)
+
+    def _unlink(self, proje_id, kullanici_id):
+        users = self._project_users.get(proje_id)
+        if users is not None:
+            users.discard(kullanici_id)
+            if not users:
+                del self._project_users[proje_id]
+
+    # ---------- yazma kancaları ----------
+
+    def _touch_user(self, kullanici_id):
+        for load in self._loads:
+            if load.kullanici_id == kullanici_id:
+                load.stale = True
+
+    def _touch_project(self, proje_id):
+        for load in self._loads:
+            load.projects.add(proje_id)
+
+    def _update(self, kullanici_id, proje_id, kind, add):
+        """Yüklü kullanıcının managed / member kümesini günceller"""
+        entry = self._users.get(kullanici_id)
+        if entry is None:
+            return
+        projects = getattr(entry, kind)
+        if add:
+            projects.add(proje_id)
+        else:
+            projects.discard(proje_id)
+        entry.refresh()
+        if proje_id in entry.visible:
+            self._project_users.setdefault(proje_id, set()).add(kullanici_id)
+        else:
+            self._unlink(proje_id, kullanici_id)
+
+    def project_created(self, proje_id, yonetici_id):
+        with self._lock:
+            self._touch_user(yonetici_id)
+            self._stats['updates'] += 1
+            if yonetici_id is not None:
+                self._update(yonetici_id, proje_id, 'managed', True)
+
+    def manager_changed(self, proje_id, yonetici_id):
+        """Projenin yöneticisi yonetici_id oldu (None: yöneticisiz)"""
+        with self._lock:
+            # Eski yönetici bilinmiyor: kümesinde bu proje olan yüklemeler geçersizdir
+            self._touch_project(proje_id)
+            self._touch_user(yonetici_id)
+            self._stats['updates'] += 1
+            for kullanici_id in list(self._project_users.get(proje_id, ())):
+                if kullanici_id != yonetici_id:
+                    self._update(kullanici_id, proje_id, 'managed', False)
+            if yonetici_id is not None:
+                self._update(yonetici_id, proje_id, 'managed', True)
+
+    def project_deleted(self, proje_id):
+        with self._lock:
+            self._touch_project(proje_id)
+            self._stats['updates'] += 1
+            for kullanici_id in self._project_users.pop(proje_id, ()):
+                entry = self._users[kullanici_id]
+                entry.managed.discard(proje_id)
+                entry.member.discard(proje_id)
+                entry.refresh()
+
+    def member_added(self, proje_id, kullanici_id):
+        with self._lock:
+            self._touch_user(kullanici_id)
+            self._stats['updates'] += 1
+            self._update(kullanici_id, proje_id, 'member', True)
+
+    def member_removed(self, proje_id, kullanici_id):
+        with self._lock:
+            self._touch_user(kullanici_id)
+            self._stats['updates'] += 1
+            self._update(kullanici_id, proje_id, 'member', False)
+
+    def user_deleted(self, kullanici_id):
+        """Kullanıcı silinince üyelikleri silinir, yönettiği projeler yöneticisiz kalır"""
+        with self._lock:
+            self._touch_user(kullanici_id)
+            self._stats['updates'] += 1
+            self._drop(kullanici_id)
+
+    def clear(self):
+        """Tüm kümeleri düşürür (toplu / dış kaynaklı değişikliklerden sonra)"""
+        with self._lock:
+            for load in self._loads:
+                load.stale = True
+            self._users.clear()
+            self._project_users.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            misses = self._stats['misses']
+            return {
+                'users': len(self._users),
+                'projects': len(self._project_users),
+                'max_users': self.max_users,
+                'hits': self._stats['hits'],
+                'misses': misses,
+                'hit_ratio': round(self._stats['hits'] / lookups, 3) if lookups else None,
+                'loads_discarded': self._stats['loads_discarded'],
+                'updates': self._stats['updates'],
+                'evicted': self._stats['evicted'],
+                'load_avg_ms': round(self._stats['load_time_total'] / misses * 1000, 2) if misses else 0.0,
+                'load_max_ms': round(self._stats['load_time_max'] * 1000, 2),
+            }
@@ -4,10 +4,32 @@
 
 const API_BASE_URL = 'http://localhost:5000/api'; // Flask API endpoint
 
+const TASK_PAGE_SIZE = 50;
+
 let currentUser = null;
+// Girişte sunucunun verdiği oturum token'ı (Authorization: Bearer)
+let sessionToken = null;
 let projects = [];
 let tasks = [];
 let users = [];
+let dashboard = null;
+
+// Görev listesi sunucu tarafında filtrelenir ve sayfalanır
+let taskFilter = 'all';
+let taskCursor = null;
+
+// Görev kartlarındaki yorum sayıları: GorevID -> { YorumSayisi, SonYorum }
+let commentSummary = new Map();
+
+// Delta senkronizasyonu: sunucu değişiklik günlüğünde en son görülen konum
+let syncWatermark = null;
+// Aynı anda tek senkronizasyon çalışır (düzenleme sonrası + canlı olay)
+let syncQueue = Promise.resolve();
+
+// Canlı olaylar (SSE): olay gelince kısa bir beklemeden sonra tek senkronizasyon yapılır
+const LIVE_SYNC_DELAY_MS = 300;
+let eventSource = null;
+let liveSyncTimer = null;
 
 // ========================================
 // Initialization
@@ -28,19 +50,33 @@ document.addEventListener('DOMContentLoaded', () => {
 
 function loadCurrentUser() {
     const userStr = localStorage.getItem('currentUser');
-    if (userStr) {
+    sessionToken = localStorage.getItem('sessionToken');
+    // Token'ı olmayan eski kayıtlar yeniden giriş yapmalı
+    if (userStr && sessionToken) {
         currentUser = JSON.parse(userStr);
     }
 }
 
 function saveCurrentUser() {
-    if (currentUser) {
+    if (currentUser && sessionToken) {
         localStorage.setItem('currentUser', JSON.stringify(currentUser));
+        localStorage.setItem('sessionToken', sessionToken);
     } else {
         localStorage.removeItem('currentUser');
+        localStorage.removeItem('sessionToken');
     }
 }
 
+function clearSession() {
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+    currentUser = null;
+    sessionToken = null;
+    saveCurrentUser();
+}
+
 function updateNavForLoggedInUser() {
     const navActions = document.querySelector('.nav-actions');
     const initials = getInitials(`${currentUser.Ad} ${currentUser.Soyad}`);
@@ -89,9 +125,13 @@ document.addEventListener('click', (e) => {
     }
 });
 
-function handleLogout() {
-    currentUser = null;
-    saveCurrentUser();
+async function handleLogout() {
+    try {
+        await apiRequest('/logout', { method: 'POST' });
+    } catch (error) {
+        // Oturum sunucuda zaten düşmüş olabilir; yerel çıkış yine yapılır
+    }
+    clearSession();
     showNotification('Başarıyla çıkış yapıldı', 'success');
     setTimeout(() => {
         window.location.reload();
@@ -111,12 +151,19 @@ async function initializeApp() {
             return;
         }
 
-        // Load initial data
-        await Promise.all([
-            loadProjects(),
-            loadTasks(),
-            loadUsers()
-        ]);
+        // Açılış verisi tek istekte; olmazsa listeler ayrı ayrı yüklenir
+        if (!await loadBootstrap()) {
+            // Filigran listelerden ÖNCE alınır; aradaki değişiklikler sonraki senkronizasyonda gelir
+            await loadWatermark();
+
+            // Load initial data
+            await Promise.all([
+                loadProjects(),
+                loadTasks(),
+                loadUsers(),
+                loadDashboard()
+            ]);
+        }
 
         // Render components
         renderProjects();
@@ -126,6 +173,9 @@ async function initializeApp() {
         // İstatistikleri animasyon ile göster
         animateStats();
 
+        // Başka kullanıcıların değişikliklerini canlı al
+        connectEvents();
+
         console.log('✅ Uygulama başarıyla yüklendi');
     } catch (error) {
         console.error('❌ Uygulama yüklenirken hata:', error);
@@ -193,13 +243,20 @@ function setupEventListeners() {
 
 async function apiRequest(endpoint, options = {}) {
     try {
-        const response = await fetch(`${API_BASE_URL}${endpoint}`, {
-            headers: {
-                'Content-Type': 'application/json',
-                ...options.headers
-            },
-            ...options
-        });
+        const headers = { 'Content-Type': 'application/json', ...options.headers };
+        if (sessionToken) headers['Authorization'] = `Bearer ${sessionToken}`;
+
+        const response = await fetch(`${API_BASE_URL}${endpoint}`, { ...options, headers });
+
+        // Oturum süresi dolmuş veya kapatılmış (örn. başka cihazda şifre değişti)
+        if (response.status === 401 && sessionToken &&
+            (response.headers.get('WWW-Authenticate') || '').includes('invalid_token')) {
+            clearSession();
+            showNotification('Oturumunuzun süresi doldu, lütfen tekrar giriş yapın', 'error');
+            setTimeout(() => {
+                window.location.reload();
+            }, 1500);
+        }
 
         if (!response.ok) {
             const errorData = await response.json();
@@ -219,12 +276,8 @@ async function apiRequest(endpoint, options = {}) {
 
 async function loadProjects() {
     try {
-        // Kullanıcı ID'sini parametre olarak gönder
-        const endpoint = currentUser
-            ? `/projeler?kullanici_id=${currentUser.KullaniciID}`
-            : '/projeler';
-
-        const data = await apiRequest(endpoint);
+        // Kullanıcı oturum token'ından belirlenir
+        const data = await apiRequest('/projeler');
         projects = data;
         return projects;
     } catch (error) {
@@ -234,29 +287,205 @@ async function loadProjects() {
     }
 }
 
-async function loadTasks() {
+async function loadTasks(filter = taskFilter) {
+    taskFilter = filter;
     try {
-        // Kullanıcı ID'sini parametre olarak gönder
-        const endpoint = currentUser
-            ? `/gorevler?kullanici_id=${currentUser.KullaniciID}`
-            : '/gorevler';
+        const params = new URLSearchParams({ limit: TASK_PAGE_SIZE });
+        if (filter !== 'all') params.set('durum_id', filter);
 
-        const data = await apiRequest(endpoint);
-        tasks = data;
+        const data = await apiRequest(`/gorevler?${params}`);
+        tasks = data.items;
+        taskCursor = data.next_cursor;
+        await loadCommentSummary(tasks.map(t => t.GorevID));
         return tasks;
     } catch (error) {
         console.error('Görevler yüklenemedi:', error);
         tasks = [];
+        taskCursor = null;
         return tasks;
     }
 }
 
+async function loadMoreTasks() {
+    if (!taskCursor) return;
+
+    try {
+        const params = new URLSearchParams({ limit: TASK_PAGE_SIZE, cursor: taskCursor });
+        if (taskFilter !== 'all') params.set('durum_id', taskFilter);
+
+        const data = await apiRequest(`/gorevler?${params}`);
+        tasks = tasks.concat(data.items);
+        taskCursor = data.next_cursor;
+        await loadCommentSummary(data.items.map(t => t.GorevID));
+        renderTasks();
+    } catch (error) {
+        console.error('Görevler yüklenemedi:', error);
+        showNotification('Görevler yüklenirken hata oluştu', 'error');
+    }
+}
+
+// Görevlerin yorum sayıları tek istekle alınır (görev başına istek yerine)
+async function loadCommentSummary(taskIds) {
+    if (!taskIds.length) return;
+    try {
+        const data = await apiRequest(`/yorumlar/ozet?gorev_ids=${[...new Set(taskIds)].join(',')}`);
+        Object.entries(data).forEach(([id, ozet]) => commentSummary.set(Number(id), ozet));
+    } catch (error) {
+        // Sayılar gösterilemese de liste çalışmaya devam eder
+        console.error('Yorum sayıları yüklenemedi:', error);
+    }
+}
+
+async function loadDashboard() {
+    try {
+        // Proje ilerlemeleri ve sayaçlar sunucuda tek sorguda hesaplanır
+        const data = await apiRequest('/dashboard');
+        dashboard = {
+            projeler: new Map(data.projeler.map(p => [p.ProjeID, p])),
+            toplam: data.toplam
+        };
+        return dashboard;
+    } catch (error) {
+        console.error('Dashboard yüklenemedi:', error);
+        dashboard = null;
+        return dashboard;
+    }
+}
+
+async function loadWatermark() {
+    try {
+        const data = await apiRequest('/sync');
+        syncWatermark = data.watermark;
+    } catch (error) {
+        console.error('Senkronizasyon filigranı alınamadı:', error);
+        syncWatermark = null;
+    }
+}
+
+// Filigran, projeler, görevlerin ilk sayfası, ekip ve dashboard tek istekte
+async function loadBootstrap() {
+    try {
+        const data = await apiRequest('/bootstrap');
+        syncWatermark = data.watermark;
+        projects = data.projeler;
+        taskFilter = 'all';
+        tasks = data.gorevler.items;
+        taskCursor = data.gorevler.next_cursor;
+        Object.entries(data.yorum_ozet).forEach(([id, ozet]) => commentSummary.set(Number(id), ozet));
+        users = data.ekip;
+        dashboard = {
+            projeler: new Map(data.dashboard.projeler.map(p => [p.ProjeID, p])),
+            toplam: data.dashboard.toplam
+        };
+        return true;
+    } catch (error) {
+        console.error('Açılış verisi yüklenemedi:', error);
+        return false;
+    }
+}
+
+// Son senkronizasyondan beri değişen projeleri ve görevleri indirip listelere işler
+function syncChanges() {
+    syncQueue = syncQueue.catch(() => {}).then(runSync);
+    return syncQueue;
+}
+
+async function runSync() {
+    if (syncWatermark === null) {
+        await reloadLists();
+        return;
+    }
+
+    let data;
+    do {
+        data = await apiRequest(`/sync?since=${syncWatermark}`);
+        if (data.reset) {
+            // Görebildiğimiz projeler değişti (üyelik / yöneticilik); listeleri baştan yükle
+            await reloadLists();
+            return;
+        }
+        applyChanges(data);
+        syncWatermark = data.watermark;
+        if (data.yorumlar.length) {
+            await loadCommentSummary(data.yorumlar.map(y => y.GorevID));
+        }
+    } while (data.has_more);
+}
+
+async function reloadLists() {
+    await loadWatermark();
+    await Promise.all([loadProjects(), loadTasks()]);
+}
+
+function connectEvents() {
+    if (!window.EventSource || !sessionToken) return;
+
+    // EventSource başlık gönderemez; token query parametresiyle verilir
+    eventSource = new EventSource(`${API_BASE_URL}/olaylar?token=${encodeURIComponent(sessionToken)}`);
+    ['proje', 'gorev', 'yorum'].forEach(name => {
+        eventSource.addEventListener(name, scheduleLiveSync);
+    });
+    eventSource.addEventListener('gorunurluk', () => {
+        // Görebildiğimiz projeler değişti; listeler ve ekip baştan yüklenir
+        syncQueue = syncQueue.catch(() => {}).then(reloadLists);
+        Promise.all([syncQueue, loadUsers(), loadDashboard()])
+            .then(() => {
+                renderProjects();
+                renderTasks();
+                renderTeam();
+            })
+            .catch(error => console.error('Canlı güncelleme başarısız:', error));
+    });
+    // Bağlantı koptuysa tarayıcı yeniden bağlanır; aradaki değişiklikler senkronizasyonla gelir
+    eventSource.addEventListener('open', scheduleLiveSync);
+}
+
+function scheduleLiveSync() {
+    if (liveSyncTimer) return;
+    liveSyncTimer = setTimeout(async () => {
+        liveSyncTimer = null;
+        try {
+            await Promise.all([syncChanges(), loadDashboard()]);
+            renderProjects();
+            renderTasks();
+        } catch (error) {
+            console.error('Canlı güncelleme başarısız:', error);
+        }
+    }, LIVE_SYNC_DELAY_MS);
+}
+
+function compareTasks(a, b) {
+    return (a.TeslimTarihi || '').localeCompare(b.TeslimTarihi || '') || a.GorevID - b.GorevID;
+}
+
+function applyChanges(data) {
+    const deletedProjects = new Set(data.silinen.projeler);
+    const deletedTasks = new Set(data.silinen.gorevler);
+    const changedProjects = new Set(data.projeler.map(p => p.ProjeID));
+    const changedTasks = new Set(data.gorevler.map(t => t.GorevID));
+
+    projects = projects
+        .filter(p => !deletedProjects.has(p.ProjeID) && !changedProjects.has(p.ProjeID))
+        .concat(data.projeler)
+        .sort((a, b) => (b.BaslangicTarihi || '').localeCompare(a.BaslangicTarihi || ''));
+
+    // Sayfalı listede sadece yüklenmiş aralığa düşen görevler eklenir; gerisi sonraki sayfalarda gelir
+    const lastLoaded = taskCursor && tasks.length ? tasks[tasks.length - 1] : null;
+    const incoming = data.gorevler.filter(t =>
+        (taskFilter === 'all' || t.DurumID === Number(taskFilter)) &&
+        (!lastLoaded || compareTasks(t, lastLoaded) <= 0));
+
+    tasks = tasks
+        .filter(t => !deletedTasks.has(t.GorevID) && !changedTasks.has(t.GorevID)
+            && !deletedProjects.has(t.ProjeID))
+        .concat(incoming)
+        .sort(compareTasks);
+}
+
 async function loadUsers() {
     try {
         // Kullanıcı giriş yapmışsa, sadece kendi ekibini göster
-        const endpoint = currentUser
-            ? `/ekip?kullanici_id=${currentUser.KullaniciID}`
-            : '/kullanicilar';
+        const endpoint = currentUser ? '/ekip' : '/kullanicilar';
 
         const data = await apiRequest(endpoint);
         users = data;
@@ -329,15 +558,10 @@ function renderProjects() {
     `).join('');
 }
 
-function renderTasks(filter = 'all') {
+function renderTasks() {
     const container = document.getElementById('tasksContainer');
 
-    let filteredTasks = tasks;
-    if (filter !== 'all') {
-        filteredTasks = tasks.filter(task => task.DurumID == filter);
-    }
-
-    if (!filteredTasks || filteredTasks.length === 0) {
+    if (!tasks || tasks.length === 0) {
         container.innerHTML = `
             <div style="text-align: center; padding: 3rem; color: var(--text-muted);">
                 <p>Bu filtrede görev bulunmuyor.</p>
@@ -346,7 +570,7 @@ function renderTasks(filter = 'all') {
         return;
     }
 
-    container.innerHTML = filteredTasks.map(task => `
+    container.innerHTML = tasks.map(task => `
         <div class="task-card" onclick="viewTask(${task.GorevID})">
             <div class="task-header">
                 <h3 class="task-title">${task.GorevAdi}</h3>
@@ -365,9 +589,17 @@ function renderTasks(filter = 'all') {
                 <span style="font-size: 0.875rem; color: var(--text-muted);">
                     📁 ${task.ProjeAdi}
                 </span>
+                ${commentSummary.get(task.GorevID)?.YorumSayisi ? `
+                <span style="font-size: 0.875rem; color: var(--text-muted);">
+                    💬 ${commentSummary.get(task.GorevID).YorumSayisi}
+                </span>` : ''}
             </div>
         </div>
-    `).join('');
+    `).join('') + (taskCursor ? `
+        <div style="text-align: center; padding: 1.5rem;">
+            <button class="btn-outline" onclick="loadMoreTasks()">Daha Fazla Göster</button>
+        </div>
+    ` : '');
 }
 
 function renderTeam() {
@@ -516,6 +748,7 @@ async function handleLogin(event) {
         });
 
         currentUser = response.user;
+        sessionToken = response.token;
         saveCurrentUser();
 
         showNotification('Giriş başarılı!', 'success');
@@ -612,8 +845,10 @@ async function handleProjectSubmit(event) {
             showNotification('Proje oluşturuldu!', 'success');
         }
 
-        await loadProjects();
+        // Sadece değişenler indirilir
+        await Promise.all([syncChanges(), loadDashboard()]);
         renderProjects();
+        renderTasks();
         closeModal('projectModal');
     } catch (error) {
         console.error('Proje kaydedilemedi:', error);
@@ -651,8 +886,9 @@ async function handleTaskSubmit(event) {
             showNotification('Görev oluşturuldu!', 'success');
         }
 
-        await loadTasks();
+        await Promise.all([syncChanges(), loadDashboard()]);
         renderTasks();
+        renderProjects();
         closeModal('taskModal');
     } catch (error) {
         console.error('Görev kaydedilemedi:', error);
@@ -684,8 +920,9 @@ async function deleteProject(projectId) {
         });
 
         showNotification('Proje silindi!', 'success');
-        await loadProjects();
+        await Promise.all([syncChanges(), loadDashboard()]);
         renderProjects();
+        renderTasks();
     } catch (error) {
         console.error('Proje silinemedi:', error);
         showNotification('Proje silinirken hata oluştu', 'error');
@@ -712,8 +949,9 @@ async function deleteTask(taskId) {
         });
 
         showNotification('Görev silindi!', 'success');
-        await loadTasks();
+        await Promise.all([syncChanges(), loadDashboard()]);
         renderTasks();
+        renderProjects();
     } catch (error) {
         console.error('Görev silinemedi:', error);
         showNotification('Görev silinirken hata oluştu', 'error');
@@ -724,8 +962,10 @@ async function deleteTask(taskId) {
 // Filter Functions
 // ========================================
 
-function filterTasks(filter) {
-    renderTasks(filter);
+async function filterTasks(filter) {
+    // Filtre sunucuda uygulanır; sadece ilgili görevler indirilir
+    await loadTasks(filter);
+    renderTasks();
 }
 
 // ========================================
@@ -761,11 +1001,8 @@ function getPriorityClass(priority) {
 }
 
 function calculateProgress(projectId) {
-    const projectTasks = tasks.filter(t => t.ProjeID === projectId);
-    if (projectTasks.length === 0) return 0;
-
-    const completedTasks = projectTasks.filter(t => t.DurumID === 4).length;
-    return Math.round((completedTasks / projectTasks.length) * 100);
+    const summary = dashboard && dashboard.projeler.get(projectId);
+    return summary ? summary.TamamlanmaOrani : 0;
 }
 
 function scrollToSection(sectionId) {
@@ -801,7 +1038,7 @@ function showNotification(message, type = 'info') {
 
 function animateStats() {
     animateValue('statProjects', 0, projects.length, 1500);
-    animateValue('statTasks', 0, tasks.filter(t => t.DurumID === 4).length, 1500);
+    animateValue('statTasks', 0, dashboard ? dashboard.toplam.TamamlananGorev : 0, 1500);
     animateValue('statUsers', 0, users.length, 1500);
 }
 
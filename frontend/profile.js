@@ -4,6 +4,7 @@
 
 const API_BASE_URL = 'http://localhost:5000/api';
 let currentUser = null;
+let sessionToken = null;
 
 // ========================================
 // Initialization
@@ -26,7 +27,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
 function loadCurrentUser() {
     const userStr = localStorage.getItem('currentUser');
-    if (userStr) {
+    sessionToken = localStorage.getItem('sessionToken');
+    if (userStr && sessionToken) {
         currentUser = JSON.parse(userStr);
     }
 }
@@ -292,13 +294,20 @@ async function handlePasswordChange(event) {
 
 async function apiRequest(endpoint, options = {}) {
     try {
-        const response = await fetch(`${API_BASE_URL}${endpoint}`, {
-            headers: {
-                'Content-Type': 'application/json',
-                ...options.headers
-            },
-            ...options
-        });
+        const headers = { 'Content-Type': 'application/json', ...options.headers };
+        if (sessionToken) headers['Authorization'] = `Bearer ${sessionToken}`;
+
+        const response = await fetch(`${API_BASE_URL}${endpoint}`, { ...options, headers });
+
+        // Oturum geçersizse ana sayfaya dön ve yeniden giriş iste
+        if (response.status === 401 && sessionToken &&
+            (response.headers.get('WWW-Authenticate') || '').includes('invalid_token')) {
+            localStorage.removeItem('currentUser');
+            localStorage.removeItem('sessionToken');
+            setTimeout(() => {
+                window.location.href = 'index.html';
+            }, 1500);
+        }
 
         if (!response.ok) {
             const errorData = await response.json();